@@ -0,0 +1,158 @@
+"""
+Synthetic Meeting Data
+Seeded generator of meeting sheets in the Book1.xlsx layout (#, Meeting Date,
+Client, People Connected, Actions, Next Meeting, Address, Actions Taken),
+with a skewed client distribution and multi-line notes like the real ones
+
+Usage: python benchmarks/data_generator.py 10000 -o meetings_10k.xlsx [--seed 7]
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from typing import List
+import pandas as pd
+
+DEFAULT_SEED = 7
+
+SHEET_COLUMNS = [
+    '#', 'Meeting Date', 'Client', 'People Connected', 'Actions', 'Next Meeting', 'Address', 'Actions Taken'
+]
+
+CLIENT_STEMS = [
+    "Sunlife", "HDFC Life", "Axis Maxlife", "Kotak", "Canara HSBC", "Pramerica", "Shriram", "Reliance",
+    "IndusInd", "Mashreq", "Piramal", "Herofincorp", "Gallagher", "Mass Mutual", "Liberty", "Stripe",
+    "Oister", "Slice", "ANZ", "CITI", "JPMC", "FAB", "HSBC", "Aditya Birla", "Bajaj", "ICICI", "Tata AIG"
+]
+CLIENT_SUFFIXES = ["", " Insurance", " Life", " Bank", " Finance", " GCC", " Payments", " Capital"]
+
+FIRST_NAMES = [
+    "Ram", "Laura", "Shiva", "Tarun", "Vikas", "Radhika", "Shantanu", "John", "Saranya", "Abhay", "Rajat",
+    "Priya", "Anita", "Karan", "Meera", "Nikhil", "Sonia", "Arjun", "Deepa", "Rohan", "Fatima", "David"
+]
+LAST_NAMES = [
+    "Balkrishna", "Money", "Subramoney", "Sareen", "Arora", "Kodesia", "Shoemaker", "Vibhas", "Mehta",
+    "Iyer", "Kapoor", "Nair", "Sharma", "Gupta", "Khan", "Fernandes", "Rao", "Bose", "Pillai", "Das"
+]
+TITLES = [
+    "CAE", "Global CIO", "GRC Head", "GCC Head", "Director Compliance", "Ops Head", "CRO", "CFO",
+    "VP Internal Audit", "Head of Data", "Chief AML Officer", "Procurement Lead", "CISO", "COO"
+]
+ACTION_ITEMS = [
+    "Share the proposal for {topic} by end of week",
+    "Thought on the scope? Is it achievable in the given time frame?",
+    "Present a success story on {topic} to the leadership team",
+    "Check if there are any conflicts in procurement for {topic}",
+    "Demonstrate capabilities around {topic} through Gen AI",
+    "Send {topic} details to {person} (sent)",
+    "Schedule a walkthrough of {topic} with the audit committee",
+    "Prepare a ramp up / ramp down plan for the {topic} team",
+    "Clean-up of approx. {count} records in the {topic} portal",
+    "Follow up on the {topic} RFP and the commercial terms"
+]
+TOPICS = [
+    "fraud analytics", "DPDP compliance", "AML transaction monitoring", "ESG reporting", "claims automation",
+    "data anonymization", "internal audit co-sourcing", "GCC setup", "vendor risk", "knowledge management",
+    "STP processing", "cyber resilience", "model risk", "IFRS 17"
+]
+CITIES = ["Gurugram", "Mumbai", "Bengaluru", "Hyderabad", "Pune", "Chennai", "Dubai", "Noida"]
+STREETS = ["Cyber City", "MG Road", "BKC", "Whitefield", "HITEC City", "Golf Course Road", "Sector 62"]
+DONE_NOTES = ["Done", "Email sent", "Proposal shared", "Demo completed", "Meeting scheduled", "In progress"]
+
+
+def client_names(rng: random.Random, count: int) -> List[str]:
+    """Distinct client names (stems combined with suffixes, numbered once they run out)"""
+    names = [stem + suffix for suffix in CLIENT_SUFFIXES for stem in CLIENT_STEMS]
+    rng.shuffle(names)
+    while len(names) < count:
+        names.append(f"{rng.choice(CLIENT_STEMS)} {len(names)}")
+    return names[:count]
+
+
+def person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def people_connected(rng: random.Random) -> str:
+    return "\n".join(f"{person(rng)}, {rng.choice(TITLES)}" for _ in range(rng.randint(1, 5)))
+
+
+def actions(rng: random.Random) -> str:
+    lines = []
+    for number in range(1, rng.randint(1, 6) + 1):
+        item = rng.choice(ACTION_ITEMS).format(
+            topic=rng.choice(TOPICS), person=person(rng), count=rng.randint(1, 90) * 1000
+        )
+        lines.append(f"{number}) {item}")
+    return "\n".join(lines)
+
+
+def next_meeting(rng: random.Random, meeting_day: date) -> str:
+    """Free text; half of it in the "Fri, Dec 6, 2024 - ..." form the app parses into a date"""
+    roll = rng.random()
+    if roll < 0.5:
+        day = meeting_day + timedelta(days=rng.randint(1, 90))
+        return f"{day.strftime('%a, %b')} {day.day}, {day.year} - {rng.choice(TOPICS).capitalize()} follow-up"
+    if roll < 0.8:
+        return f"{person(rng)} to connect with {person(rng)} on {rng.choice(TOPICS)}. Follow up to be done"
+    if roll < 0.9:
+        return "-"
+    return ""
+
+
+def meeting_date_cell(rng: random.Random, meeting_day: date):
+    """A date, or occasionally several meetings as text like Book1's "M1 : 20-02-2025\\nM2: 2 - Apr - 2025" """
+    if rng.random() < 0.1:
+        later = meeting_day + timedelta(days=rng.randint(7, 60))
+        return f"M1 : {meeting_day.strftime('%d-%m-%Y')}\nM2: {later.day} - {later.strftime('%b - %Y')}"
+    return pd.Timestamp(meeting_day)
+
+
+def generate_sheet(count: int, seed: int = DEFAULT_SEED, start: date = date(2024, 1, 1)) -> pd.DataFrame:
+    """
+    A sheet of synthetic meetings in the Book1.xlsx layout
+
+    Args:
+        count: Number of meeting rows
+        seed: Same seed, same sheet
+        start: Date of the earliest meeting
+
+    Returns:
+        DataFrame with SHEET_COLUMNS
+    """
+    rng = random.Random(seed)
+    clients = client_names(rng, max(1, count // 25))
+    # A few clients get most of the meetings, as in the real tracker
+    weights = [1 / (rank + 1) for rank in range(len(clients))]
+    addresses = {client: f"{rng.randint(1, 400)}, {rng.choice(STREETS)}, {rng.choice(CITIES)}" for client in clients}
+
+    rows = []
+    for index, client in enumerate(rng.choices(clients, weights, k=count)):
+        meeting_day = start + timedelta(days=index * 730 // max(count, 1))
+        rows.append({
+            '#': index + 1,
+            'Meeting Date': meeting_date_cell(rng, meeting_day),
+            'Client': client,
+            'People Connected': people_connected(rng),
+            'Actions': actions(rng),
+            'Next Meeting': next_meeting(rng, meeting_day),
+            'Address': addresses[client] if rng.random() < 0.4 else None,
+            'Actions Taken': rng.choice(DONE_NOTES) if rng.random() < 0.5 else None
+        })
+    return pd.DataFrame(rows, columns=SHEET_COLUMNS)
+
+
+def write_workbook(sheet: pd.DataFrame, path) -> None:
+    """Save a sheet as .xlsx (path or binary file object)"""
+    sheet.to_excel(path, index=False, engine="xlsxwriter")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic meetings workbook")
+    parser.add_argument("count", type=int, help="Number of meetings")
+    parser.add_argument("-o", "--output", default="synthetic_meetings.xlsx")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    write_workbook(generate_sheet(args.count, args.seed), args.output)
+    print(f"SUCCESS: Wrote {args.count} meetings to {args.output}")
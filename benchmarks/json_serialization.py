@@ -0,0 +1,160 @@
+"""
+JSON Serialization Benchmark
+Times a full /api/meetings load (every page) through the previous path (ORM
+objects, Pydantic validation, Pydantic JSON) and the current one (plain rows,
+orjson), plus gzip / brotli compression of the pages, at 10k and 100k meetings
+
+Usage: python benchmarks/json_serialization.py [row counts...]
+Runs against throwaway SQLite databases in a temporary directory.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from statistics import median
+
+DEFAULT_ROW_COUNTS = [10_000, 100_000]
+PAGE_SIZE = 1000
+REPEATS = 3
+MEETINGS_PER_CLIENT = 8
+
+WORDS = (
+    "renewal policy premium claim discussed proposal review quarterly term group health cover "
+    "broker follow-up documents pending signed meeting client team finance approval budget"
+).split()
+
+
+def notes(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def fill(engine, count: int):
+    """Insert `count` synthetic meetings with long free-text notes"""
+    from database import Meeting, OrderCounter
+    from rank_keys import rank_from_value, first_rank_value
+
+    rng = random.Random(count)
+    now = datetime.utcnow()
+    rows = []
+    for index in range(count):
+        client_number, position = divmod(index, MEETINGS_PER_CLIENT)
+        next_day = date.today() + timedelta(days=rng.randint(-30, 60))
+        rows.append({
+            "client": f"Client {client_number:05d}",
+            "people_connected": notes(rng, 6),
+            "actions": notes(rng, 40),
+            "next_meeting": next_day.strftime("%a, %b %d, %Y") + " - " + notes(rng, 8),
+            "next_meeting_at": next_day,
+            "address": notes(rng, 10),
+            "actions_taken": notes(rng, 30),
+            "meeting_date": next_day - timedelta(days=30),
+            "created_at": now,
+            "updated_at": now,
+            "client_rank": rank_from_value(first_rank_value() + position),
+            "global_order": index + 1,
+            "client_first_appearance": client_number * MEETINGS_PER_CLIENT + 1,
+            "row_version": 1
+        })
+    with engine.begin() as conn:
+        conn.execute(Meeting.__table__.insert(), rows)
+        conn.execute(OrderCounter.__table__.insert(), [{"name": "data_version", "value": 1}])
+
+
+def legacy_page(db, cursor, limit):
+    """The listing before the fast path: ORM objects validated into MeetingResponse"""
+    from sqlalchemy import tuple_
+    from database import Meeting
+    import main
+
+    query = db.query(Meeting)
+    sort_key = (Meeting.client_first_appearance, Meeting.global_order, Meeting.id)
+    if cursor:
+        query = query.filter(tuple_(*sort_key) > tuple_(*main.decode_cursor(cursor)))
+    meetings = query.order_by(*sort_key).limit(limit + 1).all()
+
+    headers = {}
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        headers["X-Next-Cursor"] = main.encode_cursor(meetings[-1])
+    adapter = main.meeting_list_adapter
+    return adapter.dump_json(adapter.validate_python(meetings, from_attributes=True)), headers
+
+
+def current_page(db, cursor, limit):
+    import main
+    return main.query_meetings_page(db, None, None, None, None, None, cursor, limit)
+
+
+def load_all(session_factory, page):
+    """Every page of the listing, like the browser's loadMeetings()"""
+    db = session_factory()
+    try:
+        bodies = []
+        cursor = None
+        while True:
+            body, headers = page(db, cursor, PAGE_SIZE)
+            bodies.append(body)
+            cursor = headers.get("X-Next-Cursor")
+            if not cursor:
+                return bodies
+    finally:
+        db.close()
+
+
+def timed(function, repeats: int = REPEATS):
+    """(median seconds, last result)"""
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return median(times), result
+
+
+def run(count: int):
+    import json
+    import database
+    import json_responses
+
+    fill(database.engine, count)
+
+    legacy_seconds, legacy_bodies = timed(lambda: load_all(database.ReadSessionLocal, legacy_page))
+    current_seconds, current_bodies = timed(lambda: load_all(database.ReadSessionLocal, current_page))
+    assert [json.loads(body) for body in legacy_bodies] == [json.loads(body) for body in current_bodies], \
+        "the two paths must produce the same JSON"
+
+    size = sum(len(body) for body in current_bodies)
+    print(f"\n{count:,} meetings, {len(current_bodies)} pages, {size / 1e6:.1f} MB of JSON")
+    print(f"  {'ORM + Pydantic (previous)':<28}{legacy_seconds * 1000:>9.0f} ms")
+    print(f"  {'rows + orjson (current)':<28}{current_seconds * 1000:>9.0f} ms"
+          f"   {legacy_seconds / current_seconds:.1f}x faster")
+
+    for encoding in ("gzip", "br"):
+        if encoding == "br" and json_responses.brotli is None:
+            print("  br: brotli not installed, skipped")
+            continue
+        seconds, compressed = timed(lambda: [json_responses.compress(body, encoding) for body in current_bodies])
+        compressed_size = sum(len(body) for body in compressed)
+        print(f"  {encoding + ' compression':<28}{seconds * 1000:>9.0f} ms"
+              f"   {compressed_size / 1e6:.2f} MB ({size / compressed_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    for count in counts:
+        # Each size gets a fresh database; the app modules read DATABASE_URL at import
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench.db"
+            for name in [name for name in sys.modules if name in (
+                "database", "main", "sequences", "dashboard_stats", "meeting_search", "meeting_revisions",
+                "meeting_changes", "excel_import", "response_cache", "email_outbox", "reminder_timer",
+                "pdf_reports", "init_data"
+            )]:
+                del sys.modules[name]
+            run(count)
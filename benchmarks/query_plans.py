@@ -0,0 +1,104 @@
+"""
+Query Plan Checks
+Runs EXPLAIN QUERY PLAN on the hot query shapes against a seeded SQLite
+database and checks each one uses its index (see database.QUERY_INDEXES)
+instead of scanning the table or sorting in a temporary B-tree
+
+Usage: python benchmarks/query_plans.py [meetings]
+Exits with status 1 when a plan doesn't match.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from data_generator import generate_sheet  # noqa: E402
+
+DEFAULT_MEETINGS = 2000
+
+
+def hot_queries():
+    """(description, SQLAlchemy query builder taking a session, index the plan must use)"""
+    from types import SimpleNamespace
+    from sqlalchemy import func
+    from database import Client, ClientAddress, Meeting, client_named
+    from main import MAX_PAGE_SIZE, encode_cursor, meetings_page_query
+
+    # The listing's own statement, as GET /api/meetings builds it
+    cursor = encode_cursor(SimpleNamespace(client_first_appearance=3, global_order=40, id=40))
+    cutoff = datetime.utcnow() - timedelta(days=30)
+    return [
+        ("meeting listing, first page",
+         lambda db: meetings_page_query(db, None, None, None, None, None, None, MAX_PAGE_SIZE),
+         "ix_meetings_listing"),
+        ("meeting listing, next page (keyset cursor)",
+         lambda db: meetings_page_query(db, None, None, None, None, None, cursor, MAX_PAGE_SIZE),
+         "ix_meetings_listing"),
+        ("last update of a client (highest rank)",
+         lambda db: db.query(func.max(Meeting.client_rank)).filter(Meeting.client_id == client_named("Sunlife")),
+         "uq_meetings_client_rank"),
+        ("client active in the last 30 days (dashboard stats)",
+         lambda db: db.query(Meeting.id).filter(
+             Meeting.client_id == client_named("Sunlife"), Meeting.id.notin_([1, 2]), Meeting.updated_at >= cutoff
+         ).limit(1),
+         "ix_meetings_client_updated_at"),
+        ("address book of a client (by usage, then recency)",
+         lambda db: db.query(ClientAddress).join(Client, Client.id == ClientAddress.client_id)
+         .filter(Client.name == "Sunlife")
+         .order_by(ClientAddress.usage_count.desc(), ClientAddress.last_used_at.desc()),
+         "ix_client_addresses_rank")
+    ]
+
+
+def explain(db, query) -> list:
+    """EXPLAIN QUERY PLAN detail lines of a query, with its parameters inlined"""
+    from sqlalchemy import text
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row.detail for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def check(plan: list, index: str) -> list:
+    """Problems with a plan (empty when it is fine)"""
+    problems = []
+    if not any(f"INDEX {index}" in line for line in plan):
+        problems.append(f"does not use {index}")
+    if any(line.startswith("SCAN meetings") and "INDEX" not in line for line in plan):
+        problems.append("scans the meetings table")
+    if any("TEMP B-TREE" in line for line in plan):
+        problems.append("sorts in a temporary B-tree")
+    return problems
+
+
+def run(meetings: int) -> bool:
+    import database
+    from excel_import import import_meetings
+
+    db = database.SessionLocal()
+    try:
+        import_meetings(db, generate_sheet(meetings))
+        db.commit()
+
+        passed = True
+        for description, build, index in hot_queries():
+            plan = explain(db, build(db))
+            problems = check(plan, index)
+            passed = passed and not problems
+            print(f"{'ERROR' if problems else 'SUCCESS'}: {description}"
+                  + (f" - {', '.join(problems)}" if problems else ""))
+            for line in plan:
+                print(f"    {line}")
+        return passed
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    meetings = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MEETINGS
+    with tempfile.TemporaryDirectory() as directory:
+        # The app modules read DATABASE_URL at import
+        os.environ["DATABASE_URL"] = f"sqlite:///{directory}/query_plans.db"
+        sys.exit(0 if run(meetings) else 1)
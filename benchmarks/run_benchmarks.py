@@ -0,0 +1,259 @@
+"""
+Endpoint Benchmarks
+Seeds a throwaway database with synthetic meetings (see data_generator.py),
+then calls the endpoints in-process through the ASGI app and reports, per
+endpoint and database size, latency percentiles, SQL statements per request
+and the process's peak RSS, as JSON
+
+Usage: python benchmarks/run_benchmarks.py [--sizes 1000 10000 100000] [-o results.json]
+Compare against the committed baseline with: git diff --no-index benchmarks/baseline.json results.json
+
+Each size runs in its own process, so the app modules (which read DATABASE_URL
+at import) start fresh and peak RSS isn't carried over. Peak RSS is the
+process's high-water mark after each scenario; scenarios run in the order
+listed in scenarios(). Read responses are measured uncached: the response and
+PDF caches are cleared before every request.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from data_generator import DEFAULT_SEED, generate_sheet, write_workbook  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_ITERATIONS = 20
+PAGE_SIZE = 1000
+PDF_EXPORT_MEETINGS = 50    # PDF reports are for a selection, not the whole tracker
+IMPORT_ROWS = 1000          # Rows of each uploaded workbook (imported on top of the seeded ones)
+
+
+class SqlCounter:
+    """Counts statements executed on the app's engines"""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        self.lock = threading.Lock()
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._executed)
+
+    def _executed(self, conn, cursor, statement, parameters, context, executemany):
+        with self.lock:
+            self.count += 1
+
+
+def percentile(samples, percent: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float:
+    import resource
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+
+
+def clear_read_caches():
+    import main
+    with main.response_cache.lock:
+        main.response_cache.entries.clear()
+    for name in os.listdir(main.report_cache.directory):
+        os.remove(os.path.join(main.report_cache.directory, name))
+
+
+def meeting_ids(limit=None):
+    from database import SessionLocal, Meeting
+    db = SessionLocal()
+    try:
+        query = db.query(Meeting.id).order_by(Meeting.client_first_appearance, Meeting.global_order)
+        return [row.id for row in query.limit(limit)]
+    finally:
+        db.close()
+
+
+def reorder_pair():
+    """First and last update of the client with the most updates (drags it across the whole client)"""
+    from sqlalchemy import func
+    from database import SessionLocal, Meeting
+    db = SessionLocal()
+    try:
+        client_id = db.query(Meeting.client_id).group_by(Meeting.client_id).order_by(func.count().desc()).limit(1).scalar()
+        ranked = db.query(Meeting.id).filter(Meeting.client_id == client_id)
+        first = ranked.order_by(Meeting.client_rank).first()
+        last = ranked.order_by(Meeting.client_rank.desc()).first()
+        return {"dragged_id": first.id, "target_id": last.id}
+    finally:
+        db.close()
+
+
+async def get_all_meeting_pages(client):
+    """Every page of the listing, the way the browser loads it"""
+    cursor = None
+    while True:
+        params = {"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/meetings", params=params)
+        cursor = response.headers.get("x-next-cursor")
+        if response.status_code != 200 or not cursor:
+            return response
+
+
+def scenarios(import_workbook: bytes):
+    """(name, iterations, untimed setup, timed call) in run order"""
+    return [
+        ("get_meetings", DEFAULT_ITERATIONS, clear_read_caches,
+         lambda client, _: client.get("/api/meetings", params={"limit": PAGE_SIZE})),
+        ("get_meetings_all_pages", 5, clear_read_caches,
+         lambda client, _: get_all_meeting_pages(client)),
+        ("get_dashboard_stats", DEFAULT_ITERATIONS, clear_read_caches,
+         lambda client, _: client.get("/api/dashboard/stats")),
+        ("export_to_excel", 3, lambda: meeting_ids(),
+         lambda client, ids: client.post("/api/export/excel", json={"meeting_ids": ids})),
+        ("export_to_pdf", 3, lambda: (clear_read_caches(), meeting_ids(PDF_EXPORT_MEETINGS))[1],
+         lambda client, ids: client.post("/api/export/pdf", json={"meeting_ids": ids})),
+        ("reorder_meetings", DEFAULT_ITERATIONS, reorder_pair,
+         lambda client, pair: client.post("/api/meetings/reorder", json=pair)),
+        # Last: each import adds IMPORT_ROWS meetings
+        ("import_excel", 3, None,
+         lambda client, _: client.post("/api/import-excel", files={"file": (
+             "meetings.xlsx", import_workbook,
+             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+         )}))
+    ]
+
+
+async def run_size(size: int, seed: int, iterations_scale: float) -> dict:
+    """Seed a database with `size` meetings and benchmark every scenario against it"""
+    import httpx
+    import database
+    import main
+    from excel_import import import_meetings
+
+    start = time.perf_counter()
+    db = database.SessionLocal()
+    try:
+        import_meetings(db, generate_sheet(size, seed))
+        db.commit()
+    finally:
+        db.close()
+    seed_seconds = time.perf_counter() - start
+
+    workbook = BytesIO()
+    write_workbook(generate_sheet(IMPORT_ROWS, seed + 1), workbook)
+
+    counter = SqlCounter([
+        database.engine, database.read_engine,
+        database.async_engine.sync_engine, database.async_read_engine.sync_engine
+    ])
+    results = {"meetings": size, "seed_seconds": round(seed_seconds, 2), "scenarios": {}}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for name, iterations, setup, request in scenarios(workbook.getvalue()):
+                iterations = max(1, round(iterations * iterations_scale))
+                latencies = []
+                statements = []
+                status = None
+                for _ in range(iterations):
+                    argument = setup() if setup else None
+                    before = counter.count
+                    began = time.perf_counter()
+                    response = await request(client, argument)
+                    latencies.append((time.perf_counter() - began) * 1000)
+                    statements.append(counter.count - before)
+                    status = response.status_code
+                results["scenarios"][name] = {
+                    "iterations": iterations,
+                    "status": status,
+                    "latency_ms": {
+                        "p50": round(percentile(latencies, 50), 1),
+                        "p90": round(percentile(latencies, 90), 1),
+                        "p99": round(percentile(latencies, 99), 1),
+                        "max": round(max(latencies), 1)
+                    },
+                    "sql_queries": percentile(statements, 50),
+                    "peak_rss_mb": peak_rss_mb()
+                }
+                print(f"INFO: {size} meetings, {name}: p50 {results['scenarios'][name]['latency_ms']['p50']} ms",
+                      file=sys.stderr)
+    return results
+
+
+def run_child(size: int, seed: int, iterations_scale: float, output: str):
+    """Benchmark one size in this process, in a scratch database and PDF cache"""
+    scratch = tempfile.mkdtemp(prefix="meeting-benchmark-")
+    try:
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/benchmark.db"
+        os.environ["PDF_CACHE_DIR"] = os.path.join(scratch, "pdf_cache")
+        os.chdir(REPO_DIR)
+        results = asyncio.run(run_size(size, seed, iterations_scale))
+        with open(output, "w") as f:
+            json.dump(results, f)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def environment() -> dict:
+    import sqlite3
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(terse=True),
+        "cpus": os.cpu_count()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the API endpoints at several database sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--iterations-scale", type=float, default=1.0,
+                        help="Multiply every scenario's iteration count")
+    parser.add_argument("-o", "--output", help="Write the JSON here instead of stdout")
+    parser.add_argument("--child", metavar="RESULT_FILE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.sizes[0], args.seed, args.iterations_scale, args.child)
+        sys.exit(0)
+
+    report = {"seed": args.seed, "environment": environment(), "sizes": {}}
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as result_file:
+            result_path = result_file.name
+        try:
+            # The app's startup logging goes to stderr so stdout stays JSON
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), "--sizes", str(size), "--seed", str(args.seed),
+                "--iterations-scale", str(args.iterations_scale), "--child", result_path
+            ], check=True, stdout=sys.stderr)
+            with open(result_path) as f:
+                report["sizes"][str(size)] = json.load(f)
+        finally:
+            os.remove(result_path)
+
+    output = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"SUCCESS: Wrote benchmark results to {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
@@ -0,0 +1,121 @@
+"""
+Meeting Change Feed
+In-process publish / subscribe of meeting change events for the
+Server-Sent Events stream (GET /api/events). Each subscriber has a bounded
+queue; one that falls behind gets a reset event instead of blocking writers
+"""
+
+import asyncio
+import json
+import threading
+from typing import Optional
+
+SUBSCRIBER_QUEUE_SIZE = 256     # Events buffered per connection before it is reset
+HEARTBEAT_SECONDS = 15          # Comment line keeping idle connections (and proxies) open
+MAX_STREAM_SECONDS = 300        # Streams end after this and the browser reconnects, so shutdown never waits long
+RETRY_MILLISECONDS = 2000       # Reconnect delay sent to EventSource
+
+# Queued instead of an event when a subscriber's queue overflowed
+RESET = object()
+
+
+def format_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """One Server-Sent Events message"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscriber:
+    """One open stream's queue of formatted events"""
+
+    def __init__(self, max_events: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue = asyncio.Queue(max_events)
+
+    def offer(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop its backlog and have it reload instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET)
+
+
+class ChangeFeed:
+    """Fans change events out to the open streams; publish is callable from any thread"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self._loop = None
+
+    def start(self):
+        """Deliver events in the running event loop"""
+        self._loop = asyncio.get_running_loop()
+
+    def has_subscribers(self) -> bool:
+        """Whether anyone is listening (writers skip building events otherwise)"""
+        return bool(self.subscribers) and self._loop is not None and not self._loop.is_closed()
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber()
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, event: str, payload: dict, version: Optional[int] = None):
+        """
+        Send an event to every open stream
+
+        Args:
+            event: Event name (change or reset)
+            payload: JSON-serializable event data
+            version: Data version after the write, sent as the event id
+        """
+        if not self.has_subscribers():
+            return
+        # Serialized once for all subscribers
+        message = format_event(event, json.dumps(payload, default=str), version)
+        self._loop.call_soon_threadsafe(self._deliver, message)
+
+    def _deliver(self, message: str):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(message)
+
+    async def stream(self, request, current_version: int, last_event_id: Optional[str] = None):
+        """
+        Server-Sent Events for one connection
+
+        Args:
+            request: The streaming request, checked for disconnects
+            current_version: Data version when the stream opened
+            last_event_id: Last-Event-ID sent by a reconnecting browser; a
+                reset is sent if writes happened while it was away
+        """
+        subscriber = self.subscribe()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            if last_event_id is not None and last_event_id != str(current_version):
+                yield format_event("reset", "{}", current_version)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + MAX_STREAM_SECONDS
+            while loop.time() < deadline:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event("reset", "{}") if message is RESET else message
+        finally:
+            self.unsubscribe(subscriber)
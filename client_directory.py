@@ -0,0 +1,151 @@
+"""
+Client Directory
+The clients table's cached aggregates (meeting count, last meeting date) and
+each client's address book, kept current inside each write's transaction,
+plus client listing and renames
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database import Client, ClientAddress, Meeting, insert_or_update
+
+# Revision ops that move meetings without saving them, so they don't make an address recent
+UNUSED_OPS = {"reorder"}
+
+
+class ClientNameTaken(Exception):
+    """Raised when renaming a client to another client's name"""
+
+
+def refresh(db: Session, names: Iterable[str]):
+    """
+    Recompute the aggregates of clients whose meetings changed, before the commit
+
+    Clients left without meetings are removed, so their update sequence
+    starts over if they come back.
+
+    Args:
+        names: Clients of the changed meetings, before and after the change
+    """
+    names = {name for name in names if name is not None}
+    if not names:
+        return
+
+    table = Client.__table__
+    meetings = Meeting.__table__
+    db.execute(
+        table.update()
+        .where(table.c.name.in_(names))
+        .values(
+            meeting_count=select(func.count(meetings.c.id))
+            .where(meetings.c.client_id == table.c.id).scalar_subquery(),
+            last_meeting_date=select(func.max(meetings.c.meeting_date))
+            .where(meetings.c.client_id == table.c.id).scalar_subquery()
+        )
+    )
+    db.query(Client).filter(Client.name.in_(names), Client.meeting_count == 0).delete(synchronize_session=False)
+
+
+def is_blank_address(address: Optional[str]) -> bool:
+    """Same rule as database.is_blank ('-' is used as a placeholder)"""
+    return address is None or address.strip(" \t\r\n") == "" or address == "-"
+
+
+def update_addresses(db: Session, revisions):
+    """
+    Apply a write's revisions to the address book, before the commit (and
+    before refresh() removes clients left without meetings)
+
+    Each (client, address) pair's usage count moves by the number of meetings
+    gaining or losing it; pairs saved by the write become the most recent and
+    pairs no meeting uses any more are removed.
+
+    Args:
+        revisions: meeting_revisions.Revision tuples of the write
+    """
+    deltas = Counter()
+    used = set()
+    for revision in revisions:
+        for state, sign in ((revision.before, -1), (revision.after, 1)):
+            if state is not None and state["client"] is not None and not is_blank_address(state["address"]):
+                deltas[state["client"], state["address"]] += sign
+        if revision.after is not None and revision.op not in UNUSED_OPS:
+            used.add((revision.after["client"], revision.after["address"]))
+
+    keys = {key for key, delta in deltas.items() if delta} | (used & set(deltas))
+    if not keys:
+        return
+    client_ids = dict(
+        db.query(Client.name, Client.id).filter(Client.name.in_({client for client, _ in keys})).all()
+    )
+
+    now = datetime.utcnow()
+    table = ClientAddress.__table__
+    for touched in (True, False):
+        rows = [
+            {"client_id": client_ids[client], "address": address, "usage_count": deltas[client, address],
+             "last_used_at": now}
+            for client, address in keys
+            if ((client, address) in used) == touched and client in client_ids
+        ]
+        if not rows:
+            continue
+        statement = insert_or_update(db, table)
+        changes = {"usage_count": table.c.usage_count + statement.excluded.usage_count}
+        if touched:
+            changes["last_used_at"] = statement.excluded.last_used_at
+        db.execute(statement.on_conflict_do_update(index_elements=["client_id", "address"], set_=changes), rows)
+
+    db.query(ClientAddress).filter(
+        ClientAddress.client_id.in_(client_ids.values()), ClientAddress.usage_count <= 0
+    ).delete(synchronize_session=False)
+
+
+def addresses(db: Session, client_name: str) -> List[ClientAddress]:
+    """A client's address book, most used first and then most recently used"""
+    return (
+        db.query(ClientAddress)
+        .join(Client, Client.id == ClientAddress.client_id)
+        .filter(Client.name == client_name)
+        .order_by(ClientAddress.usage_count.desc(), ClientAddress.last_used_at.desc())
+        .all()
+    )
+
+
+def list_clients(db: Session) -> List[Client]:
+    """Every client with meetings, by name"""
+    return db.query(Client).order_by(Client.name).all()
+
+
+def rename(db: Session, client_id: int, name: str, version: int) -> Optional[Client]:
+    """
+    Rename a client (flushed, not committed)
+
+    Meetings read their client's name through client_id, so only the client's
+    row is written; its row_version makes delta syncs reload (see
+    meeting_changes.changes_since).
+
+    Args:
+        version: The write's data version
+
+    Returns:
+        The client, or None if it doesn't exist
+
+    Raises:
+        ClientNameTaken: Another client already has the name
+    """
+    client = db.get(Client, client_id)
+    if client is None:
+        return None
+    if client.name == name:
+        return client
+    if db.query(Client.id).filter(Client.name == name).first():
+        raise ClientNameTaken(f"A client named {name!r} already exists")
+
+    client.name = name
+    client.row_version = version
+    db.flush()
+    return client
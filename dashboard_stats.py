@@ -0,0 +1,175 @@
+"""
+Dashboard KPI Statistics
+Computes the KPIs with SQL aggregates and keeps them in the single-row
+dashboard_stats table, which the write paths update incrementally
+"""
+
+from collections import namedtuple
+from datetime import datetime, date, time, timedelta
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import case, distinct, func, and_
+from sqlalchemy.orm import Session
+from database import Meeting, Client, DashboardStats, client_named, has_open_actions, insert_or_update
+
+STATS_ROW_ID = 1
+UPCOMING_DAYS = 7
+ACTIVE_DAYS = 30
+
+# The Meeting columns that contribute to the KPIs
+MeetingSnapshot = namedtuple(
+    "MeetingSnapshot",
+    ["id", "client", "next_meeting_at", "actions", "actions_taken", "updated_at"]
+)
+
+SNAPSHOT_COLUMNS = (
+    Meeting.id, Meeting.client, Meeting.next_meeting_at,
+    Meeting.actions, Meeting.actions_taken, Meeting.updated_at
+)
+
+
+def snapshot(meeting: Meeting) -> MeetingSnapshot:
+    """Capture the KPI-relevant fields of a meeting"""
+    return MeetingSnapshot(
+        meeting.id, meeting.client, meeting.next_meeting_at,
+        meeting.actions, meeting.actions_taken, meeting.updated_at
+    )
+
+
+def active_cutoff(today: date) -> datetime:
+    """Meetings updated on or after this instant make their client active"""
+    return datetime.combine(today - timedelta(days=ACTIVE_DAYS), time.min)
+
+
+def _is_blank(value: Optional[str]) -> bool:
+    # Same characters as database.is_blank trims, so the deltas match a recompute
+    return not value or value.strip(' \t\r\n') == '' or value == '-'
+
+
+def _has_open_actions(row: MeetingSnapshot) -> bool:
+    return not _is_blank(row.actions) and _is_blank(row.actions_taken)
+
+
+def compute_dashboard_stats(db: Session, today: date) -> dict:
+    """Compute all KPIs in a single aggregate query"""
+    upcoming_end = today + timedelta(days=UPCOMING_DAYS)
+    # Names are unique, so counting client ids counts names
+    named_client = case((Client.name != '', Meeting.client_id))
+
+    row = db.query(
+        func.count(Meeting.id),
+        func.count(distinct(named_client)),
+        func.count(distinct(case((Meeting.updated_at >= active_cutoff(today), named_client)))),
+        func.count(case((and_(Meeting.next_meeting_at >= today, Meeting.next_meeting_at <= upcoming_end), 1))),
+        func.count(case((Meeting.next_meeting_at == today, 1))),
+        func.count(case((has_open_actions(), 1)))
+    ).select_from(Meeting).outerjoin(Client, Client.id == Meeting.client_id).one()
+
+    return {
+        "total_meetings": row[0],
+        "total_clients": row[1],
+        "active_clients": row[2],
+        "upcoming_meetings": row[3],
+        "meetings_today": row[4],
+        "action_required": row[5]
+    }
+
+
+def refresh_dashboard_stats(db: Session) -> DashboardStats:
+    """Recompute the stats row from scratch (first use and once per day)"""
+    today = date.today()
+    # Concurrent first reads can both get here: the first insert wins, the
+    # other is a no-op, and both then update the same row
+    db.execute(
+        insert_or_update(db, DashboardStats.__table__).values(id=STATS_ROW_ID).on_conflict_do_nothing()
+    )
+    stats = db.get(DashboardStats, STATS_ROW_ID, populate_existing=True)
+
+    stats.stats_date = today
+    for key, value in compute_dashboard_stats(db, today).items():
+        setattr(stats, key, value)
+
+    db.commit()
+    return stats
+
+
+def get_dashboard_stats(db: Session) -> DashboardStats:
+    """Read the stats row, recomputing it when it is missing or from a previous day"""
+    stats = db.get(DashboardStats, STATS_ROW_ID)
+    if not stats or stats.stats_date != date.today():
+        stats = refresh_dashboard_stats(db)
+    return stats
+
+
+def _other_rows_exist(db: Session, client: str, exclude_ids, cutoff: Optional[datetime] = None) -> bool:
+    """Check whether the client has rows outside the changed set (optionally updated since cutoff)"""
+    query = db.query(Meeting.id).filter(Meeting.client_id == client_named(client), Meeting.id.notin_(exclude_ids))
+    if cutoff is not None:
+        query = query.filter(Meeting.updated_at >= cutoff)
+    return query.first() is not None
+
+
+def apply_meeting_changes(
+    db: Session,
+    changes: Iterable[Tuple[Optional[MeetingSnapshot], Optional[MeetingSnapshot]]]
+):
+    """
+    Apply KPI deltas for a set of changed meetings.
+
+    Each change is a (before, after) pair of snapshots; before is None for
+    creates and after is None for deletes. Must be called after the changes
+    are flushed and before the commit, so it runs in the same transaction.
+    """
+    changes = list(changes)
+    today = date.today()
+    stats = db.get(DashboardStats, STATS_ROW_ID)
+    if not changes or not stats or stats.stats_date != today:
+        # Nothing to do, or the next read recomputes everything anyway
+        return
+
+    upcoming_end = today + timedelta(days=UPCOMING_DAYS)
+    cutoff = active_cutoff(today)
+
+    deltas = dict.fromkeys(
+        ["total_meetings", "total_clients", "active_clients",
+         "upcoming_meetings", "meetings_today", "action_required"], 0
+    )
+    # client -> {"ids", "before", "after", "active_before", "active_after"}
+    clients = {}
+
+    for before, after in changes:
+        for sign, side, row in ((-1, "before", before), (1, "after", after)):
+            if row is None:
+                continue
+            is_upcoming = row.next_meeting_at is not None and today <= row.next_meeting_at <= upcoming_end
+            deltas["total_meetings"] += sign
+            deltas["upcoming_meetings"] += sign * is_upcoming
+            deltas["meetings_today"] += sign * (row.next_meeting_at == today)
+            deltas["action_required"] += sign * _has_open_actions(row)
+
+            if row.client:
+                entry = clients.setdefault(row.client, {
+                    "ids": set(), "before": False, "after": False,
+                    "active_before": False, "active_after": False
+                })
+                entry["ids"].add(row.id)
+                entry[side] = True
+                if row.updated_at is not None and row.updated_at >= cutoff:
+                    entry["active_" + side] = True
+
+    # Client KPIs only need a lookup when the changed rows alone would flip them
+    for client, entry in clients.items():
+        if entry["before"] != entry["after"]:
+            if not _other_rows_exist(db, client, entry["ids"]):
+                deltas["total_clients"] += 1 if entry["after"] else -1
+        if entry["active_before"] != entry["active_after"]:
+            if not _other_rows_exist(db, client, entry["ids"], cutoff):
+                deltas["active_clients"] += 1 if entry["active_after"] else -1
+
+    updates = {
+        getattr(DashboardStats, key): getattr(DashboardStats, key) + value
+        for key, value in deltas.items() if value
+    }
+    if updates:
+        db.query(DashboardStats).filter(DashboardStats.id == STATS_ROW_ID).update(
+            updates, synchronize_session=False
+        )
@@ -1,33 +1,304 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Date
+import json
+import os
+from sqlalchemy import create_engine, event, inspect, text, bindparam, select, and_, or_, func, Column, ForeignKey, Index, MetaData, Table, BigInteger, Integer, String, Text, DateTime, Date
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, validates, column_property
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from datetime import datetime
+from meeting_dates import parse_next_meeting_date
+import metrics
+from migrations import Migration, upgrade
+from rank_keys import spaced_ranks, rank_value
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./meetings.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./meetings.db")
+if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
+    # Hosting providers still hand out the old scheme name
+    SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Optional separate database (e.g. a replica) for read-only endpoints
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL", SQLALCHEMY_DATABASE_URL)
+
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Applied to every SQLite connection: WAL lets readers run alongside a writer
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,      # 64 MB page cache
+    "mmap_size": 268435456,    # 256 MB memory-mapped I/O
+    "busy_timeout": 5000,      # Wait up to 5 s for a lock instead of failing
+    "temp_store": "MEMORY"
+}
+
+# asyncio drivers used by the async engines
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg"
+}
+
+def make_engine(url: str, read_only: bool = False, use_async: bool = False):
+    """Create an engine (or an asyncio engine) with the pool and SQLite settings used by the app"""
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    is_sqlite = backend == "sqlite"
+    if use_async:
+        database_url = database_url.set(drivername=ASYNC_DRIVERS[backend])
+    options = {}
+
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    if not (is_sqlite and database_url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=AsyncAdaptedQueuePool if use_async else QueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_pre_ping=not is_sqlite
+        )
+
+    new_engine = (create_async_engine if use_async else create_engine)(database_url, **options)
+
+    if is_sqlite:
+        # Async engines fire connection events on their sync core
+        @event.listens_for(new_engine.sync_engine if use_async else new_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+    metrics.instrument_engine(new_engine.sync_engine if use_async else new_engine)
+    return new_engine
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only engine for GET endpoints
+read_engine = make_engine(SQLALCHEMY_READ_DATABASE_URL, read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# asyncio engines for the async routes, so their queries don't block the event loop
+async_engine = make_engine(SQLALCHEMY_DATABASE_URL, use_async=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+async_read_engine = make_engine(SQLALCHEMY_READ_DATABASE_URL, read_only=True, use_async=True)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 class Meeting(Base):
     __tablename__ = "meetings"
 
     id = Column(Integer, primary_key=True, index=True)
-    client = Column(String, index=True)
+    # The client's name is read through client_id (Meeting.client, below Client),
+    # so a rename touches one row. Indexed by the composite indexes below
+    client_id = Column(Integer, ForeignKey("clients.id"))
     people_connected = Column(Text)
     actions = Column(Text)
     next_meeting = Column(String)
+    next_meeting_at = Column(Date, nullable=True, index=True)  # Date parsed from next_meeting
     address = Column(Text)
     actions_taken = Column(Text)
     meeting_date = Column(Date, nullable=True)  # Date when the meeting took place
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    client_order = Column(Integer, default=0)  # Order within client group
+    client_rank = Column(String)  # Rank key of the update within its client (see rank_keys.py)
     global_order = Column(Integer, default=0)  # Original chronological order from Excel
     client_first_appearance = Column(Integer, default=0)  # Track when client first appeared
+    row_version = Column(BigInteger, nullable=False, default=0, index=True)  # Data version of the row's last change
+
+    __table_args__ = (
+        Index("uq_meetings_client_rank", "client_id", "client_rank", unique=True),
+        # Listing order and its keyset cursor
+        Index("ix_meetings_listing", "client_first_appearance", "global_order", "id"),
+        # The dashboard's "client still active" checks
+        Index("ix_meetings_client_updated_at", "client_id", "updated_at"),
+        # Never hand a deleted meeting's id to a new one: revisions and tombstones still refer to it
+        {"sqlite_autoincrement": True},
+    )
+
+    @validates("next_meeting")
+    def _sync_next_meeting_at(self, key, value):
+        # Parse the free-text date once on write so reads can use the index
+        self.next_meeting_at = parse_next_meeting_date(value)
+        return value
+
+# "Update #" within the client, derived from the rank keys at read time.
+# Deferred: counting per row is quadratic over a list, so lists number their
+# rows with update_numbers() / load_update_numbers() instead
+_peer = Meeting.__table__.alias("peer")
+Meeting.client_order = column_property(
+    select(func.count(_peer.c.id))
+    .where(_peer.c.client_id == Meeting.client_id, _peer.c.client_rank <= Meeting.client_rank)
+    .correlate_except(_peer)
+    .scalar_subquery(),
+    deferred=True
+)
+
+def update_numbers(client_ids=None):
+    """
+    Subquery of (id, client_order) numbering the clients' updates in one pass
+
+    Args:
+        client_ids: Ids (or a subquery of ids) of the clients to number; every client when None
+    """
+    query = select(
+        Meeting.id,
+        func.row_number().over(
+            partition_by=Meeting.client_id, order_by=Meeting.client_rank
+        ).label("client_order")
+    )
+    if client_ids is not None:
+        query = query.where(Meeting.client_id.in_(client_ids))
+    return query.subquery("update_numbers")
+
+def load_update_numbers(db, meetings):
+    """Fill in client_order on loaded meetings with one windowed query over their clients"""
+    meetings = [meeting for meeting in meetings if meeting is not None]
+    if not meetings:
+        return
+    numbers = update_numbers({meeting.client_id for meeting in meetings})
+    orders = dict(db.query(numbers.c.id, numbers.c.client_order).filter(
+        numbers.c.id.in_([meeting.id for meeting in meetings])
+    ).all())
+    for meeting in meetings:
+        set_committed_value(meeting, "client_order", orders.get(meeting.id))
+
+class OrderCounter(Base):
+    """Global sequences (e.g. global_order), incremented atomically by the write paths"""
+    __tablename__ = "order_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+class Client(Base):
+    """A client: its update sequence and cached meeting aggregates, kept current by the write paths (see client_directory.py)"""
+    __tablename__ = "clients"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)  # Read by its meetings through client_id (Meeting.client)
+    first_appearance = Column(Integer, nullable=False)  # global_order of the client's first meeting
+    next_order = Column(BigInteger, nullable=False)  # Rank position of the next update (see rank_keys.rank_value)
+    meeting_count = Column(Integer, nullable=False, default=0)
+    last_meeting_date = Column(Date, nullable=True)  # Latest meeting_date of its meetings
+    row_version = Column(BigInteger, nullable=False, default=0)  # Data version of the last rename
+
+    # Revisions refer to clients by id: a client removed with its last meeting keeps its id to itself
+    __table_args__ = ({"sqlite_autoincrement": True},)
+
+# The meeting's client name; writes set client_id (see sequences.next_client_rank)
+Meeting.client = column_property(
+    select(Client.name).where(Client.id == Meeting.client_id).correlate_except(Client).scalar_subquery()
+)
+
+class ClientAddress(Base):
+    """An address used by a client's meetings, with its usage, kept current by the write paths (see client_directory.py)"""
+    __tablename__ = "client_addresses"
+
+    client_id = Column(Integer, ForeignKey("clients.id"), primary_key=True)
+    address = Column(Text, primary_key=True)
+    usage_count = Column(Integer, nullable=False, default=0)  # Meetings with the address
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Last write saving a meeting with it
+
+    __table_args__ = (
+        # The address book, most used and then most recent first
+        Index("ix_client_addresses_rank", "client_id", "usage_count", "last_used_at"),
+    )
+
+class DashboardStats(Base):
+    """Single-row table holding the dashboard KPIs, kept current by the write paths"""
+    __tablename__ = "dashboard_stats"
+
+    id = Column(Integer, primary_key=True)
+    stats_date = Column(Date)  # Day the date-relative KPIs were computed for
+    total_meetings = Column(Integer, default=0)
+    total_clients = Column(Integer, default=0)
+    active_clients = Column(Integer, default=0)
+    upcoming_meetings = Column(Integer, default=0)
+    meetings_today = Column(Integer, default=0)
+    action_required = Column(Integer, default=0)
+
+class DeletedMeeting(Base):
+    """Tombstone of a deleted meeting, so delta syncs can report the delete (see meeting_changes.py)"""
+    __tablename__ = "deleted_meetings"
+
+    id = Column(Integer, primary_key=True)  # The meeting's id
+    row_version = Column(BigInteger, nullable=False, index=True)  # Data version of the delete
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+class MeetingRevision(Base):
+    """A meeting's state before and after one write, recorded in the write's transaction (see meeting_revisions.py)"""
+    __tablename__ = "meeting_revisions"
+
+    id = Column(Integer, primary_key=True)  # Revision number
+    meeting_id = Column(Integer, nullable=False)  # Not a foreign key: revisions outlive deleted meetings
+    version = Column(BigInteger, nullable=False)  # Data version of the write; groups the rows of one action
+    op = Column(String, nullable=False)  # create, update, delete, reorder, import, revert, undo or redo
+    before = Column(Text)  # JSON state, None for creates
+    after = Column(Text)  # JSON state, None for deletes
+    session_id = Column(String)  # Browser session whose undo stack has the write
+    undo_state = Column(String)  # "done" or "undone" while on that session's undo / redo stack
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_meeting_revisions_meeting", "meeting_id", "id"),
+        Index("ix_meeting_revisions_session", "session_id", "undo_state", "version"),
+    )
+
+class EmailOutbox(Base):
+    """Emails waiting for the outbox worker (see email_outbox.py), written in the sender's transaction"""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    dedup_key = Column(String, unique=True, nullable=True)  # e.g. one digest per recipient per day
+    to_email = Column(String, nullable=False)
+    to_name = Column(String)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text)
+    text_content = Column(Text)
+    substitutions = Column(Text)  # JSON object of per-recipient placeholder values
+    status = Column(String, nullable=False, default="pending")  # pending, sending, sent or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = Column(String)  # Worker pass currently sending the email
+    claimed_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
+
+def is_blank(column):
+    """SQL condition for an empty text field ('-' is used as a placeholder)"""
+    return or_(column.is_(None), func.trim(column, ' \t\r\n') == '', column == '-')
+
+def has_open_actions():
+    """SQL condition for meetings that have actions but no actions taken yet"""
+    return and_(~is_blank(Meeting.actions), is_blank(Meeting.actions_taken))
+
+def client_named(name):
+    """SQL expression for the id of the client with this name (NULL when there is none)"""
+    return select(Client.id).where(Client.name == name).scalar_subquery()
+
+def insert_or_update(bind, table):
+    """INSERT construct supporting ON CONFLICT clauses on SQLite and PostgreSQL"""
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()  # A Session
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
 
 def get_db():
     db = SessionLocal()
@@ -36,4 +307,415 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+def backfill_next_meeting_dates():
+    """Add the next_meeting_at column to existing databases and fill it once"""
+    columns = [c["name"] for c in inspect(engine).get_columns("meetings")]
+    if "next_meeting_at" in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE meetings ADD COLUMN next_meeting_at DATE"))
+        rows = conn.execute(text(
+            "SELECT id, next_meeting FROM meetings WHERE next_meeting IS NOT NULL"
+        )).all()
+        params = [
+            {"meeting_id": row.id, "parsed_date": parsed}
+            for row in rows
+            if (parsed := parse_next_meeting_date(row.next_meeting))
+        ]
+        if params:
+            conn.execute(
+                Meeting.__table__.update()
+                .where(Meeting.id == bindparam("meeting_id"))
+                # Keep updated_at as is; the backfill is not a user edit
+                .values(next_meeting_at=bindparam("parsed_date"), updated_at=Meeting.updated_at),
+                params
+            )
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_meetings_next_meeting_at ON meetings (next_meeting_at)"
+        ))
+
+def backfill_client_ranks():
+    """Add the client_rank column to existing databases, keeping the current update order"""
+    columns = [c["name"] for c in inspect(engine).get_columns("meetings")]
+    if "client_rank" in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE meetings ADD COLUMN client_rank VARCHAR"))
+        rows = conn.execute(text(
+            "SELECT id, client FROM meetings ORDER BY client, client_order, id"
+        )).all()
+
+        by_client = {}
+        for row in rows:
+            by_client.setdefault(row.client, []).append(row.id)
+
+        params = [
+            {"meeting_id": meeting_id, "rank": rank}
+            for ids in by_client.values()
+            for meeting_id, rank in zip(ids, spaced_ranks(len(ids)))
+        ]
+        if params:
+            conn.execute(
+                Meeting.__table__.update()
+                .where(Meeting.id == bindparam("meeting_id"))
+                # Keep updated_at as is; the backfill is not a user edit
+                .values(client_rank=bindparam("rank"), updated_at=Meeting.updated_at),
+                params
+            )
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_meetings_client_rank ON meetings (client, client_rank)"
+        ))
+
+def backfill_order_counters():
+    """Seed the global order sequence from existing meetings the first time it is used (clients: see backfill_clients)"""
+    with engine.begin() as conn:
+        if conn.execute(select(OrderCounter.name).limit(1)).first():
+            return
+
+        # Rank keys are unique per client from now on
+        conn.execute(text("DROP INDEX IF EXISTS ix_meetings_client_rank"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_meetings_client_rank ON meetings (client, client_rank)"
+        ))
+
+        max_global = conn.execute(select(func.max(Meeting.global_order))).scalar() or 0
+
+        # Several workers may start at once; the first one to insert wins
+        conn.execute(
+            insert_or_update(conn, OrderCounter.__table__).on_conflict_do_nothing(),
+            [{"name": "global_order", "value": max_global}]
+        )
+
+def backfill_row_versions():
+    """Add the row_version column to existing databases; existing rows start at version 0"""
+    columns = [c["name"] for c in inspect(engine).get_columns("meetings")]
+    if "row_version" in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE meetings ADD COLUMN row_version BIGINT NOT NULL DEFAULT 0"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_meetings_row_version ON meetings (row_version)"
+        ))
+
+# Columns of the full-text index, the client's name and the meeting notes (see meeting_search.py)
+SEARCH_COLUMNS = ["client", "people_connected", "actions", "address", "actions_taken"]
+
+def create_search_index():
+    """Create the FTS5 index over the meeting notes, kept in sync by triggers (SQLite only)"""
+    if engine.dialect.name != "sqlite":
+        return
+    if "client" not in [c["name"] for c in inspect(engine).get_columns("meetings")]:
+        return  # Meetings read their client's name through client_id: see create_client_search_index
+
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meetings_fts'"
+        )).first()
+        if not exists:
+            # External content table: the text lives only in meetings, the index stores tokens
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE meetings_fts USING fts5({columns}, "
+                "content='meetings', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            ))
+
+        # Triggers cover every write path, including Core inserts and bulk deletes
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN "
+            f"INSERT INTO meetings_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN "
+            f"INSERT INTO meetings_fts(meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        # Only text edits touch the index; reorders and date changes don't
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE OF {columns} ON meetings BEGIN "
+            f"INSERT INTO meetings_fts(meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO meetings_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+
+        if not exists:
+            conn.execute(text("INSERT INTO meetings_fts(meetings_fts) VALUES ('rebuild')"))
+
+# Indexes for the hot query shapes, declared on Meeting; checked by benchmarks/query_plans.py
+QUERY_INDEXES = ["ix_meetings_listing", "ix_meetings_client_updated_at"]
+
+def create_query_indexes():
+    """Add the composite query indexes to existing databases and drop the client index they make redundant"""
+    indexes = {index.name: index for index in Meeting.__table__.indexes}
+    columns = [c["name"] for c in inspect(engine).get_columns("meetings")]
+    with engine.begin() as conn:
+        indexes["ix_meetings_listing"].create(conn, checkfirst=True)
+        if "client" in columns:
+            # Keyed by the client's name until the meetings link to the clients table
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_meetings_client_updated_at ON meetings (client, updated_at)"
+            ))
+        conn.execute(text("DROP INDEX IF EXISTS ix_meetings_client"))
+
+def backfill_clients():
+    """Fill the clients table from existing meetings (and the old client_counters sequences) and link the meetings to it"""
+    columns = [c["name"] for c in inspect(engine).get_columns("meetings")]
+    if "client" not in columns:
+        return  # Created with the clients table
+
+    with engine.begin() as conn:
+        if "client_id" not in columns:
+            conn.execute(text("ALTER TABLE meetings ADD COLUMN client_id INTEGER REFERENCES clients (id)"))
+
+        counters = {}
+        if inspect(conn).has_table("client_counters"):
+            counters = {
+                row.client: (row.first_appearance, row.rank_value)
+                for row in conn.execute(text("SELECT client, first_appearance, rank_value FROM client_counters"))
+            }
+
+        # The name column predates the model's Meeting.client (read through client_id)
+        clients = conn.execute(text(
+            "SELECT client, min(client_first_appearance), max(client_rank), count(id), "
+            "max(meeting_date) AS last_meeting_date FROM meetings WHERE client IS NOT NULL GROUP BY client"
+        ).columns(last_meeting_date=Date)).all()
+        if clients:
+            # The old sequence may be ahead of the last meeting (deleted updates); never reuse a position
+            conn.execute(insert_or_update(conn, Client.__table__).on_conflict_do_nothing(), [
+                {
+                    "name": name,
+                    "first_appearance": counters.get(name, (first_appearance or 0,))[0],
+                    "next_order": max(counters.get(name, (0, 0))[1], rank_value(last_rank or "0")) + 1,
+                    "meeting_count": meeting_count,
+                    "last_meeting_date": last_meeting_date
+                }
+                for name, first_appearance, last_rank, meeting_count, last_meeting_date in clients
+            ])
+
+        conn.execute(text(
+            "UPDATE meetings SET client_id = (SELECT clients.id FROM clients WHERE clients.name = meetings.client) "
+            "WHERE client_id IS NULL"
+        ))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meetings_client_id ON meetings (client_id)"))
+        conn.execute(text("DROP TABLE IF EXISTS client_counters"))
+
+def backfill_client_addresses():
+    """Fill the client address book from existing meetings and drop the index the old DISTINCT lookup used"""
+    with engine.begin() as conn:
+        if conn.execute(select(ClientAddress.client_id).limit(1)).first() is None:
+            addresses = select(
+                Meeting.client_id, Meeting.address, func.count(Meeting.id),
+                func.max(func.coalesce(Meeting.updated_at, Meeting.created_at, func.current_timestamp()))
+            ).where(
+                Meeting.client_id.isnot(None), ~is_blank(Meeting.address)
+            ).group_by(Meeting.client_id, Meeting.address)
+            conn.execute(ClientAddress.__table__.insert().from_select(
+                ["client_id", "address", "usage_count", "last_used_at"], addresses
+            ))
+        conn.execute(text("DROP INDEX IF EXISTS ix_meetings_client_address"))
+
+def rebuild_with_autoincrement(conn, name: str):
+    """Rebuild a table with AUTOINCREMENT, keeping its rows, indexes and triggers (SQLite only)"""
+    # Indexes and triggers are dropped with the old table; recreate them on the new one
+    dependents = [row.sql for row in conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = :name "
+        "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    ), {"name": name})]
+    # Reflected rather than taken from the model, so it matches the schema the migration runs on
+    reflected = MetaData()
+    rebuilt = Table(name, reflected, autoload_with=conn).to_metadata(reflected, name=f"{name}_rebuild")
+    rebuilt.dialect_options["sqlite"]["autoincrement"] = True
+    columns = ", ".join(column.name for column in rebuilt.columns)
+
+    conn.execute(CreateTable(rebuilt))
+    conn.execute(text(f"INSERT INTO {name}_rebuild ({columns}) SELECT {columns} FROM {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.execute(text(f"ALTER TABLE {name}_rebuild RENAME TO {name}"))
+    for sql in dependents:
+        conn.execute(text(sql))
+
+def has_autoincrement(conn, name: str) -> bool:
+    """Whether a table was created with AUTOINCREMENT (SQLite only)"""
+    table_sql = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {"name": name}).scalar()
+    return "AUTOINCREMENT" in table_sql.upper()
+
+def make_meeting_ids_monotonic():
+    """Rebuild the meetings table with AUTOINCREMENT, so deleted meetings' ids aren't reused (SQLite only)"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        if has_autoincrement(conn, "meetings"):
+            return
+        rebuild_with_autoincrement(conn, "meetings")
+
+        # Start after every id ever handed out, including deleted meetings
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'meetings'"))
+        conn.execute(text(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'meetings', max("
+            "(SELECT coalesce(max(id), 0) FROM meetings), "
+            "(SELECT coalesce(max(id), 0) FROM deleted_meetings), "
+            "(SELECT coalesce(max(meeting_id), 0) FROM meeting_revisions))"
+        ))
+
+def create_client_search_index(conn):
+    """
+    Create the FTS5 index over the meeting notes and their client's name (SQLite only)
+
+    The index reads its text through the meetings_search view, which joins each
+    meeting to its client; triggers on both tables keep it in sync, so a rename
+    reindexes the client's meetings without writing to them.
+    """
+    columns = ", ".join(SEARCH_COLUMNS)
+    notes = [column for column in SEARCH_COLUMNS if column != "client"]
+    view_columns = ", ".join(
+        "clients.name AS client" if column == "client" else f"meetings.{column}" for column in SEARCH_COLUMNS
+    )
+    old_values = ", ".join(
+        "(SELECT name FROM clients WHERE id = old.client_id)" if column == "client" else f"old.{column}"
+        for column in SEARCH_COLUMNS
+    )
+
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meetings_fts'"
+    )).first()
+    conn.execute(text(
+        f"CREATE VIEW IF NOT EXISTS meetings_search AS SELECT meetings.id, {view_columns} "
+        "FROM meetings LEFT JOIN clients ON clients.id = meetings.client_id"
+    ))
+    if not exists:
+        # External content table: the text lives only in meetings and clients, the index stores tokens
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE meetings_fts USING fts5({columns}, "
+            "content='meetings_search', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+    # Triggers cover every write path, including Core inserts and bulk deletes
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN "
+        f"INSERT INTO meetings_fts(rowid, {columns}) SELECT id, {columns} FROM meetings_search WHERE id = new.id; END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN "
+        f"INSERT INTO meetings_fts(meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    # Only text and client edits touch the index; reorders and date changes don't
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE OF client_id, {', '.join(notes)} "
+        "ON meetings BEGIN "
+        f"INSERT INTO meetings_fts(meetings_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO meetings_fts(rowid, {columns}) SELECT id, {columns} FROM meetings_search WHERE id = new.id; END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS clients_fts_rename AFTER UPDATE OF name ON clients BEGIN "
+        f"INSERT INTO meetings_fts(meetings_fts, rowid, {columns}) "
+        f"SELECT 'delete', id, old.name, {', '.join(notes)} FROM meetings WHERE client_id = old.id; "
+        f"INSERT INTO meetings_fts(rowid, {columns}) "
+        f"SELECT id, new.name, {', '.join(notes)} FROM meetings WHERE client_id = new.id; END"
+    ))
+
+    if not exists:
+        conn.execute(text("INSERT INTO meetings_fts(meetings_fts) VALUES ('rebuild')"))
+
+def backfill_revision_client_ids(conn):
+    """Add client_id to the recorded meeting states, so restores follow later renames"""
+    client_ids = dict(conn.execute(text("SELECT name, id FROM clients")).all())
+
+    def with_client_id(data):
+        if data is None:
+            return None
+        state = json.loads(data)
+        state.setdefault("client_id", client_ids.get(state.get("client")))
+        return json.dumps(state)
+
+    rows = conn.execute(text("SELECT id, before, after FROM meeting_revisions")).all()
+    params = [
+        {"revision_id": row.id, "before": with_client_id(row.before), "after": with_client_id(row.after)}
+        for row in rows
+    ]
+    if params:
+        conn.execute(
+            text("UPDATE meeting_revisions SET before = :before, after = :after WHERE id = :revision_id"),
+            params
+        )
+
+def read_client_names_by_id():
+    """
+    Drop the meetings' copy of their client's name, which they now read through
+    client_id, so a rename writes one row (see client_directory.rename)
+    """
+    is_sqlite = engine.dialect.name == "sqlite"
+    indexes = {index.name: index for index in Meeting.__table__.indexes}
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if "row_version" not in [c["name"] for c in inspector.get_columns("clients")]:
+            conn.execute(text("ALTER TABLE clients ADD COLUMN row_version BIGINT NOT NULL DEFAULT 0"))
+
+        if "client" in [c["name"] for c in inspector.get_columns("meetings")]:
+            conn.execute(text(
+                "UPDATE meetings SET client_id = (SELECT clients.id FROM clients WHERE clients.name = meetings.client) "
+                "WHERE client_id IS NULL"
+            ))
+            if is_sqlite:
+                # The old search index reads the column; it is recreated over the client's name below
+                for trigger in ("meetings_fts_insert", "meetings_fts_delete", "meetings_fts_update"):
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+                conn.execute(text("DROP TABLE IF EXISTS meetings_fts"))
+            backfill_revision_client_ids(conn)
+            for name in ("uq_meetings_client_rank", "ix_meetings_client_updated_at", "ix_meetings_client",
+                         "ix_meetings_client_id"):
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            conn.execute(text("ALTER TABLE meetings DROP COLUMN client"))
+
+        for name in ("uq_meetings_client_rank", "ix_meetings_client_updated_at"):
+            indexes[name].create(conn, checkfirst=True)
+
+        if is_sqlite:
+            # Revisions follow a client by id (see meeting_revisions.restore): don't reuse removed clients' ids
+            if not has_autoincrement(conn, "clients"):
+                rebuild_with_autoincrement(conn, "clients")
+                conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'clients'"))
+                conn.execute(text(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT 'clients', coalesce(max(id), 0) FROM clients"
+                ))
+            create_client_search_index(conn)
+
+# Schema changes for existing databases, in order (see migrations.py). New
+# databases get the model schema from create_all and run them once too.
+# Append new migrations; never renumber them.
+MIGRATIONS = [
+    Migration(1, "next_meeting_at column", backfill_next_meeting_dates),
+    Migration(2, "client_rank column", backfill_client_ranks),
+    Migration(3, "order counters", backfill_order_counters),
+    Migration(4, "row_version column", backfill_row_versions),
+    Migration(5, "full-text search index", create_search_index),
+    Migration(6, "composite query indexes", create_query_indexes),
+    Migration(7, "clients table", backfill_clients),
+    Migration(8, "client address book", backfill_client_addresses),
+    Migration(9, "monotonic meeting ids", make_meeting_ids_monotonic),
+    Migration(10, "client names read through client_id", read_client_names_by_id)
+]
+
 Base.metadata.create_all(bind=engine)
+upgrade(engine, MIGRATIONS)
@@ -40,3 +40,18 @@ except ImportError:
 
 # Email Templates
 EMAIL_SUBJECT_TEMPLATE = "Meeting Reminders - {date}"
+
+# Email outbox delivery (see email_outbox.py)
+SENDGRID_API_HOST = os.getenv("SENDGRID_API_HOST", "https://api.sendgrid.com")
+EMAIL_OUTBOX_CONCURRENCY = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", "4"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))
+
+# Daily digest recipients as "Name <email>" entries separated by commas
+# (defaults to the default recipient)
+REMINDER_RECIPIENTS = []
+for _entry in os.getenv("REMINDER_RECIPIENTS", "").split(","):
+    _name, _, _email = _entry.strip().rpartition("<")
+    if _email.strip(" >"):
+        REMINDER_RECIPIENTS.append((_name.strip() or None, _email.strip(" >")))
+if not REMINDER_RECIPIENTS:
+    REMINDER_RECIPIENTS = [(DEFAULT_RECIPIENT_NAME, DEFAULT_RECIPIENT_EMAIL)]
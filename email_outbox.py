@@ -0,0 +1,310 @@
+"""
+Email Outbox
+Emails are enqueued in the email_outbox table inside the sender's database
+transaction and delivered by a background worker with a concurrency limit,
+exponential backoff retries and batching of identical messages
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from database import EmailOutbox, SessionLocal, insert_or_update
+
+CLAIM_BATCH_SIZE = 200          # Emails claimed per worker pass
+POLL_SECONDS = 30               # Idle check for retries that became due
+RETRY_BASE_SECONDS = 30         # First retry delay, doubled on each attempt
+RETRY_MAX_SECONDS = 3600
+SENDING_TIMEOUT_SECONDS = 300   # Claims older than this are retried (worker died mid-send)
+RETENTION_DAYS = 30             # Delivered and failed emails are kept this long (dedup history)
+
+# Error responses that won't succeed on retry (bad request, auth, ...)
+PERMANENT_STATUS_CODES = range(400, 500)
+RETRYABLE_STATUS_CODES = (408, 429)
+
+
+def enqueue(
+    db: Session,
+    to_email: str,
+    subject: str,
+    html_content: Optional[str] = None,
+    text_content: Optional[str] = None,
+    to_name: Optional[str] = None,
+    substitutions: Optional[Dict[str, str]] = None,
+    dedup_key: Optional[str] = None
+) -> bool:
+    """
+    Queue an email; the caller commits, so it is only sent if the transaction succeeds
+
+    Args:
+        substitutions: Per-recipient placeholder values, so one body can be
+            shared (and batched) between recipients
+        dedup_key: Emails with a key already in the outbox are skipped
+
+    Returns:
+        bool: False if the email was a duplicate
+    """
+    statement = insert_or_update(db, EmailOutbox.__table__).values(
+        dedup_key=dedup_key,
+        to_email=to_email,
+        to_name=to_name,
+        subject=subject,
+        html_content=html_content,
+        text_content=text_content,
+        substitutions=json.dumps(substitutions) if substitutions else None,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+        created_at=datetime.utcnow()
+    ).on_conflict_do_nothing()
+    return db.execute(statement).rowcount == 1
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts"""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def claim_due(db: Session, token: str, limit: int = CLAIM_BATCH_SIZE) -> List[EmailOutbox]:
+    """
+    Atomically mark due emails as being sent by this pass
+
+    A single UPDATE re-checks the due condition, so two workers never claim the same email.
+    """
+    now = datetime.utcnow()
+    due = or_(
+        and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == "sending",
+             EmailOutbox.claimed_at < now - timedelta(seconds=SENDING_TIMEOUT_SECONDS))
+    )
+    due_ids = select(EmailOutbox.id).where(due).order_by(EmailOutbox.id).limit(limit).scalar_subquery()
+    db.query(EmailOutbox).filter(EmailOutbox.id.in_(due_ids), due).update({
+        EmailOutbox.status: "sending",
+        EmailOutbox.claim_token: token,
+        EmailOutbox.claimed_at: now,
+        EmailOutbox.attempts: EmailOutbox.attempts + 1
+    }, synchronize_session=False)
+    db.commit()
+    return db.query(EmailOutbox).filter(EmailOutbox.claim_token == token).order_by(EmailOutbox.id).all()
+
+
+def purge_finished(db: Session) -> int:
+    """Delete sent and failed emails past the retention period"""
+    cutoff = datetime.utcnow() - timedelta(days=RETENTION_DAYS)
+    deleted = db.query(EmailOutbox).filter(
+        EmailOutbox.status.in_(["sent", "failed"]),
+        EmailOutbox.created_at < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def group_batches(emails: List[EmailOutbox], max_size: int) -> List[List[EmailOutbox]]:
+    """Group emails with the same subject and bodies, so each group is one API request"""
+    groups = {}
+    for email in emails:
+        groups.setdefault((email.subject, email.html_content, email.text_content), []).append(email)
+    return [
+        group[start:start + max_size]
+        for group in groups.values()
+        for start in range(0, len(group), max_size)
+    ]
+
+
+def record_result(db: Session, ids: List[int], token: str, error: Optional[Exception], max_attempts: int):
+    """Mark a batch as sent, or schedule its retry / give up after a failure"""
+    emails = db.query(EmailOutbox).filter(EmailOutbox.id.in_(ids), EmailOutbox.claim_token == token).all()
+    now = datetime.utcnow()
+    status_code = getattr(error, "status_code", None)
+    permanent = status_code in PERMANENT_STATUS_CODES and status_code not in RETRYABLE_STATUS_CODES
+
+    for email in emails:
+        email.claim_token = None
+        if error is None:
+            email.status = "sent"
+            email.sent_at = now
+            email.last_error = None
+        elif permanent or email.attempts >= max_attempts:
+            email.status = "failed"
+            email.last_error = str(error)
+        else:
+            email.status = "pending"
+            email.next_attempt_at = now + retry_delay(email.attempts)
+            email.last_error = str(error)
+    db.commit()
+
+
+class OutboxWorker:
+    """Background task delivering the email outbox through SendGrid"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        session_factory=SessionLocal,
+        poll_seconds: float = POLL_SECONDS
+    ):
+        """Settings left as None are read from email_config"""
+        self.settings = {
+            "api_key": api_key,
+            "host": host,
+            "from_email": from_email,
+            "from_name": from_name,
+            "concurrency": concurrency,
+            "max_attempts": max_attempts
+        }
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.email_service = None
+        self._task = None
+        self._loop = None
+        self._wake = None
+
+    def _configure(self):
+        import email_config
+        from email_service import EmailService
+
+        defaults = {
+            "api_key": email_config.SENDGRID_API_KEY,
+            "host": email_config.SENDGRID_API_HOST,
+            "from_email": email_config.FROM_EMAIL,
+            "from_name": getattr(email_config, "FROM_NAME", None),
+            "concurrency": email_config.EMAIL_OUTBOX_CONCURRENCY,
+            "max_attempts": email_config.EMAIL_MAX_ATTEMPTS
+        }
+        for key, value in defaults.items():
+            if self.settings[key] is None:
+                self.settings[key] = value
+
+        if self.settings["api_key"]:
+            self.email_service = EmailService(
+                api_key=self.settings["api_key"],
+                from_email=self.settings["from_email"],
+                from_name=self.settings["from_name"],
+                host=self.settings["host"]
+            )
+
+    def start(self) -> bool:
+        """Start delivering in the running event loop (no-op without an API key)"""
+        if self._task is not None:
+            return True
+        self._configure()
+        if not self.email_service:
+            print("INFO: SENDGRID_API_KEY not set, email outbox worker not started")
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"SUCCESS: Email outbox worker started (concurrency {self.settings['concurrency']})")
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """Deliver newly committed emails now instead of at the next poll (callable from any thread)"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                print(f"ERROR: Email outbox pass failed: {str(e)}")
+                processed = 0
+            if processed:
+                continue  # More may be due right away
+            try:
+                await asyncio.to_thread(self._with_session, purge_finished)
+            except Exception as e:
+                print(f"ERROR: Email outbox purge failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def run_once(self) -> int:
+        """
+        Claim the due emails and send them
+
+        Returns:
+            Number of emails processed (sent or failed)
+        """
+        if self.email_service is None:
+            self._configure()
+            if self.email_service is None:
+                return 0
+
+        from email_service import MAX_PERSONALIZATIONS
+
+        token = uuid.uuid4().hex
+        emails = await asyncio.to_thread(self._with_session, claim_due, token)
+        if not emails:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.settings["concurrency"])
+
+        async def deliver(batch):
+            async with semaphore:
+                error = None
+                try:
+                    await asyncio.to_thread(self._send, batch)
+                except Exception as e:
+                    error = e
+                await asyncio.to_thread(
+                    self._with_session, record_result, [email.id for email in batch], token,
+                    error, self.settings["max_attempts"]
+                )
+                if error:
+                    print(f"ERROR: Email batch of {len(batch)} failed: {str(error)}")
+
+        await asyncio.gather(*(deliver(batch) for batch in group_batches(emails, MAX_PERSONALIZATIONS)))
+        return len(emails)
+
+    async def drain(self) -> int:
+        """Send everything that is due now (used by the standalone scheduler and tests)"""
+        total = 0
+        while processed := await self.run_once():
+            total += processed
+        return total
+
+    def _send(self, batch: List[EmailOutbox]):
+        first = batch[0]
+        self.email_service.send_batch(
+            subject=first.subject,
+            html_content=first.html_content,
+            text_content=first.text_content,
+            recipients=[
+                {
+                    "email": email.to_email,
+                    "name": email.to_name,
+                    "substitutions": json.loads(email.substitutions) if email.substitutions else None
+                }
+                for email in batch
+            ]
+        )
+
+    def _with_session(self, function, *args):
+        db = self.session_factory()
+        try:
+            # Claimed rows are read after the commit, so keep their loaded values
+            db.expire_on_commit = False
+            return function(db, *args)
+        finally:
+            db.close()
@@ -1,35 +1,51 @@
 """
 Email Scheduler for Meeting Reminders
-Sends automated daily reminders at 8 AM IST for meetings within 7 days
+Sends automated daily reminders at 8 AM IST for meetings within 7 days.
+The web app runs it through reminder_timer.py; running this file starts the
+same timer standalone
 """
 
-import schedule
-import time
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime, date, timedelta
 import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from database import get_db, Meeting
 from email_service import EmailService
+import email_outbox
+from meeting_dates import parse_next_meeting_date
 from email_config import (
     SENDGRID_API_KEY,
     FROM_EMAIL,
     DEFAULT_RECIPIENT_EMAIL,
     DEFAULT_RECIPIENT_NAME,
     REMINDER_DAYS_THRESHOLD,
-    REMINDER_TIME_IST
+    REMINDER_TIME_IST,
+    REMINDER_RECIPIENTS
 )
-import re
+
+# Placeholder for the recipient's name in the digest body, filled in per
+# recipient by SendGrid so one body is shared by all recipients
+RECIPIENT_NAME_TAG = "-recipient_name-"
 
 
 class MeetingReminderScheduler:
     """Scheduler for automated meeting reminder emails"""
 
-    def __init__(self):
-        """Initialize the scheduler with email service"""
+    def __init__(self, outbox_worker=None):
+        """
+        Initialize the scheduler with email service
+
+        Args:
+            outbox_worker: Running email_outbox.OutboxWorker to wake after
+                queueing; without one the outbox is drained in this process
+        """
         self.email_service = EmailService(
             api_key=SENDGRID_API_KEY,
             from_email=FROM_EMAIL
         )
+        self.outbox_worker = outbox_worker
         self.ist_timezone = pytz.timezone('Asia/Kolkata')
 
     def parse_next_meeting_date(self, next_meeting_str: str):
@@ -37,81 +53,97 @@ class MeetingReminderScheduler:
         Parse the next meeting date from the string format
         Expected format: "Fri, Dec 6, 2024" or similar
         """
-        if not next_meeting_str or next_meeting_str == '-':
-            return None
-
-        # Extract date pattern like "Fri, Dec 6, 2024"
-        date_match = re.search(
-            r'([A-Za-z]{3}),\s+([A-Za-z]{3})\s+(\d{1,2}),\s+(\d{4})',
-            next_meeting_str
-        )
-
-        if not date_match:
-            return None
-
-        try:
-            # Parse the date
-            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-
-            month_str = date_match.group(2)
-            day = int(date_match.group(3))
-            year = int(date_match.group(4))
-
-            month = month_names.index(month_str) + 1
-
-            return datetime(year, month, day)
-        except (ValueError, IndexError):
-            return None
+        return parse_next_meeting_date(next_meeting_str)
 
-    def calculate_days_until(self, meeting_date: datetime) -> int:
+    def calculate_days_until(self, meeting_date: date) -> int:
         """Calculate days until a meeting"""
         if not meeting_date:
             return None
 
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        meeting_date = meeting_date.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        delta = meeting_date - today
-        return delta.days
-
-    def get_upcoming_meetings(self, db: Session) -> list:
+        return (meeting_date - date.today()).days
+
+    def upcoming_meetings_query(self, days: int = REMINDER_DAYS_THRESHOLD):
+        """SELECT for the meetings within the next `days` days (range scan on next_meeting_at)"""
+        today = date.today()
+        return select(Meeting).where(
+            Meeting.next_meeting_at >= today,
+            Meeting.next_meeting_at <= today + timedelta(days=days)
+        ).order_by(Meeting.next_meeting_at, Meeting.id)
+
+    def meeting_to_dict(self, meeting: Meeting) -> dict:
+        """Meeting dictionary used by the reminder email"""
+        return {
+            'id': meeting.id,
+            'client': meeting.client,
+            'next_meeting': meeting.next_meeting,
+            'meeting_date': meeting.next_meeting_at,
+            'days_left': self.calculate_days_until(meeting.next_meeting_at),
+            'people_connected': meeting.people_connected or '-',
+            'actions': meeting.actions or '-',
+            'address': meeting.address or '-',
+            'actions_taken': meeting.actions_taken or '-',
+            'updated_at': meeting.updated_at
+        }
+
+    def get_upcoming_meetings(self, db: Session, days: int = REMINDER_DAYS_THRESHOLD) -> list:
         """
-        Get all meetings within the next 7 days
+        Get all meetings within the next `days` days
 
         Returns:
             List of meeting dictionaries with parsed data
         """
-        all_meetings = db.query(Meeting).all()
-        upcoming_meetings = []
-
-        today = datetime.now()
-
-        for meeting in all_meetings:
-            # Check next_meeting field
-            if meeting.next_meeting:
-                meeting_date = self.parse_next_meeting_date(meeting.next_meeting)
-                if meeting_date:
-                    days_until = self.calculate_days_until(meeting_date)
-
-                    # Only include meetings within threshold and not past
-                    if days_until is not None and 0 <= days_until <= REMINDER_DAYS_THRESHOLD:
-                        upcoming_meetings.append({
-                            'id': meeting.id,
-                            'client': meeting.client,
-                            'next_meeting': meeting.next_meeting,
-                            'meeting_date': meeting_date,
-                            'days_left': days_until,
-                            'people_connected': meeting.people_connected or '-',
-                            'actions': meeting.actions or '-',
-                            'address': meeting.address or '-',
-                            'actions_taken': meeting.actions_taken or '-'
-                        })
-
-        # Sort by days_left (most urgent first)
-        upcoming_meetings.sort(key=lambda x: x['days_left'])
-
-        return upcoming_meetings
+        meetings = db.execute(self.upcoming_meetings_query(days)).scalars()
+        return [self.meeting_to_dict(meeting) for meeting in meetings]
+
+    async def get_upcoming_meetings_async(self, db: AsyncSession, days: int = REMINDER_DAYS_THRESHOLD) -> list:
+        """Same as get_upcoming_meetings, for the async routes"""
+        meetings = (await db.execute(self.upcoming_meetings_query(days))).scalars()
+        return [self.meeting_to_dict(meeting) for meeting in meetings]
+
+    def enqueue_reminder(
+        self,
+        db: Session,
+        meetings: list,
+        recipients=REMINDER_RECIPIENTS,
+        dedup_key_format: str = "reminder:{email}:{date}",
+        days: int = REMINDER_DAYS_THRESHOLD
+    ) -> int:
+        """
+        Queue the reminder digest for each recipient in the caller's transaction
+
+        Args:
+            recipients: (name, email) pairs
+            dedup_key_format: Outbox dedup key; the default allows one digest
+                per recipient per day
+            days: Size of the reminder window the meetings were selected with
+
+        Returns:
+            Number of emails queued (duplicates are skipped)
+        """
+        subject, html_content, text_content = self.email_service.build_meeting_reminder_email(
+            meetings, RECIPIENT_NAME_TAG, days
+        )
+        today = date.today().isoformat()
+        queued = 0
+        for name, email in recipients:
+            queued += email_outbox.enqueue(
+                db,
+                to_email=email,
+                to_name=name,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                substitutions={RECIPIENT_NAME_TAG: name or "there"},
+                dedup_key=dedup_key_format.format(email=email, date=today)
+            )
+        return queued
+
+    def deliver_outbox(self):
+        """Hand the queued emails to the outbox worker, or send them now when there is none"""
+        if self.outbox_worker is not None:
+            self.outbox_worker.wake()
+        else:
+            asyncio.run(email_outbox.OutboxWorker().drain())
 
     def send_daily_reminder(self):
         """Send daily meeting reminder email"""
@@ -134,22 +166,21 @@ class MeetingReminderScheduler:
 
             print(f"SUCCESS: Found {len(upcoming_meetings)} upcoming meeting(s)")
 
-            # Send reminder email
-            success = self.email_service.send_meeting_reminder_email(
-                to_email=DEFAULT_RECIPIENT_EMAIL,
-                meetings=upcoming_meetings,
-                recipient_name=DEFAULT_RECIPIENT_NAME
-            )
+            # Queue the digests in the same transaction as the read
+            queued = self.enqueue_reminder(db, upcoming_meetings)
+            db.commit()
 
-            if success:
-                print(f"SUCCESS: Reminder email sent successfully to {DEFAULT_RECIPIENT_EMAIL}")
+            if queued:
+                print(f"SUCCESS: Reminder email queued for {queued} recipient(s)")
 
                 # Log the meetings included
                 print("\nMeetings included in reminder:")
                 for meeting in upcoming_meetings:
                     print(f"  - {meeting['client']} - {meeting['next_meeting']} ({meeting['days_left']} days)")
+
+                self.deliver_outbox()
             else:
-                print("ERROR: Failed to send reminder email")
+                print("INFO: Today's reminder was already queued")
 
         except Exception as e:
             print(f"ERROR: Error sending daily reminder: {str(e)}")
@@ -168,17 +199,19 @@ class MeetingReminderScheduler:
         print(f"Recipient: {DEFAULT_RECIPIENT_EMAIL}")
         print("=" * 60 + "\n")
 
-        # Schedule daily reminder at specified time IST
-        schedule.every().day.at(REMINDER_TIME_IST).do(self.send_daily_reminder)
+        # Same event-driven timer and outbox worker as the web app
+        async def run():
+            from reminder_timer import ReminderTimer
 
-        print(f"SUCCESS: Scheduled daily reminder at {REMINDER_TIME_IST} IST")
-        print("Press Ctrl+C to stop the scheduler\n")
+            outbox_worker = email_outbox.OutboxWorker()
+            outbox_worker.start()
+            if not ReminderTimer(outbox_worker=outbox_worker).start():
+                return
+            print("Press Ctrl+C to stop the scheduler\n")
+            await asyncio.Event().wait()
 
-        # Run the scheduler
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            asyncio.run(run())
         except KeyboardInterrupt:
             print("\n\nScheduler stopped by user")
 
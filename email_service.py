@@ -4,26 +4,38 @@ Standalone module for sending emails using SendGrid API
 """
 
 import os
+import time
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from email_templates import render_meeting_reminder
+import metrics
+
+SENDGRID_API_HOST = "https://api.sendgrid.com"
+
+# SendGrid accepts at most this many personalizations per request
+MAX_PERSONALIZATIONS = 1000
 
 
 class EmailService:
     """Email service using SendGrid"""
 
-    def __init__(self, api_key: str, from_email: str):
+    def __init__(self, api_key: str, from_email: str, from_name: Optional[str] = None,
+                 host: str = SENDGRID_API_HOST):
         """
         Initialize the email service
 
         Args:
             api_key: SendGrid API key
             from_email: Sender email address (must be verified in SendGrid)
+            from_name: Optional sender display name
+            host: SendGrid API base URL (a local stub server in tests)
         """
         self.api_key = api_key
         self.from_email = from_email
-        self.client = SendGridAPIClient(api_key)
+        self.from_name = from_name
+        self.client = SendGridAPIClient(api_key, host=host)
 
     def send_simple_email(
         self,
@@ -44,6 +56,8 @@ class EmailService:
         Returns:
             bool: True if email sent successfully, False otherwise
         """
+        start = time.perf_counter()
+        outcome = "failed"
         try:
             message = Mail(
                 from_email=self.from_email,
@@ -56,6 +70,7 @@ class EmailService:
             response = self.client.send(message)
 
             if response.status_code in [200, 201, 202]:
+                outcome = "sent"
                 print(f"SUCCESS: Email sent successfully to {to_email}")
                 print(f"  Status Code: {response.status_code}")
                 return True
@@ -66,6 +81,84 @@ class EmailService:
         except Exception as e:
             print(f"ERROR: Error sending email: {str(e)}")
             return False
+        finally:
+            metrics.EMAIL_SEND_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+            metrics.EMAIL_SENDS.inc(outcome=outcome)
+
+    def send_batch(
+        self,
+        subject: str,
+        html_content: Optional[str],
+        text_content: Optional[str],
+        recipients: List[Dict]
+    ) -> int:
+        """
+        Send one message to several recipients in a single API request
+
+        Args:
+            subject: Email subject
+            html_content: HTML body (optional if text_content is given)
+            text_content: Plain-text body (optional if html_content is given)
+            recipients: Up to MAX_PERSONALIZATIONS dictionaries with "email",
+                optional "name" and optional "substitutions" (placeholder -> value)
+
+        Returns:
+            int: Response status code
+
+        Raises:
+            python_http_client.exceptions.HTTPError on an error response
+        """
+        sender = {"email": self.from_email}
+        if self.from_name:
+            sender["name"] = self.from_name
+
+        # SendGrid wants the plain-text part first
+        content = []
+        if text_content:
+            content.append({"type": "text/plain", "value": text_content})
+        if html_content:
+            content.append({"type": "text/html", "value": html_content})
+
+        personalizations = []
+        for recipient in recipients:
+            to = {"email": recipient["email"]}
+            if recipient.get("name"):
+                to["name"] = recipient["name"]
+            personalization = {"to": [to]}
+            if recipient.get("substitutions"):
+                personalization["substitutions"] = recipient["substitutions"]
+            personalizations.append(personalization)
+
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            response = self.client.send({
+                "from": sender,
+                "subject": subject,
+                "content": content,
+                "personalizations": personalizations
+            })
+            outcome = "sent"
+            return response.status_code
+        finally:
+            metrics.EMAIL_SEND_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+            metrics.EMAIL_SENDS.inc(outcome=outcome)
+
+    def build_meeting_reminder_email(
+        self,
+        meetings: List[Dict],
+        recipient_name: str = "User",
+        days: int = 7
+    ) -> Tuple[str, str, str]:
+        """
+        Build the meeting reminder email from the templates in templates/email
+
+        Returns:
+            (subject, html_content, text_content)
+        """
+        subject = f"Meeting Reminders - {datetime.now().strftime('%B %d, %Y')}"
+        html_content, text_content = render_meeting_reminder(meetings, recipient_name, days)
+        return subject, html_content, text_content
 
     def send_meeting_reminder_email(
         self,
@@ -84,220 +177,15 @@ class EmailService:
         Returns:
             bool: True if email sent successfully
         """
-        subject = f"Meeting Reminders - {datetime.now().strftime('%B %d, %Y')}"
+        subject, html_content, text_content = self.build_meeting_reminder_email(meetings, recipient_name)
 
-        # Generate HTML email content
-        html_content = self._generate_meeting_reminder_html(meetings, recipient_name)
-
-        return self.send_simple_email(
-            to_email=to_email,
-            subject=subject,
-            content=html_content,
-            content_type="text/html"
-        )
-
-    def _generate_meeting_reminder_html(
-        self,
-        meetings: List[Dict],
-        recipient_name: str
-    ) -> str:
-        """Generate HTML content for meeting reminder email"""
-
-        # Group meetings by client
-        clients = {}
-        for meeting in meetings:
-            client = meeting.get('client', 'Unknown')
-            if client not in clients:
-                clients[client] = []
-            clients[client].append(meeting)
-
-        # Build HTML
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    border-radius: 10px 10px 0 0;
-                    text-align: center;
-                }}
-                .header h1 {{
-                    margin: 0;
-                    font-size: 24px;
-                }}
-                .content {{
-                    background: #ffffff;
-                    padding: 30px;
-                    border: 1px solid #e5e7eb;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .greeting {{
-                    font-size: 16px;
-                    margin-bottom: 20px;
-                }}
-                .meeting-group {{
-                    margin-bottom: 25px;
-                    padding: 20px;
-                    background: #f9fafb;
-                    border-left: 4px solid #667eea;
-                    border-radius: 5px;
-                }}
-                .client-name {{
-                    font-size: 18px;
-                    font-weight: bold;
-                    color: #667eea;
-                    margin-bottom: 15px;
-                }}
-                .meeting-item {{
-                    margin-bottom: 15px;
-                    padding: 15px;
-                    background: white;
-                    border-radius: 5px;
-                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                }}
-                .meeting-date {{
-                    font-weight: bold;
-                    color: #059669;
-                    font-size: 14px;
-                    margin-bottom: 8px;
-                }}
-                .meeting-date.urgent {{
-                    color: #dc2626;
-                }}
-                .meeting-date.soon {{
-                    color: #f59e0b;
-                }}
-                .meeting-detail {{
-                    margin: 5px 0;
-                    font-size: 14px;
-                }}
-                .label {{
-                    font-weight: 600;
-                    color: #6b7280;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 1px solid #e5e7eb;
-                    text-align: center;
-                    color: #6b7280;
-                    font-size: 12px;
-                }}
-                .days-badge {{
-                    display: inline-block;
-                    padding: 4px 12px;
-                    border-radius: 12px;
-                    font-size: 12px;
-                    font-weight: 600;
-                    margin-left: 8px;
-                }}
-                .days-badge.today {{
-                    background: #fee2e2;
-                    color: #dc2626;
-                }}
-                .days-badge.soon {{
-                    background: #fef3c7;
-                    color: #f59e0b;
-                }}
-                .days-badge.upcoming {{
-                    background: #d1fae5;
-                    color: #059669;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>📅 Upcoming Meeting Reminders</h1>
-            </div>
-            <div class="content">
-                <div class="greeting">
-                    Hello {recipient_name},
-                </div>
-                <p>You have <strong>{len(meetings)}</strong> meeting(s) scheduled in the next 7 days:</p>
-        """
-
-        # Add meetings grouped by client
-        for client, client_meetings in clients.items():
-            html += f"""
-                <div class="meeting-group">
-                    <div class="client-name">🏢 {client}</div>
-            """
-
-            for meeting in client_meetings:
-                next_meeting = meeting.get('next_meeting', '')
-                days_left = meeting.get('days_left', None)
-
-                # Determine urgency class
-                urgency_class = "upcoming"
-                badge_text = f"{days_left} days"
-                if days_left == 0:
-                    urgency_class = "today"
-                    badge_text = "Today"
-                elif days_left == 1:
-                    urgency_class = "soon"
-                    badge_text = "Tomorrow"
-                elif days_left <= 3:
-                    urgency_class = "soon"
-
-                html += f"""
-                    <div class="meeting-item">
-                        <div class="meeting-date {urgency_class}">
-                            📆 {next_meeting}
-                            <span class="days-badge {urgency_class}">{badge_text}</span>
-                        </div>
-                """
-
-                if meeting.get('people_connected'):
-                    html += f"""
-                        <div class="meeting-detail">
-                            <span class="label">👥 People:</span> {meeting['people_connected']}
-                        </div>
-                    """
-
-                if meeting.get('actions'):
-                    html += f"""
-                        <div class="meeting-detail">
-                            <span class="label">📋 Actions:</span> {meeting['actions']}
-                        </div>
-                    """
-
-                if meeting.get('address'):
-                    html += f"""
-                        <div class="meeting-detail">
-                            <span class="label">📍 Address:</span> {meeting['address']}
-                        </div>
-                    """
-
-                html += """
-                    </div>
-                """
-
-            html += """
-                </div>
-            """
-
-        html += f"""
-                <div class="footer">
-                    <p>This is an automated reminder from your Meeting Management Dashboard</p>
-                    <p>Sent on {datetime.now().strftime('%B %d, %Y at %I:%M %p IST')}</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        return html
+        try:
+            self.send_batch(subject, html_content, text_content, [{"email": to_email, "name": recipient_name}])
+            print(f"SUCCESS: Email sent successfully to {to_email}")
+            return True
+        except Exception as e:
+            print(f"ERROR: Error sending email: {str(e)}")
+            return False
 
 
 # Test function
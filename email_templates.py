@@ -0,0 +1,139 @@
+"""
+Email Templates
+Jinja2 templates for the reminder digest (templates/email), compiled once at
+import with HTML autoescaping, plus a cache of the rendered per-client sections
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "email")
+
+# Rendered client sections kept in memory
+FRAGMENT_CACHE_ENTRIES = 512
+
+
+def nl2br(value) -> Markup:
+    """Escape text and keep its line breaks"""
+    return Markup("<br>\n").join(escape(line) for line in str(value).splitlines())
+
+
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+environment.filters["nl2br"] = nl2br
+
+# Compiled once; rendering only runs the compiled code
+TEMPLATES = {
+    "html": (environment.get_template("meeting_reminder.html"), environment.get_template("client_meetings.html")),
+    "text": (environment.get_template("meeting_reminder.txt"), environment.get_template("client_meetings.txt"))
+}
+
+
+def urgency(days_left: Optional[int]) -> Tuple[str, str]:
+    """CSS class and badge text for a meeting's countdown"""
+    if days_left == 0:
+        return "today", "Today"
+    if days_left == 1:
+        return "soon", "Tomorrow"
+    if days_left is not None and days_left <= 3:
+        return "soon", f"{days_left} days"
+    return "upcoming", f"{days_left} days"
+
+
+class FragmentCache:
+    """Rendered client sections keyed by their meetings' versions, evicted least-recently-used first"""
+
+    def __init__(self, max_entries: int = FRAGMENT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key) -> Optional[str]:
+        with self.lock:
+            fragment = self.entries.get(key)
+            if fragment is not None:
+                self.entries.move_to_end(key)
+            return fragment
+
+    def put(self, key, fragment: str):
+        with self.lock:
+            self.entries[key] = fragment
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+fragment_cache = FragmentCache()
+
+
+def _fragment_key(kind: str, client: str, meetings: List[Dict]):
+    # updated_at covers edits, days_left changes every day; without
+    # updated_at (e.g. sample data) the section isn't cached
+    if any(meeting.get("updated_at") is None for meeting in meetings):
+        return None
+    return (kind, client, tuple(
+        (meeting.get("id"), meeting["updated_at"], meeting.get("days_left")) for meeting in meetings
+    ))
+
+
+def render_client_fragment(kind: str, client: str, meetings: List[Dict]) -> str:
+    """Render (or reuse) one client's section of the digest"""
+    key = _fragment_key(kind, client, meetings)
+    fragment = fragment_cache.get(key) if key else None
+    if fragment is None:
+        rows = []
+        for meeting in meetings:
+            css_class, badge = urgency(meeting.get("days_left"))
+            rows.append({**meeting, "urgency": css_class, "badge": badge})
+        fragment = TEMPLATES[kind][1].render(client=client, meetings=rows)
+        if key:
+            fragment_cache.put(key, fragment)
+    return fragment
+
+
+def render_meeting_reminder(
+    meetings: List[Dict],
+    recipient_name: str,
+    days: int = 7,
+    sent_at: Optional[datetime] = None
+) -> Tuple[str, str]:
+    """
+    Render the reminder digest
+
+    Args:
+        meetings: Meeting dictionaries (see MeetingReminderScheduler.meeting_to_dict)
+        recipient_name: Name in the greeting
+        days: Size of the reminder window, for the intro line
+        sent_at: Time shown in the footer (defaults to now)
+
+    Returns:
+        (html, plain text)
+    """
+    # Group meetings by client, keeping their order
+    clients = {}
+    for meeting in meetings:
+        clients.setdefault(meeting.get('client') or 'Unknown', []).append(meeting)
+
+    rendered = []
+    for kind in ("html", "text"):
+        fragments = [render_client_fragment(kind, client, client_meetings) for client, client_meetings in clients.items()]
+        # Fragments are already escaped HTML
+        if kind == "html":
+            fragments = [Markup(fragment) for fragment in fragments]
+        rendered.append(TEMPLATES[kind][0].render(
+            recipient_name=recipient_name,
+            meeting_count=len(meetings),
+            days=days,
+            client_fragments=fragments,
+            sent_at=sent_at or datetime.now()
+        ))
+    return rendered[0], rendered[1]
@@ -0,0 +1,127 @@
+"""
+Excel Import Engine
+Shared by the /api/import-excel endpoint and the first-run database initialization
+"""
+
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from database import Meeting
+from meeting_dates import parse_next_meeting_dates
+import sequences
+import dashboard_stats
+import meeting_revisions
+import client_directory
+
+# Excel column -> Meeting column for the free-text fields
+TEXT_COLUMNS = {
+    'People Connected': 'people_connected',
+    'Actions': 'actions',
+    'Next Meeting': 'next_meeting',
+    'Address': 'address',
+    'Actions Taken': 'actions_taken'
+}
+
+INSERT_CHUNK_SIZE = 1000
+
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Stringify a column, keeping empty cells as None"""
+    if name not in df:
+        return pd.Series(None, index=df.index, dtype=object)
+    column = df[name]
+    return column.astype(str).where(column.notna(), None)
+
+
+def prepare_meetings(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean the Excel rows into Meeting columns; rows without a client are dropped"""
+    if 'Client' not in df:
+        return pd.DataFrame(columns=['client', *TEXT_COLUMNS.values(), 'global_order'])
+
+    client = df['Client'].astype(str).str.strip()
+    rows = pd.DataFrame({'client': client})
+    for excel_name, column in TEXT_COLUMNS.items():
+        rows[column] = _text_column(df, excel_name)
+
+    # Track chronological order (row index + 1 to start from 1)
+    rows['global_order'] = pd.RangeIndex(1, len(df) + 1)
+
+    return rows[(client != '') & (client != 'nan')]
+
+
+def import_meetings(db: Session, df: pd.DataFrame, session_id: Optional[str] = None) -> int:
+    """
+    Bulk-insert the meetings of an Excel sheet
+
+    Each client's imported updates are ranked after its existing ones.
+    The caller commits.
+
+    Args:
+        session_id: Browser session whose undo stack gets the import
+
+    Returns:
+        Number of meetings imported
+    """
+    rows = prepare_meetings(df)
+    if rows.empty:
+        return 0
+
+    # Reserve each client's rank keys after its existing ones, in sheet order
+    by_client = rows.groupby('client', sort=False)
+    first_seen = by_client['global_order'].min()
+    reserved = sequences.next_ranks_for_clients(db, {
+        client: (int(first_seen[client]), int(size)) for client, size in by_client.size().items()
+    })
+    client_ids = {client: client_id for client, (client_id, _, _) in reserved.items()}
+    new_ranks = {client: iter(ranks) for client, (_, _, ranks) in reserved.items()}
+    rows = rows.assign(
+        client_id=rows['client'].map(client_ids),
+        client_first_appearance=by_client['global_order'].transform('min'),
+        client_rank=[next(new_ranks[client]) for client in rows['client']],
+        next_meeting_at=parse_next_meeting_dates(rows['next_meeting'])
+    )
+
+    # Sheet rows keep their own chronological order; later creates come after them
+    sequences.reserve_global_order(db, int(rows['global_order'].max()))
+
+    # Imported rows are ranked after the existing ones, so only they change (see meeting_changes.py)
+    version = sequences.bump_data_version(db)
+
+    now = datetime.utcnow()
+    records = rows.astype(object).where(rows.notna(), None).to_dict('records')
+    for record in records:
+        record['created_at'] = now
+        record['updated_at'] = now
+        record['row_version'] = version
+
+    # Plain executemany per chunk: with RETURNING, SQLAlchemy would send one INSERT per row on SQLite.
+    # The client's name stays in the records for the snapshots and revisions; rows store client_id
+    statement = insert(Meeting.__table__)
+    rows = [{column: value for column, value in record.items() if column != 'client'} for record in records]
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(statement, rows[start:start + INSERT_CHUNK_SIZE])
+
+    # Only this import's rows carry its version; (client_id, client_rank) is unique
+    ids = {
+        (row.client_id, row.client_rank): row.id
+        for row in db.query(Meeting.id, Meeting.client_id, Meeting.client_rank).filter(Meeting.row_version == version)
+    }
+    changes = []
+    revisions = []
+    for record in records:
+        meeting_id = ids[record['client_id'], record['client_rank']]
+        changes.append((None, dashboard_stats.MeetingSnapshot(
+            meeting_id, record['client'], record['next_meeting_at'],
+            record['actions'], record['actions_taken'], now
+        )))
+        revisions.append(meeting_revisions.Revision("import", meeting_id, None, {
+            column: record.get(column) for column in meeting_revisions.STATE_COLUMNS
+        }))
+
+    dashboard_stats.apply_meeting_changes(db, changes)
+    client_directory.update_addresses(db, revisions)
+    client_directory.refresh(db, client_ids)
+    meeting_revisions.record(db, version, revisions, session_id)
+    return len(records)
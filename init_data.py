@@ -5,6 +5,7 @@ This script runs automatically when the app starts for the first time
 import os
 from sqlalchemy.orm import Session
 from database import SessionLocal, Meeting, engine, Base
+from excel_import import import_meetings
 import pandas as pd
 
 def init_database():
@@ -32,47 +33,7 @@ def init_database():
         df = pd.read_excel(excel_file)
         print(f"Found {len(df)} rows in Excel file")
 
-        imported = 0
-        client_first_seen = {}
-        client_order_counter = {}
-
-        for index, row in df.iterrows():
-            # Get client name
-            client_name = str(row.get('Client', '')).strip()
-
-            if not client_name or client_name == 'nan':
-                continue
-
-            # Track chronological order
-            global_order = index + 1
-
-            # Track when this client first appeared
-            if client_name not in client_first_seen:
-                client_first_seen[client_name] = global_order
-
-            # Track client order
-            if client_name not in client_order_counter:
-                client_order_counter[client_name] = 0
-
-            client_order_counter[client_name] += 1
-            new_order = client_order_counter[client_name]
-
-            # Create meeting entry
-            meeting = Meeting(
-                client=client_name,
-                people_connected=str(row.get('People Connected', '')) if pd.notna(row.get('People Connected')) else None,
-                actions=str(row.get('Actions', '')) if pd.notna(row.get('Actions')) else None,
-                next_meeting=str(row.get('Next Meeting', '')) if pd.notna(row.get('Next Meeting')) else None,
-                address=str(row.get('Address', '')) if pd.notna(row.get('Address')) else None,
-                actions_taken=str(row.get('Actions Taken', '')) if pd.notna(row.get('Actions Taken')) else None,
-                client_order=new_order,
-                global_order=global_order,
-                client_first_appearance=client_first_seen[client_name]
-            )
-
-            db.add(meeting)
-            imported += 1
-
+        imported = import_meetings(db, df)
         db.commit()
         print(f"✅ Successfully initialized database with {imported} meetings")
 
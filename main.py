@@ -1,31 +1,71 @@
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile
+from fastapi import FastAPI, BackgroundTasks, Depends, Header, HTTPException, File, UploadFile, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy import bindparam, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional, List
-from database import Meeting, get_db, engine, Base
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Literal, Optional, List
+from database import Meeting, SessionLocal, get_db, get_read_db, get_async_db, get_async_read_db, engine, async_engine, async_read_engine, Base, has_open_actions, update_numbers, load_update_numbers, Client, client_named
+import dashboard_stats
+import meeting_search
+import meeting_revisions
+import meeting_changes
+import client_directory
+from excel_import import import_meetings
+from rank_keys import MAX_RANK_LENGTH, rank_between, spaced_ranks
+import sequences
+from response_cache import ResponseCache
+from change_feed import ChangeFeed
+import json_responses
+import metrics
 import pandas as pd
-from datetime import datetime, date
-from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-
-app = FastAPI(title="Meeting Dashboard")
-
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database with data from Excel on first run"""
+import base64
+import json
+import os
+import tempfile
+import time
+import uuid
+import xlsxwriter
+from datetime import datetime, date, timedelta
+from pdf_reports import ReportCache, ReportJobs, build_report, report_cache_key
+from email_outbox import OutboxWorker
+from reminder_timer import ReminderTimer
+from contextlib import asynccontextmanager
+
+# Background email delivery and the daily reminder digest, run in the app's event loop
+outbox_worker = OutboxWorker()
+reminder_timer = ReminderTimer(outbox_worker=outbox_worker)
+
+# Live meeting changes for open browser tabs (GET /api/events)
+change_feed = ChangeFeed()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database, then run the email tasks for the life of the app"""
     try:
+        # Initialize database with data from Excel on first run
         from init_data import init_database
         init_database()
     except Exception as e:
         print(f"Startup initialization error: {e}")
 
+    change_feed.start()
+    outbox_worker.start()
+    reminder_timer.start()
+    yield
+    await reminder_timer.stop()
+    await outbox_worker.stop()
+    report_jobs.shutdown()
+    # aiosqlite connections each hold a non-daemon thread that would keep the process alive
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+app = FastAPI(title="Meeting Dashboard", lifespan=lifespan)
+
+# Per-route latency, in-flight requests and SQL usage (see GET /metrics)
+app.add_middleware(metrics.MetricsMiddleware, routes_app=app)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -51,12 +91,26 @@ class MeetingResponse(MeetingBase):
     global_order: int
     client_first_appearance: int
     meeting_date: Optional[date] = None
+    next_meeting_at: Optional[date] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
 
+meeting_list_adapter = TypeAdapter(List[MeetingResponse])
+
+# The listing selects MeetingResponse's fields as plain rows and serializes
+# them with orjson, skipping ORM objects and model validation
+MEETING_RESPONSE_FIELDS = list(MeetingResponse.model_fields)
+MEETING_RESPONSE_COLUMNS = [getattr(Meeting, field) for field in MEETING_RESPONSE_FIELDS]
+# client_order is numbered per page (see meetings_page_query), not per row
+MEETING_PAGE_COLUMNS = [column for field, column in zip(MEETING_RESPONSE_FIELDS, MEETING_RESPONSE_COLUMNS)
+                        if field != "client_order"]
+
+# Serialized read responses, keyed by data version (see response_cache.py)
+response_cache = ResponseCache()
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
@@ -70,100 +124,278 @@ async def favicon():
     from fastapi.responses import Response
     return Response(status_code=204)
 
+# Pagination settings for the meetings listing
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(meeting: Meeting) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    key = f"{meeting.client_first_appearance}:{meeting.global_order}:{meeting.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(cursor: str):
+    """Decode a cursor back into its (client_first_appearance, global_order, id) key"""
+    try:
+        key = base64.urlsafe_b64decode(cursor.encode()).decode()
+        first_appearance, global_order, meeting_id = (int(part) for part in key.split(":"))
+        return first_appearance, global_order, meeting_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/api/meetings", response_model=List[MeetingResponse])
 def get_meetings(
+    request: Request,
     client: Optional[str] = None,
-    db: Session = Depends(get_db)
+    client_prefix: Optional[str] = None,
+    meeting_date_from: Optional[date] = None,
+    meeting_date_to: Optional[date] = None,
+    open_actions: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(Meeting)
+    """
+    Get one page of meetings.
+    The cursor for the next page is returned in the X-Next-Cursor header
+    and is absent on the last page.
+    """
+    # Read the version before the rows, so a concurrent write can only make the
+    # cached page newer than its version, never older
+    version = sequences.data_version(db)
+    return response_cache.respond(request, version, lambda: query_meetings_page(
+        db, client, client_prefix, meeting_date_from, meeting_date_to, open_actions, cursor, limit
+    ))
+
+def meetings_page_query(db: Session, client, client_prefix, meeting_date_from, meeting_date_to,
+                        open_actions, cursor, limit):
+    """
+    The statement behind one page of meetings: up to limit + 1 meetings after
+    the cursor with their update numbers, unordered (the page is sorted in
+    query_meetings_page)
+    """
+    query = db.query(*MEETING_PAGE_COLUMNS, Meeting.client_id)
     if client:
-        query = query.filter(Meeting.client.ilike(f"%{client}%"))
+        query = query.filter(Meeting.client_id == client_named(client))
+    if client_prefix:
+        # Range scan instead of LIKE so the client name index can be used
+        query = query.filter(Meeting.client_id.in_(select(Client.id).where(
+            Client.name >= client_prefix,
+            Client.name < client_prefix + '\U0010ffff'
+        )))
+    if meeting_date_from:
+        query = query.filter(Meeting.meeting_date >= meeting_date_from)
+    if meeting_date_to:
+        query = query.filter(Meeting.meeting_date <= meeting_date_to)
+    if open_actions is not None:
+        query = query.filter(has_open_actions() if open_actions else ~has_open_actions())
+
+    sort_key = (Meeting.client_first_appearance, Meeting.global_order, Meeting.id)
+    if cursor:
+        query = query.filter(tuple_(*sort_key) > tuple_(*decode_cursor(cursor)))
 
     # Order by client's first appearance (chronological), then by global_order within client
-    meetings = query.order_by(Meeting.client_first_appearance, Meeting.global_order).all()
-    return meetings
+    page = query.order_by(*sort_key).limit(limit + 1).cte("page")
+
+    # Number the updates of the page's clients only, with one window pass
+    numbers = update_numbers(select(page.c.client_id))
+    return db.query(*[
+        numbers.c.client_order if field == "client_order" else page.c[field]
+        for field in MEETING_RESPONSE_FIELDS
+    ]).join(numbers, numbers.c.id == page.c.id)
+
+def query_meetings_page(db: Session, client, client_prefix, meeting_date_from, meeting_date_to,
+                        open_actions, cursor, limit):
+    """One serialized page of meetings and its X-Next-Cursor header"""
+    # Sorted here: the join comes out in window order, and an ORDER BY on it
+    # would sort the page in a temporary B-tree anyway
+    meetings = sorted(meetings_page_query(
+        db, client, client_prefix, meeting_date_from, meeting_date_to, open_actions, cursor, limit
+    ).all(), key=lambda row: (row.client_first_appearance, row.global_order, row.id))
+
+    headers = {}
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(meetings[-1])
+    return json_responses.rows_to_json(MEETING_RESPONSE_FIELDS, meetings), headers
+
+@app.get("/api/meetings/changes")
+def get_meeting_changes(since: int = Query(..., ge=0), db: Session = Depends(get_read_db)):
+    """
+    Meetings changed and deleted after a data version (X-Data-Version of the
+    listing, or `version` of the previous call). `reset` means too much
+    changed: reload the full listing instead.
+    """
+    changes = meeting_changes.changes_since(db, since)
+    if changes is None:
+        return {"reset": True, "version": sequences.data_version(db)}
+
+    version, meetings, deleted_ids = changes
+    return {
+        "reset": False,
+        "version": version,
+        "upserts": meeting_list_adapter.validate_python(meetings, from_attributes=True),
+        "deletes": deleted_ids
+    }
 
 @app.get("/api/meetings/{meeting_id}", response_model=MeetingResponse)
-def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
+def get_meeting(meeting_id: int, db: Session = Depends(get_read_db)):
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
-@app.post("/api/meetings", response_model=MeetingResponse)
-def create_meeting(meeting: MeetingCreate, db: Session = Depends(get_db)):
-    # Get the highest client_order for this client
-    max_order = db.query(Meeting).filter(
-        Meeting.client == meeting.client
-    ).order_by(Meeting.client_order.desc()).first()
-
-    new_order = 1 if not max_order else max_order.client_order + 1
-
-    # Get max global order
-    max_global = db.query(Meeting).order_by(Meeting.global_order.desc()).first()
-    new_global_order = 1 if not max_global else max_global.global_order + 1
-
-    # Check if this client already exists
-    existing_client = db.query(Meeting).filter(Meeting.client == meeting.client).first()
-    if existing_client:
-        client_first_appearance = existing_client.client_first_appearance
-    else:
-        # New client, use the current global order as first appearance
-        client_first_appearance = new_global_order
+def history_session(x_session_id: Optional[str] = Header(None, max_length=64)) -> Optional[str]:
+    """Browser session (X-Session-Id header) whose undo stack gets the request's write"""
+    return x_session_id
+
+def finish_write(db: Session, changes, revisions, session_id: Optional[str], undoable: bool = True):
+    """
+    Commit a write to the meetings: update the address book and refresh the
+    affected clients, bump the data version, stamp the changed rows and record
+    the revisions, then update the reminder timer and the change feed
+    """
+    client_directory.update_addresses(db, revisions)
+    client_directory.refresh(db, [
+        snapshot.client for change in changes for snapshot in change if snapshot is not None
+    ])
+    version = sequences.bump_data_version(db)
+    meeting_changes.mark_changed(db, version, revisions)
+    meeting_revisions.record(db, version, revisions, session_id, undoable)
+    db.commit()
+    reminder_timer.meetings_changed(changes)
+    publish_changes(db, revisions, version)
+
+def publish_changes(db: Session, revisions, version: int):
+    """
+    Broadcast a committed write: the final state of each meeting it touched,
+    the update order of the affected clients and the new KPIs
+    """
+    if not change_feed.has_subscribers():
+        return
+
+    final_states = {revision.meeting_id: revision.after for revision in revisions}
+    clients = {
+        state["client_id"]
+        for revision in revisions
+        for state in (revision.before, revision.after) if state is not None
+    }
+    upserted_ids = [meeting_id for meeting_id, state in final_states.items() if state is not None]
+    meetings = db.query(Meeting).filter(Meeting.id.in_(upserted_ids)).all() if upserted_ids else []
+    load_update_numbers(db, meetings)
+
+    # "Update #" of the other meetings shifts when one is added, removed or moved
+    orders = {}
+    if clients:
+        for client, meeting_id in db.query(Client.name, Meeting.id).join(
+            Client, Client.id == Meeting.client_id
+        ).filter(Meeting.client_id.in_(clients)).order_by(Meeting.client_id, Meeting.client_rank):
+            orders.setdefault(client, []).append(meeting_id)
+
+    change_feed.publish("change", {
+        "upserts": [MeetingResponse.model_validate(meeting).model_dump(mode="json") for meeting in meetings],
+        "deletes": [meeting_id for meeting_id, state in final_states.items() if state is None],
+        "orders": orders,
+        "stats": json.loads(dashboard_stats_body(db)[0])
+    }, version)
+
+def add_meeting(db: Session, meeting: MeetingBase, global_order: int):
+    """
+    Insert a meeting after its client's other updates (flushed, not committed)
+
+    Returns:
+        (the new meeting, its (before, after) stats change, its revision)
+    """
+    # Allocate the client's next rank atomically in this transaction
+    client_id, client_first_appearance, client_rank = sequences.next_client_rank(
+        db, meeting.client, first_appearance=global_order
+    )
 
     db_meeting = Meeting(
         **meeting.model_dump(),
-        client_order=new_order,
-        global_order=new_global_order,
+        client_id=client_id,
+        client_rank=client_rank,
+        global_order=global_order,
         client_first_appearance=client_first_appearance
     )
     db.add(db_meeting)
-    db.commit()
-    db.refresh(db_meeting)
-    return db_meeting
-
-@app.put("/api/meetings/{meeting_id}", response_model=MeetingResponse)
-def update_meeting(meeting_id: int, meeting: MeetingUpdate, db: Session = Depends(get_db)):
+    db.flush()
+    change = (None, dashboard_stats.snapshot(db_meeting))
+    dashboard_stats.apply_meeting_changes(db, [change])
+    revision = meeting_revisions.Revision("create", db_meeting.id, None, meeting_revisions.meeting_state(db_meeting))
+    return db_meeting, change, revision
+
+def change_meeting(db: Session, meeting_id: int, meeting: MeetingBase):
+    """
+    Overwrite a meeting's fields (flushed, not committed)
+
+    Returns:
+        (the meeting, its (before, after) stats change, its revision)
+    """
     db_meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not db_meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     old_client = db_meeting.client
+    before = dashboard_stats.snapshot(db_meeting)
+    before_state = meeting_revisions.meeting_state(db_meeting)
 
     for key, value in meeting.model_dump().items():
         setattr(db_meeting, key, value)
 
     # If client changed, recalculate order and first appearance
     if old_client != meeting.client:
-        max_order = db.query(Meeting).filter(
-            Meeting.client == meeting.client
-        ).order_by(Meeting.client_order.desc()).first()
-        db_meeting.client_order = 1 if not max_order else max_order.client_order + 1
-
-        # Check if this client already exists
-        existing_client = db.query(Meeting).filter(
-            Meeting.client == meeting.client,
-            Meeting.id != meeting_id
-        ).first()
-        if existing_client:
-            db_meeting.client_first_appearance = existing_client.client_first_appearance
-        else:
-            # New client, keep the current global order as first appearance
-            db_meeting.client_first_appearance = db_meeting.global_order
+        # A new client keeps the meeting's global order as its first appearance
+        db_meeting.client_id, db_meeting.client_first_appearance, db_meeting.client_rank = sequences.next_client_rank(
+            db, meeting.client, first_appearance=db_meeting.global_order
+        )
 
     db_meeting.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_meeting)
-    return db_meeting
-
-@app.delete("/api/meetings/{meeting_id}")
-def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
+    db.flush()
+    change = (before, dashboard_stats.snapshot(db_meeting))
+    dashboard_stats.apply_meeting_changes(db, [change])
+    revision = meeting_revisions.Revision("update", meeting_id, before_state, meeting_revisions.meeting_state(db_meeting))
+    return db_meeting, change, revision
+
+def remove_meeting(db: Session, meeting_id: int):
+    """
+    Delete a meeting (flushed, not committed)
+
+    Returns:
+        (its (before, after) stats change, its revision)
+    """
     db_meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not db_meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
+    before = dashboard_stats.snapshot(db_meeting)
+    revision = meeting_revisions.Revision("delete", meeting_id, meeting_revisions.meeting_state(db_meeting), None)
     db.delete(db_meeting)
-    db.commit()
+    db.flush()
+    change = (before, None)
+    dashboard_stats.apply_meeting_changes(db, [change])
+    return change, revision
+
+@app.post("/api/meetings", response_model=MeetingResponse)
+def create_meeting(meeting: MeetingCreate, session_id: Optional[str] = Depends(history_session),
+                   db: Session = Depends(get_db)):
+    db_meeting, change, revision = add_meeting(db, meeting, sequences.next_global_orders(db))
+    finish_write(db, [change], [revision], session_id)
+    db.refresh(db_meeting)
+    return db_meeting
+
+@app.put("/api/meetings/{meeting_id}", response_model=MeetingResponse)
+def update_meeting(meeting_id: int, meeting: MeetingUpdate, session_id: Optional[str] = Depends(history_session),
+                   db: Session = Depends(get_db)):
+    db_meeting, change, revision = change_meeting(db, meeting_id, meeting)
+    finish_write(db, [change], [revision], session_id)
+    db.refresh(db_meeting)
+    return db_meeting
+
+@app.delete("/api/meetings/{meeting_id}")
+def delete_meeting(meeting_id: int, session_id: Optional[str] = Depends(history_session),
+                   db: Session = Depends(get_db)):
+    change, revision = remove_meeting(db, meeting_id)
+    finish_write(db, [change], [revision], session_id)
     return {"message": "Meeting deleted successfully"}
 
 # Bulk delete endpoint
@@ -171,14 +403,22 @@ class BulkDeleteRequest(BaseModel):
     meeting_ids: List[int]
 
 @app.post("/api/meetings/bulk-delete")
-def bulk_delete_meetings(request: BulkDeleteRequest, db: Session = Depends(get_db)):
+def bulk_delete_meetings(request: BulkDeleteRequest, session_id: Optional[str] = Depends(history_session),
+                         db: Session = Depends(get_db)):
     try:
         if not request.meeting_ids or len(request.meeting_ids) == 0:
             raise HTTPException(status_code=400, detail="No meetings to delete")
 
-        # Delete all meetings with given IDs
+        # Keep the meetings for the stats and the revisions, then delete all meetings with given IDs
+        deleted = db.query(Meeting).filter(Meeting.id.in_(request.meeting_ids)).all()
         deleted_count = db.query(Meeting).filter(Meeting.id.in_(request.meeting_ids)).delete(synchronize_session=False)
-        db.commit()
+        changes = [(dashboard_stats.snapshot(row), None) for row in deleted]
+        revisions = [
+            meeting_revisions.Revision("delete", row.id, meeting_revisions.meeting_state(row), None)
+            for row in deleted
+        ]
+        dashboard_stats.apply_meeting_changes(db, changes)
+        finish_write(db, changes, revisions, session_id)
 
         return {
             "message": f"Successfully deleted {deleted_count} meeting(s)",
@@ -188,71 +428,128 @@ def bulk_delete_meetings(request: BulkDeleteRequest, db: Session = Depends(get_d
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Error deleting meetings: {str(e)}")
 
-@app.get("/api/clients")
-def get_clients(db: Session = Depends(get_db)):
-    clients = db.query(Meeting.client).distinct().all()
-    return [{"name": client[0]} for client in clients if client[0]]
-
-@app.get("/api/clients/{client_name}/addresses")
-def get_client_addresses(client_name: str, db: Session = Depends(get_db)):
-    """Get unique addresses for a specific client"""
-    addresses = db.query(Meeting.address).filter(
-        Meeting.client == client_name,
-        Meeting.address.isnot(None),
-        Meeting.address != '',
-        Meeting.address != '-'
-    ).distinct().all()
-    return [{"address": addr[0]} for addr in addresses if addr[0]]
+class ClientResponse(BaseModel):
+    id: int
+    name: str
+    first_appearance: int
+    meeting_count: int
+    last_meeting_date: Optional[date] = None
 
-@app.post("/api/import-excel")
-async def import_excel(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    class Config:
+        from_attributes = True
+
+client_list_adapter = TypeAdapter(List[ClientResponse])
+
+class ClientRename(BaseModel):
+    name: str = Field(..., min_length=1)
+
+@app.get("/api/clients", response_model=List[ClientResponse])
+def get_clients(request: Request, db: Session = Depends(get_read_db)):
+    """Every client with its meeting count and last meeting date, by name"""
+    def build():
+        clients = [client for client in client_directory.list_clients(db) if client.name]
+        return client_list_adapter.dump_json(client_list_adapter.validate_python(clients)), {}
+
+    return response_cache.respond(request, sequences.data_version(db), build)
+
+@app.put("/api/clients/{client_id}", response_model=ClientResponse)
+def rename_client(client_id: int, request: ClientRename, db: Session = Depends(get_db)):
+    """Rename a client; its meetings follow"""
+    name = request.name.strip()
+    if not name:
+        raise HTTPException(status_code=400, detail="Client name is required")
+
+    version = sequences.bump_data_version(db)
     try:
-        df = pd.read_excel(file.file)
+        client = client_directory.rename(db, client_id, name, version)
+    except client_directory.ClientNameTaken as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    if client is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Client not found")
 
-        imported = 0
-        client_first_seen = {}  # Track when each client first appears
-        client_order_counter = {}  # Track order count for each client during import
-
-        for index, row in df.iterrows():
-            # Get max order for this client
-            client_name = str(row.get('Client', '')).strip()
-            if not client_name or client_name == 'nan':
-                continue
-
-            # Track chronological order (row index + 1 to start from 1)
-            global_order = index + 1
-
-            # Track when this client first appeared in the Excel
-            if client_name not in client_first_seen:
-                client_first_seen[client_name] = global_order
-
-            # Track client order: check database for existing, then increment in memory
-            if client_name not in client_order_counter:
-                # First occurrence of this client in current import - check database
-                max_order = db.query(Meeting).filter(
-                    Meeting.client == client_name
-                ).order_by(Meeting.client_order.desc()).first()
-                client_order_counter[client_name] = 0 if not max_order else max_order.client_order
-
-            # Increment order for this client
-            client_order_counter[client_name] += 1
-            new_order = client_order_counter[client_name]
-
-            meeting = Meeting(
-                client=client_name,
-                people_connected=str(row.get('People Connected', '')) if pd.notna(row.get('People Connected')) else None,
-                actions=str(row.get('Actions', '')) if pd.notna(row.get('Actions')) else None,
-                next_meeting=str(row.get('Next Meeting', '')) if pd.notna(row.get('Next Meeting')) else None,
-                address=str(row.get('Address', '')) if pd.notna(row.get('Address')) else None,
-                actions_taken=str(row.get('Actions Taken', '')) if pd.notna(row.get('Actions Taken')) else None,
-                client_order=new_order,
-                global_order=global_order,
-                client_first_appearance=client_first_seen[client_name]
-            )
-            db.add(meeting)
-            imported += 1
+    db.commit()
+    # Possibly many meetings: open tabs reload instead
+    change_feed.publish("reset", {}, version)
+    return client
+
+class ClientAddressResponse(BaseModel):
+    address: str
+    usage_count: int
+    last_used_at: datetime
+
+    class Config:
+        from_attributes = True
 
+address_list_adapter = TypeAdapter(List[ClientAddressResponse])
+
+@app.get("/api/clients/{client_name}/addresses", response_model=List[ClientAddressResponse])
+def get_client_addresses(client_name: str, request: Request, db: Session = Depends(get_read_db)):
+    """A client's addresses, most used first and then most recently used"""
+    def build():
+        addresses = client_directory.addresses(db, client_name)
+        return address_list_adapter.dump_json(address_list_adapter.validate_python(addresses)), {}
+
+    return response_cache.respond(request, sequences.data_version(db), build)
+
+# Full-text search settings
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+@app.get("/api/search")
+def search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """Search the meeting notes, best matches first, with highlighted snippets"""
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Full-text search requires the SQLite database")
+
+    try:
+        total, results = meeting_search.search_meetings(db, q, limit, offset)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error searching: {str(e)}")
+
+    return {
+        "query": q,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "results": results
+    }
+
+@app.get("/api/events")
+async def stream_events(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Server-Sent Events feed of meeting changes. Each `change` event carries
+    the upserted meetings, deleted ids, the affected clients' update order and
+    the KPIs, with the data version as its id; `reset` means reload everything.
+    """
+    version = await db.run_sync(sequences.data_version)
+    await db.close()  # Don't hold a connection for the life of the stream
+    return StreamingResponse(
+        change_feed.stream(request, version, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/import-excel")
+def import_excel(file: UploadFile = File(...), session_id: Optional[str] = Depends(history_session),
+                 db: Session = Depends(get_db)):
+    """Import the meetings of an uploaded workbook (sync, so it runs in the thread pool)"""
+    try:
+        start = time.perf_counter()
+        df = pd.read_excel(file.file)
+        imported = import_meetings(db, df, session_id)
         db.commit()
+        metrics.IMPORT_DURATION.observe(time.perf_counter() - start)
+        metrics.IMPORT_ROWS.observe(imported)
+        reminder_timer.reload()
+        # Too many rows for one event: open tabs reload instead
+        change_feed.publish("reset", {}, sequences.data_version(db))
         return {"message": f"Successfully imported {imported} meetings"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error importing Excel: {str(e)}")
@@ -262,255 +559,446 @@ class ReorderRequest(BaseModel):
     dragged_id: int
     target_id: int
 
-@app.post("/api/meetings/reorder")
-def reorder_meetings(request: ReorderRequest, db: Session = Depends(get_db)):
+def rebalance_client_ranks(client_id: int):
+    """Rewrite a client's rank keys evenly spaced once drags have made them long"""
+    db = SessionLocal()
     try:
-        dragged = db.query(Meeting).filter(Meeting.id == request.dragged_id).first()
-        target = db.query(Meeting).filter(Meeting.id == request.target_id).first()
-
-        if not dragged or not target:
-            raise HTTPException(status_code=404, detail="Meeting not found")
+        client = db.get(Client, client_id)
+        ids = [row.id for row in db.query(Meeting.id).filter(
+            Meeting.client_id == client_id
+        ).order_by(Meeting.client_rank, Meeting.id)]
+        if client and ids:
+            statement = (
+                Meeting.__table__.update()
+                .where(Meeting.id == bindparam("meeting_id"))
+                # Keep updated_at as is; rebalancing doesn't change the order
+                .values(client_rank=bindparam("rank"), updated_at=Meeting.updated_at)
+            )
+            # Move to unique placeholder keys first so the unique (client, client_rank)
+            # index holds while the new keys are written
+            db.execute(statement, [{"meeting_id": meeting_id, "rank": f"~{meeting_id}"} for meeting_id in ids])
+            ranks = spaced_ranks(len(ids))
+            db.execute(statement, [
+                {"meeting_id": meeting_id, "rank": rank}
+                for meeting_id, rank in zip(ids, ranks)
+            ])
+            # Spaced keys span the whole key space; new updates must still come last
+            sequences.reserve_client_rank(db, client.name, 0, ranks[-1])
+            version = sequences.bump_data_version(db)
+            db.commit()
+            # The order is unchanged; the event only carries the new version
+            publish_changes(db, [], version)
+    finally:
+        db.close()
+
+def move_meeting(db: Session, dragged_id: int, target_id: int):
+    """
+    Move a meeting right before another one of the same client (flushed, not committed)
+
+    Returns:
+        (the moved meeting, its (before, after) stats change, its revision)
+    """
+    dragged = db.query(Meeting).filter(Meeting.id == dragged_id).first()
+    target = db.query(Meeting).filter(Meeting.id == target_id).first()
+
+    if not dragged or not target:
+        raise HTTPException(status_code=404, detail="Meeting not found")
 
-        if dragged.client != target.client:
-            raise HTTPException(status_code=400, detail="Cannot reorder across different clients")
+    if dragged.client_id != target.client_id:
+        raise HTTPException(status_code=400, detail="Cannot reorder across different clients")
 
-        # Get all meetings for this client ordered by client_order
-        client_meetings = db.query(Meeting).filter(
-            Meeting.client == dragged.client
-        ).order_by(Meeting.client_order).all()
+    before = dashboard_stats.snapshot(dragged)
+    before_state = meeting_revisions.meeting_state(dragged)
 
-        # Remove dragged from list
-        client_meetings = [m for m in client_meetings if m.id != dragged.id]
+    # Move the dragged meeting right before the target: only its rank key changes
+    previous_rank = db.query(func.max(Meeting.client_rank)).filter(
+        Meeting.client_id == target.client_id,
+        Meeting.client_rank < target.client_rank,
+        Meeting.id != dragged.id
+    ).scalar()
+    dragged.client_rank = rank_between(previous_rank, target.client_rank)
+    dragged.updated_at = datetime.utcnow()
 
-        # Find target position
-        target_index = next((i for i, m in enumerate(client_meetings) if m.id == target.id), 0)
+    db.flush()
+    change = (before, dashboard_stats.snapshot(dragged))
+    dashboard_stats.apply_meeting_changes(db, [change])
+    revision = meeting_revisions.Revision("reorder", dragged_id, before_state, meeting_revisions.meeting_state(dragged))
+    return dragged, change, revision
 
-        # Insert dragged at target position
-        client_meetings.insert(target_index, dragged)
+@app.post("/api/meetings/reorder")
+def reorder_meetings(request: ReorderRequest, background_tasks: BackgroundTasks,
+                     session_id: Optional[str] = Depends(history_session), db: Session = Depends(get_db)):
+    try:
+        dragged, change, revision = move_meeting(db, request.dragged_id, request.target_id)
+        finish_write(db, [change], [revision], session_id)
 
-        # Update client_order for all
-        for idx, meeting in enumerate(client_meetings):
-            meeting.client_order = idx + 1
+        if len(dragged.client_rank) > MAX_RANK_LENGTH:
+            background_tasks.add_task(rebalance_client_ranks, dragged.client_id)
 
-        db.commit()
         return {"message": "Reordered successfully"}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
+# Batch endpoint: several operations, one transaction
+MAX_BATCH_OPERATIONS = 1000
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete", "reorder"]
+    id: Optional[int] = None  # Meeting to update / delete, or the dragged meeting for reorder
+    target_id: Optional[int] = None  # reorder: the meeting to move before
+    meeting: Optional[MeetingBase] = None  # create / update: the meeting's fields
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., max_length=MAX_BATCH_OPERATIONS)
+
+@app.post("/api/meetings/batch")
+def batch_meetings(request: BatchRequest, background_tasks: BackgroundTasks,
+                   session_id: Optional[str] = Depends(history_session), db: Session = Depends(get_db)):
+    """
+    Apply create / update / delete / reorder operations in order, in one transaction.
+    All or nothing: if an operation fails, none are applied and the error
+    names the operation's index.
+    """
+    if not request.operations:
+        raise HTTPException(status_code=400, detail="No operations")
+
+    # One global order allocation for all the creates
+    creates = sum(1 for operation in request.operations if operation.op == "create")
+    next_global_order = sequences.next_global_orders(db, creates) - creates + 1 if creates else None
+
+    results = []
+    changes = []
+    revisions = []
+    long_rank_clients = set()
+    for index, operation in enumerate(request.operations):
+        try:
+            if operation.op in ("update", "delete", "reorder") and operation.id is None:
+                raise HTTPException(status_code=400, detail="id is required")
+            if operation.op in ("create", "update") and operation.meeting is None:
+                raise HTTPException(status_code=400, detail="meeting is required")
+
+            if operation.op == "create":
+                db_meeting, change, revision = add_meeting(db, operation.meeting, next_global_order)
+                next_global_order += 1
+            elif operation.op == "update":
+                db_meeting, change, revision = change_meeting(db, operation.id, operation.meeting)
+            elif operation.op == "delete":
+                change, revision = remove_meeting(db, operation.id)
+            else:
+                if operation.target_id is None:
+                    raise HTTPException(status_code=400, detail="target_id is required")
+                db_meeting, change, revision = move_meeting(db, operation.id, operation.target_id)
+                if len(db_meeting.client_rank) > MAX_RANK_LENGTH:
+                    long_rank_clients.add(db_meeting.client_id)
+        except Exception as e:
+            db.rollback()
+            status_code = e.status_code if isinstance(e, HTTPException) else 400
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            raise HTTPException(status_code=status_code, detail={"index": index, "op": operation.op, "error": error})
+
+        changes.append(change)
+        revisions.append(revision)
+        results.append({"index": index, "op": operation.op, "id": revision.meeting_id})
+
+    finish_write(db, changes, revisions, session_id)
+    for client_id in long_rank_clients:
+        background_tasks.add_task(rebalance_client_ranks, client_id)
+
+    # Final state of every meeting the batch touched, read in one query
+    ids = {result["id"] for result in results}
+    meetings = {meeting.id: meeting for meeting in db.query(Meeting).filter(Meeting.id.in_(ids))}
+    load_update_numbers(db, meetings.values())
+    for result in results:
+        meeting = meetings.get(result["id"])
+        result["meeting"] = MeetingResponse.model_validate(meeting) if meeting else None
+    return {"results": results}
+
+# Revision history and undo / redo (see meeting_revisions.py)
+DEFAULT_REVISIONS_LIMIT = 50
+MAX_REVISIONS_LIMIT = 500
+
+@app.get("/api/meetings/{meeting_id}/revisions")
+def get_meeting_revisions(
+    meeting_id: int,
+    limit: int = Query(DEFAULT_REVISIONS_LIMIT, ge=1, le=MAX_REVISIONS_LIMIT),
+    db: Session = Depends(get_read_db)
+):
+    """A meeting's revisions, newest first, each with the meeting's state right after it"""
+    return meeting_revisions.history(db, meeting_id, limit)
+
+@app.post("/api/meetings/{meeting_id}/revert/{revision_id}", response_model=Optional[MeetingResponse])
+def revert_meeting(meeting_id: int, revision_id: int, session_id: Optional[str] = Depends(history_session),
+                   db: Session = Depends(get_db)):
+    """
+    Restore a meeting to its state right after a revision, in place with the same id.
+    Reverting to a delete revision deletes the meeting (and returns null).
+    """
+    found, state, created_at = meeting_revisions.revision_after(db, meeting_id, revision_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    try:
+        result = meeting_revisions.restore(db, "revert", meeting_id, state, created_at)
+    except meeting_revisions.HistoryConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    if result:
+        change, revision = result
+        finish_write(db, [change], [revision], session_id)
+    return db.query(Meeting).filter(Meeting.id == meeting_id).first()
+
+@app.get("/api/history")
+def get_history(session_id: Optional[str] = Depends(history_session), db: Session = Depends(get_read_db)):
+    """Whether the session (X-Session-Id header) has anything to undo or redo"""
+    return meeting_revisions.history_status(db, session_id)
+
+def step_history(db: Session, session_id: Optional[str], direction: str):
+    if not session_id:
+        raise HTTPException(status_code=400, detail="X-Session-Id header is required")
+
+    try:
+        step = meeting_revisions.undo(db, session_id) if direction == "undo" else meeting_revisions.redo(db, session_id)
+    except meeting_revisions.HistoryConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    if step is None:
+        raise HTTPException(status_code=400, detail=f"Nothing to {direction}")
+
+    ops, changes, revisions = step
+    finish_write(db, changes, revisions, session_id, undoable=False)
+    return {
+        # The undone / redone write: create, update, delete, reorder, import, revert, or batch for a mix
+        "op": ops[0] if len(set(ops)) == 1 else "batch",
+        "meeting_ids": [revision.meeting_id for revision in revisions],
+        **meeting_revisions.history_status(db, session_id)
+    }
+
+@app.post("/api/history/undo")
+def undo(session_id: Optional[str] = Depends(history_session), db: Session = Depends(get_db)):
+    """Undo the session's latest write, restoring the meetings in place"""
+    return step_history(db, session_id, "undo")
+
+@app.post("/api/history/redo")
+def redo(session_id: Optional[str] = Depends(history_session), db: Session = Depends(get_db)):
+    """Redo the session's most recently undone write"""
+    return step_history(db, session_id, "redo")
+
 # Export to Excel endpoint
 class ExportRequest(BaseModel):
     meeting_ids: List[int]
 
+# Excel export columns and their widths
+EXCEL_COLUMNS = [
+    ('Client', 20),
+    ('Update #', 10),
+    ('Meeting Date', 15),
+    ('People Connected', 30),
+    ('Actions', 40),
+    ('Next Meeting', 30),
+    ('Address', 30),
+    ('Actions Taken', 30)
+]
+EXPORT_BATCH_SIZE = 1000
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024  # Keep small exports in memory, spill larger ones to disk
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def selected_meetings(meeting_ids: List[int]):
+    """Filter on the selected ids; rendered inline so large selections don't hit SQLite's variable limit"""
+    return Meeting.id.in_(bindparam("meeting_ids", meeting_ids, expanding=True, literal_execute=True))
+
+def selected_update_numbers(meeting_ids: List[int]):
+    """update_numbers() over the selected meetings' clients only, so exports don't number the whole table"""
+    return update_numbers(select(Meeting.client_id).where(selected_meetings(meeting_ids)).correlate(None))
+
+def iter_file(file, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Stream a file in chunks and close it when done"""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
 @app.post("/api/export/excel")
-def export_to_excel(request: ExportRequest, db: Session = Depends(get_db)):
+def export_to_excel(request: ExportRequest, db: Session = Depends(get_read_db)):
     try:
         # Check if meeting_ids is provided and not empty
         if not request.meeting_ids or len(request.meeting_ids) == 0:
             raise HTTPException(status_code=400, detail="No meetings to export")
 
-        meetings = db.query(Meeting).filter(Meeting.id.in_(request.meeting_ids)).order_by(
+        start = time.perf_counter()
+        numbers = selected_update_numbers(request.meeting_ids)
+        rows = db.query(
+            Meeting.client, numbers.c.client_order, Meeting.meeting_date, Meeting.people_connected,
+            Meeting.actions, Meeting.next_meeting, Meeting.address, Meeting.actions_taken
+        ).join(numbers, numbers.c.id == Meeting.id).filter(selected_meetings(request.meeting_ids)).order_by(
             Meeting.client_first_appearance, Meeting.global_order
-        ).all()
-
-        if not meetings:
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        # Write rows straight to the workbook; constant_memory flushes each row as it is written
+        output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        worksheet = workbook.add_worksheet('Meetings')
+
+        # Add formatting
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#667eea',
+            'font_color': 'white',
+            'border': 1
+        })
+
+        # Set column widths and header
+        for col_num, (header, width) in enumerate(EXCEL_COLUMNS):
+            worksheet.set_column(col_num, col_num, width)
+            worksheet.write(0, col_num, header, header_format)
+
+        row_num = 0
+        for m in rows:
+            row_num += 1
+            worksheet.write_row(row_num, 0, (
+                m.client,
+                m.client_order,
+                m.meeting_date.strftime('%Y-%m-%d') if m.meeting_date else '',
+                m.people_connected or '',
+                m.actions or '',
+                m.next_meeting or '',
+                m.address or '',
+                m.actions_taken or ''
+            ))
+
+        workbook.close()
+
+        if row_num == 0:
+            output.close()
             raise HTTPException(status_code=404, detail="No meetings found")
 
-        # Create DataFrame
-        data = []
-        for m in meetings:
-            data.append({
-                'Client': m.client,
-                'Update #': m.client_order,
-                'Meeting Date': m.meeting_date.strftime('%Y-%m-%d') if m.meeting_date else '',
-                'People Connected': m.people_connected or '',
-                'Actions': m.actions or '',
-                'Next Meeting': m.next_meeting or '',
-                'Address': m.address or '',
-                'Actions Taken': m.actions_taken or ''
-            })
-
-        df = pd.DataFrame(data)
-
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False, sheet_name='Meetings')
-
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Meetings']
-
-            # Add formatting
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#667eea',
-                'font_color': 'white',
-                'border': 1
-            })
-
-            # Set column widths
-            worksheet.set_column('A:A', 20)  # Client
-            worksheet.set_column('B:B', 10)  # Update #
-            worksheet.set_column('C:C', 15)  # Meeting Date
-            worksheet.set_column('D:D', 30)  # People Connected
-            worksheet.set_column('E:E', 40)  # Actions
-            worksheet.set_column('F:F', 30)  # Next Meeting
-            worksheet.set_column('G:G', 30)  # Address
-            worksheet.set_column('H:H', 30)  # Actions Taken
-
-            # Apply header format
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-
+        metrics.EXPORT_DURATION.observe(time.perf_counter() - start, format="excel")
+        metrics.EXPORT_ROWS.observe(row_num, format="excel")
         output.seek(0)
 
         return StreamingResponse(
-            output,
+            iter_file(output),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": "attachment; filename=meetings_export.xlsx"}
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error exporting: {str(e)}")
 
-# Export to PDF endpoint
+# PDF report endpoints
+report_cache = ReportCache()
+report_jobs = ReportJobs(report_cache)
+
+def report_cache_key_for(db: Session, meeting_ids: List[int]) -> str:
+    """Cache key for a report over the selected meetings"""
+    # Update numbers and client names are part of the key: a drag renumbers rows
+    # and a rename renames them without touching them
+    numbers = selected_update_numbers(meeting_ids)
+    versions = db.query(
+        Meeting.id, Meeting.updated_at, numbers.c.client_order, Meeting.client
+    ).join(numbers, numbers.c.id == Meeting.id).filter(selected_meetings(meeting_ids)).order_by(
+        Meeting.client_first_appearance, Meeting.global_order
+    ).all()
+    if not versions:
+        raise HTTPException(status_code=404, detail="No meetings found")
+    return report_cache_key(versions)
+
+def load_report_meetings(db: Session, meeting_ids: List[int]) -> List[dict]:
+    """Plain meeting dictionaries for the report (picklable for the process pool)"""
+    numbers = selected_update_numbers(meeting_ids)
+    rows = db.query(
+        Meeting.client, numbers.c.client_order, Meeting.meeting_date, Meeting.people_connected,
+        Meeting.actions, Meeting.next_meeting, Meeting.address, Meeting.actions_taken
+    ).join(numbers, numbers.c.id == Meeting.id).filter(selected_meetings(meeting_ids)).order_by(
+        Meeting.client_first_appearance, Meeting.global_order
+    ).all()
+    return [row._asdict() for row in rows]
+
 @app.post("/api/export/pdf")
-def export_to_pdf(request: ExportRequest, db: Session = Depends(get_db)):
+def export_to_pdf(request: ExportRequest, db: Session = Depends(get_read_db)):
     try:
         # Check if meeting_ids is provided and not empty
         if not request.meeting_ids or len(request.meeting_ids) == 0:
             raise HTTPException(status_code=400, detail="No meetings to export")
 
-        meetings = db.query(Meeting).filter(Meeting.id.in_(request.meeting_ids)).order_by(
-            Meeting.client_first_appearance, Meeting.global_order
-        ).all()
-
-        if not meetings:
-            raise HTTPException(status_code=404, detail="No meetings found")
-
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=18)
-
-        # Container for the 'Flowable' objects
-        elements = []
-
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#667eea'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-
-        client_style = ParagraphStyle(
-            'ClientHeader',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.white,
-            backColor=colors.HexColor('#667eea'),
-            spaceAfter=12,
-            spaceBefore=12,
-            leftIndent=10,
-            rightIndent=10
-        )
-
-        # Add title
-        elements.append(Paragraph("Meeting Management Report", title_style))
-        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-        elements.append(Spacer(1, 20))
-
-        # Group by client
-        grouped = {}
-        for m in meetings:
-            if m.client not in grouped:
-                grouped[m.client] = []
-            grouped[m.client].append(m)
-
-        # Add meetings by client
-        for client, client_meetings in grouped.items():
-            # Client header
-            elements.append(Paragraph(f"<b>{client}</b> ({len(client_meetings)} updates)", client_style))
-            elements.append(Spacer(1, 15))
-
-            for idx, meeting in enumerate(client_meetings):
-                # Meeting header with simple bold style
-                meeting_title = ParagraphStyle(
-                    'MeetingTitle',
-                    parent=styles['Heading3'],
-                    fontSize=11,
-                    textColor=colors.HexColor('#333333'),
-                    fontName='Helvetica-Bold',
-                    spaceAfter=10
-                )
-
-                update_title_text = f"Update {meeting.client_order}"
-                if meeting.meeting_date:
-                    update_title_text += f" - {meeting.meeting_date.strftime('%b %d, %Y')}"
-                elements.append(Paragraph(update_title_text, meeting_title))
-
-                # Clean paragraph style for content
-                content_style = ParagraphStyle(
-                    'ContentStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    leading=14,
-                    spaceAfter=6
-                )
-
-                # Only show fields that have data
-                if meeting.people_connected and meeting.people_connected != '-':
-                    elements.append(Paragraph("<b>People Connected:</b>", content_style))
-                    elements.append(Paragraph(meeting.people_connected, content_style))
-                    elements.append(Spacer(1, 6))
-
-                if meeting.actions and meeting.actions != '-':
-                    elements.append(Paragraph("<b>Actions:</b>", content_style))
-                    elements.append(Paragraph(meeting.actions, content_style))
-                    elements.append(Spacer(1, 6))
-
-                if meeting.next_meeting and meeting.next_meeting != '-':
-                    elements.append(Paragraph("<b>Next Meeting:</b>", content_style))
-                    elements.append(Paragraph(meeting.next_meeting, content_style))
-                    elements.append(Spacer(1, 6))
-
-                if meeting.address and meeting.address != '-':
-                    elements.append(Paragraph("<b>Address:</b>", content_style))
-                    elements.append(Paragraph(meeting.address, content_style))
-                    elements.append(Spacer(1, 6))
-
-                if meeting.actions_taken and meeting.actions_taken != '-':
-                    elements.append(Paragraph("<b>Actions Taken:</b>", content_style))
-                    elements.append(Paragraph(meeting.actions_taken, content_style))
-                    elements.append(Spacer(1, 6))
-
-                # Add separator between updates
-                elements.append(Spacer(1, 12))
-                if idx < len(client_meetings) - 1:  # Don't add line after last update
-                    elements.append(Paragraph('<para borderWidth="0.5" borderColor="#cccccc" spaceBefore="0" spaceAfter="0">____________________________________________________________________</para>', styles['Normal']))
-                    elements.append(Spacer(1, 12))
-
-            # Page break after each client
-            elements.append(PageBreak())
-
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=meetings_report.pdf"}
-        )
+        cache_key = report_cache_key_for(db, request.meeting_ids)
+        file = report_cache.open_file(cache_key)
+        if file is None:
+            # Render in this request; the jobs API below keeps large reports off the API threads
+            start = time.perf_counter()
+            path = report_cache.path(cache_key)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            meetings = load_report_meetings(db, request.meeting_ids)
+            build_report(meetings, tmp_path)
+            os.replace(tmp_path, path)
+            # Opened before evicting, which may remove this very report
+            file = open(path, "rb")
+            report_cache.evict()
+            metrics.EXPORT_DURATION.observe(time.perf_counter() - start, format="pdf")
+            metrics.EXPORT_ROWS.observe(len(meetings), format="pdf")
+
+        return pdf_response(file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error exporting PDF: {str(e)}")
 
+def pdf_response(file) -> StreamingResponse:
+    """
+    Stream an open report. The file is opened before the response starts, so
+    a cache eviction meanwhile only unlinks it and the download still completes.
+    """
+    return StreamingResponse(
+        iter_file(file),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=meetings_report.pdf",
+            "Content-Length": str(os.fstat(file.fileno()).st_size)
+        }
+    )
+
+def report_job_response(job: dict) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"]
+    }
+
+@app.post("/api/export/pdf/jobs")
+def create_pdf_job(request: ExportRequest, db: Session = Depends(get_read_db)):
+    """Start rendering a PDF report in the background"""
+    if not request.meeting_ids or len(request.meeting_ids) == 0:
+        raise HTTPException(status_code=400, detail="No meetings to export")
+
+    cache_key = report_cache_key_for(db, request.meeting_ids)
+    job = report_jobs.submit(cache_key, lambda: load_report_meetings(db, request.meeting_ids))
+    return report_job_response(job)
+
+@app.get("/api/export/pdf/jobs/{job_id}")
+def get_pdf_job(job_id: str):
+    """Get the status and progress of a PDF report job"""
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return report_job_response(job)
+
+@app.get("/api/export/pdf/jobs/{job_id}/download")
+def download_pdf_job(job_id: str):
+    """Download the finished PDF of a report job"""
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Report is not ready (status: {job['status']})")
+
+    file = report_cache.open_file(job["cache_key"])
+    if file is None:
+        raise HTTPException(status_code=410, detail="Report expired from the cache, please export again")
+
+    return pdf_response(file)
+
 # Email Reminder Endpoints
 @app.post("/api/email/send-reminder")
-async def send_reminder_now(db: Session = Depends(get_db)):
+async def send_reminder_now(db: AsyncSession = Depends(get_async_db)):
     """Send meeting reminder email immediately (for testing)"""
     try:
         # Check if email configuration exists
@@ -523,57 +1011,11 @@ async def send_reminder_now(db: Session = Depends(get_db)):
                 "count": 0
             }
 
-        # Import email service directly
-        from email_service import EmailService
-
-        # Create email service
-        email_service = EmailService(
-            api_key=SENDGRID_API_KEY,
-            from_email=FROM_EMAIL
-        )
+        # Get meetings with upcoming dates in the next 7 days
+        from email_scheduler import MeetingReminderScheduler
 
-        # Get meetings with upcoming dates (simple version, no scheduler needed)
-        from datetime import datetime, timedelta
-        import re
-
-        all_meetings = db.query(Meeting).all()
-        upcoming_meetings = []
-        today = datetime.now()
-
-        for meeting in all_meetings:
-            if meeting.next_meeting:
-                # Try to parse date from next_meeting field
-                date_match = re.search(
-                    r'([A-Za-z]{3}),\s+([A-Za-z]{3})\s+(\d{1,2}),\s+(\d{4})',
-                    meeting.next_meeting
-                )
-
-                if date_match:
-                    try:
-                        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                        month_str = date_match.group(2)
-                        day = int(date_match.group(3))
-                        year = int(date_match.group(4))
-                        month = month_names.index(month_str) + 1
-
-                        meeting_date = datetime(year, month, day)
-                        days_until = (meeting_date.replace(hour=0, minute=0, second=0, microsecond=0) -
-                                    today.replace(hour=0, minute=0, second=0, microsecond=0)).days
-
-                        # Include meetings within next 7 days
-                        if 0 <= days_until <= 7:
-                            upcoming_meetings.append({
-                                'id': meeting.id,
-                                'client': meeting.client,
-                                'next_meeting': meeting.next_meeting,
-                                'days_left': days_until,
-                                'people_connected': meeting.people_connected or '-',
-                                'actions': meeting.actions or '-',
-                                'address': meeting.address or '-'
-                            })
-                    except:
-                        pass
+        scheduler = MeetingReminderScheduler(outbox_worker=outbox_worker)
+        upcoming_meetings = await scheduler.get_upcoming_meetings_async(db, days=7)
 
         if not upcoming_meetings:
             return {
@@ -582,19 +1024,21 @@ async def send_reminder_now(db: Session = Depends(get_db)):
                 "count": 0
             }
 
-        # Sort by days left
-        upcoming_meetings.sort(key=lambda x: x['days_left'])
-
-        # Send email
-        success = email_service.send_meeting_reminder_email(
-            to_email=DEFAULT_RECIPIENT_EMAIL,
-            meetings=upcoming_meetings,
-            recipient_name=DEFAULT_RECIPIENT_NAME
-        )
+        # Queue the email in this transaction; the outbox worker sends it.
+        # The minute in the dedup key absorbs double clicks
+        queued = await db.run_sync(lambda session: scheduler.enqueue_reminder(
+            session,
+            upcoming_meetings,
+            recipients=[(DEFAULT_RECIPIENT_NAME, DEFAULT_RECIPIENT_EMAIL)],
+            dedup_key_format=f"reminder-now:{{email}}:{datetime.utcnow():%Y-%m-%dT%H:%M}",
+            days=7
+        ))
+        await db.commit()
+        scheduler.deliver_outbox()
 
         return {
-            "success": success,
-            "message": f"Reminder email sent to {DEFAULT_RECIPIENT_EMAIL}" if success else "Failed to send email",
+            "success": True,
+            "message": f"Reminder email queued for {DEFAULT_RECIPIENT_EMAIL}" if queued else "Reminder email already queued",
             "count": len(upcoming_meetings),
             "meetings": [
                 {
@@ -611,14 +1055,35 @@ async def send_reminder_now(db: Session = Depends(get_db)):
         print(f"ERROR in send_reminder: {error_detail}")
         raise HTTPException(status_code=500, detail=error_detail)
 
+@app.get("/api/email/preview", response_class=HTMLResponse)
+async def preview_reminder_email(
+    format: str = Query("html", pattern="^(html|text)$"),
+    days: int = Query(7, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Render the reminder email for the upcoming meetings without sending it"""
+    try:
+        from email_config import DEFAULT_RECIPIENT_NAME
+        from email_scheduler import MeetingReminderScheduler
+        from email_templates import render_meeting_reminder
+
+        upcoming_meetings = await MeetingReminderScheduler().get_upcoming_meetings_async(db, days=days)
+        html_content, text_content = render_meeting_reminder(upcoming_meetings, DEFAULT_RECIPIENT_NAME, days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rendering email preview: {str(e)}")
+
+    if format == "text":
+        return PlainTextResponse(text_content)
+    return HTMLResponse(html_content)
+
 @app.get("/api/email/upcoming-meetings")
-async def get_upcoming_meetings_for_email(db: Session = Depends(get_db)):
+async def get_upcoming_meetings_for_email(db: AsyncSession = Depends(get_async_read_db)):
     """Get list of upcoming meetings that would be included in reminder email"""
     try:
         from email_scheduler import MeetingReminderScheduler
 
         scheduler = MeetingReminderScheduler()
-        upcoming_meetings = scheduler.get_upcoming_meetings(db)
+        upcoming_meetings = await scheduler.get_upcoming_meetings_async(db)
 
         return {
             "count": len(upcoming_meetings),
@@ -638,82 +1103,45 @@ async def get_upcoming_meetings_for_email(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching upcoming meetings: {str(e)}")
 
 @app.get("/api/dashboard/stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get dashboard KPI statistics"""
-    try:
-        from datetime import datetime, timedelta
-        import re
-
-        all_meetings = db.query(Meeting).all()
-
-        # Total unique clients
-        unique_clients = set(m.client for m in all_meetings if m.client)
-        total_clients = len(unique_clients)
-
-        # Total meetings
-        total_meetings = len(all_meetings)
-
-        # Active clients (meetings in last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        active_clients = set()
-        for meeting in all_meetings:
-            if meeting.updated_at and meeting.updated_at >= thirty_days_ago:
-                active_clients.add(meeting.client)
-
-        # Upcoming meetings (next 7 days)
-        today = datetime.now()
-        upcoming_count = 0
-        today_count = 0
-
-        for meeting in all_meetings:
-            if meeting.next_meeting:
-                date_match = re.search(
-                    r'([A-Za-z]{3}),\s+([A-Za-z]{3})\s+(\d{1,2}),\s+(\d{4})',
-                    meeting.next_meeting
-                )
-                if date_match:
-                    try:
-                        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                        month_str = date_match.group(2)
-                        day = int(date_match.group(3))
-                        year = int(date_match.group(4))
-                        month = month_names.index(month_str) + 1
-
-                        meeting_date = datetime(year, month, day)
-                        days_until = (meeting_date.replace(hour=0, minute=0, second=0, microsecond=0) -
-                                    today.replace(hour=0, minute=0, second=0, microsecond=0)).days
-
-                        if 0 <= days_until <= 7:
-                            upcoming_count += 1
-                        if days_until == 0:
-                            today_count += 1
-                    except:
-                        pass
-
-        # Meetings requiring action (has actions but no actions_taken)
-        action_required = 0
-        for meeting in all_meetings:
-            has_actions = meeting.actions and meeting.actions.strip() and meeting.actions != '-'
-            no_actions_taken = not meeting.actions_taken or meeting.actions_taken.strip() == '' or meeting.actions_taken == '-'
-            if has_actions and no_actions_taken:
-                action_required += 1
-
-        # Average meetings per client
-        avg_meetings_per_client = round(total_meetings / total_clients, 1) if total_clients > 0 else 0
+    def respond(session: Session):
+        # Upcoming / today counts are date-relative, so the day is part of the ETag
+        return response_cache.respond(
+            request, sequences.data_version(session), lambda: dashboard_stats_body(session),
+            extra=date.today().isoformat()
+        )
 
-        return {
-            "total_clients": total_clients,
-            "total_meetings": total_meetings,
-            "active_clients": len(active_clients),
-            "upcoming_meetings": upcoming_count,
-            "meetings_today": today_count,
-            "action_required": action_required,
-            "avg_meetings_per_client": avg_meetings_per_client
-        }
+    try:
+        # run_sync reuses the sync stats code while its queries are awaited on the async engine
+        return await db.run_sync(respond)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard stats: {str(e)}")
 
+def dashboard_stats_body(db: Session):
+    """Serialized dashboard KPIs"""
+    # Single-row read; the write paths keep the row current. Uses the
+    # writable session because the row is recomputed when it is stale
+    stats = dashboard_stats.get_dashboard_stats(db)
+
+    # Average meetings per client
+    avg_meetings_per_client = round(stats.total_meetings / stats.total_clients, 1) if stats.total_clients > 0 else 0
+
+    return json.dumps({
+        "total_clients": stats.total_clients,
+        "total_meetings": stats.total_meetings,
+        "active_clients": stats.active_clients,
+        "upcoming_meetings": stats.upcoming_meetings,
+        "meetings_today": stats.meetings_today,
+        "action_required": stats.action_required,
+        "avg_meetings_per_client": avg_meetings_per_client
+    }).encode(), {}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Request, SQL, import / export and email metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
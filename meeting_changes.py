@@ -0,0 +1,142 @@
+"""
+Meeting Change Tracking
+Stamps changed meetings with the write's data version (meetings.row_version)
+and keeps tombstones of deleted ones, so clients can fetch only what changed
+since the version they last saw
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from database import Meeting, Client, DeletedMeeting, insert_or_update, load_update_numbers
+import sequences
+
+# Past this many changed rows a full reload is cheaper than a delta
+MAX_DELTA_ROWS = 1000
+# Ranges stamped per UPDATE, well under SQLite's expression depth limit
+CONDITIONS_PER_UPDATE = 200
+
+
+def renumbered_ranges(revisions: Iterable) -> List[Tuple[int, str, Optional[str]]]:
+    """
+    Rank ranges of the updates whose "Update #" a write changes
+
+    An update's number counts its client's updates ranked at or before it, so
+    it changes only where the write added and removed a different number of
+    ranks before it: an append renumbers nothing, a move renumbers the updates
+    between its old and new place, a delete the updates after it.
+
+    Returns:
+        (client id, first rank, end rank (exclusive) or None for the end of the client) per range
+    """
+    shifts = {}  # client id -> {rank: ranks added there minus ranks removed}
+    for revision in revisions:
+        keys = [
+            (state["client_id"], state["client_rank"]) if state is not None else None
+            for state in (revision.before, revision.after)
+        ]
+        if keys[0] == keys[1]:
+            continue
+        for key, delta in zip(keys, (-1, 1)):
+            if key is not None:
+                ranks = shifts.setdefault(key[0], {})
+                ranks[key[1]] = ranks.get(key[1], 0) + delta
+
+    ranges = []
+    for client_id, ranks in shifts.items():
+        shift = 0
+        start = None
+        for rank in sorted(ranks):
+            shift += ranks[rank]
+            if shift and start is None:
+                start = rank
+            elif not shift and start is not None:
+                ranges.append((client_id, start, rank))
+                start = None
+        if start is not None:
+            ranges.append((client_id, start, None))
+    return ranges
+
+
+def mark_changed(db: Session, version: int, revisions: Iterable) -> None:
+    """
+    Record a write for delta syncs, before its commit
+
+    Besides the written meetings, the neighbours whose "Update #" the write
+    shifted are stamped (see renumbered_ranges).
+
+    Args:
+        version: The write's data version (see sequences.bump_data_version)
+        revisions: The write's meeting_revisions.Revision entries
+    """
+    revisions = list(revisions)
+    final_states = {revision.meeting_id: revision.after for revision in revisions}
+    written_ids = [meeting_id for meeting_id, state in final_states.items() if state is not None]
+    deleted_ids = [meeting_id for meeting_id, state in final_states.items() if state is None]
+
+    changed = [Meeting.id.in_(written_ids)] if written_ids else []
+    changed.extend(
+        and_(Meeting.client_id == client_id, Meeting.client_rank >= start,
+             *([Meeting.client_rank < end] if end is not None else []))
+        for client_id, start, end in renumbered_ranges(revisions)
+    )
+    for first in range(0, len(changed), CONDITIONS_PER_UPDATE):
+        db.execute(
+            Meeting.__table__.update()
+            .where(or_(*changed[first:first + CONDITIONS_PER_UPDATE]))
+            # Keep updated_at as is; neighbours were not edited
+            .values(row_version=version, updated_at=Meeting.updated_at)
+        )
+
+    if written_ids:
+        # Undo and revert can bring a deleted meeting back with its id
+        db.query(DeletedMeeting).filter(DeletedMeeting.id.in_(written_ids)).delete(synchronize_session=False)
+    if deleted_ids:
+        table = DeletedMeeting.__table__
+        statement = insert_or_update(db, table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={"row_version": statement.excluded.row_version, "deleted_at": statement.excluded.deleted_at}
+        )
+        now = datetime.utcnow()
+        db.execute(statement, [
+            {"id": meeting_id, "row_version": version, "deleted_at": now} for meeting_id in deleted_ids
+        ])
+
+
+def changes_since(db: Session, since: int, limit: int = MAX_DELTA_ROWS) -> Optional[Tuple[int, List[Meeting], List[int]]]:
+    """
+    Meetings written and deleted after a data version
+
+    Args:
+        since: Data version the client is at
+        limit: Most rows returned before asking for a full reload
+
+    Returns:
+        (the version to ask from next time, changed meetings, deleted ids), or
+        None when the client should reload everything instead (too many
+        changes, a client renamed, or a version from another database)
+    """
+    # Read the version before the rows: a write committed in between is sent
+    # again next time, never skipped
+    version = sequences.data_version(db)
+    if since > version:
+        return None
+    if since == version:
+        return version, [], []
+    # A rename changes every meeting of the client without writing them
+    if db.query(Client.id).filter(Client.row_version > since).first():
+        return None
+
+    meetings = db.query(Meeting).filter(Meeting.row_version > since).order_by(
+        Meeting.row_version, Meeting.id
+    ).limit(limit + 1).all()
+    deleted_ids = [row.id for row in db.query(DeletedMeeting.id).filter(
+        DeletedMeeting.row_version > since
+    ).order_by(DeletedMeeting.row_version, DeletedMeeting.id).limit(limit + 1)]
+
+    if len(meetings) + len(deleted_ids) > limit:
+        return None
+    load_update_numbers(db, meetings)
+    return version, meetings, deleted_ids
@@ -0,0 +1,59 @@
+"""
+Next Meeting Date Parsing
+Extracts the date from the free-text "Next Meeting" field
+"""
+
+import re
+from datetime import date
+from typing import Optional
+import pandas as pd
+
+# Matches dates like "Fri, Dec 6, 2024" anywhere in the text
+NEXT_MEETING_PATTERN = re.compile(r'([A-Za-z]{3}),\s+([A-Za-z]{3})\s+(\d{1,2}),\s+(\d{4})')
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def parse_next_meeting_date(next_meeting_str: Optional[str]) -> Optional[date]:
+    """
+    Parse the next meeting date from the string format
+    Expected format: "Fri, Dec 6, 2024" or similar
+
+    Returns:
+        The parsed date, or None if the text has no valid date
+    """
+    if not next_meeting_str or next_meeting_str == '-':
+        return None
+
+    date_match = NEXT_MEETING_PATTERN.search(next_meeting_str)
+    if not date_match:
+        return None
+
+    try:
+        month = MONTH_NAMES.index(date_match.group(2)) + 1
+        day = int(date_match.group(3))
+        year = int(date_match.group(4))
+        return date(year, month, day)
+    except (ValueError, IndexError):
+        return None
+
+
+def parse_next_meeting_dates(next_meetings: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_next_meeting_date over a Series of strings
+
+    Returns:
+        Series of dates (None where the text has no valid date)
+    """
+    parts = next_meetings.astype(object).str.extract(NEXT_MEETING_PATTERN)
+    month = parts[1].map({name: index + 1 for index, name in enumerate(MONTH_NAMES)})
+    parsed = pd.to_datetime(
+        pd.DataFrame({
+            "year": pd.to_numeric(parts[3]),
+            "month": month,
+            "day": pd.to_numeric(parts[2])
+        }),
+        errors="coerce"
+    )
+    return parsed.dt.date.astype(object).where(parsed.notna(), None)
@@ -0,0 +1,278 @@
+"""
+Meeting Revisions
+Every write records the meetings' states before and after it in the
+meeting_revisions table, inside the write's transaction. Reverts and the
+per-session undo / redo cursor put those states back in place, ids included
+"""
+
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from database import Meeting, Client, MeetingRevision, client_named
+import dashboard_stats
+import sequences
+
+# Columns a revision restores; next_meeting_at follows next_meeting and
+# updated_at becomes the time of the restore. The client is followed by id
+# (client_id) through renames, and by name once it's gone
+STATE_COLUMNS = [
+    "client", "client_id", "people_connected", "actions", "next_meeting", "address", "actions_taken",
+    "meeting_date", "client_rank", "global_order", "client_first_appearance", "created_at"
+]
+DATE_COLUMNS = {"meeting_date": date.fromisoformat, "created_at": datetime.fromisoformat}
+
+# Where a session's revisions are on its undo stack
+DONE = "done"      # Can be undone
+UNDONE = "undone"  # Can be redone
+
+# One meeting's part of a write; before is None for creates and after is None for deletes
+Revision = namedtuple("Revision", ["op", "meeting_id", "before", "after"])
+
+
+class HistoryConflict(Exception):
+    """
+    A revision can't be applied: the session's undo stack changed meanwhile, or
+    the meeting's id now belongs to another meeting
+    """
+
+
+def meeting_state(meeting) -> dict:
+    """Restorable fields of a meeting (an ORM object or a row of the meetings table)"""
+    return {column: getattr(meeting, column) for column in STATE_COLUMNS}
+
+
+def encode_state(state: Optional[dict]) -> Optional[str]:
+    if state is None:
+        return None
+    return json.dumps({
+        column: value.isoformat() if isinstance(value, date) else value
+        for column, value in state.items()
+    })
+
+
+def decode_state(data: Optional[str]) -> Optional[dict]:
+    if data is None:
+        return None
+    state = json.loads(data)
+    for column, parse in DATE_COLUMNS.items():
+        if state.get(column) is not None:
+            state[column] = parse(state[column])
+    return state
+
+
+def record(db: Session, version: int, revisions: Iterable[Revision], session_id: Optional[str] = None,
+           undoable: bool = True):
+    """
+    Store the revisions of one write (the caller commits)
+
+    Args:
+        version: The write's data version (see sequences.bump_data_version)
+        session_id: Browser session that made the write
+        undoable: Put the write on the session's undo stack; False for undo
+            and redo themselves, which move along the stack instead
+    """
+    on_stack = bool(session_id) and undoable
+    rows = [
+        {
+            "meeting_id": revision.meeting_id,
+            "version": version,
+            "op": revision.op,
+            "before": encode_state(revision.before),
+            "after": encode_state(revision.after),
+            "session_id": session_id,
+            "undo_state": DONE if on_stack else None,
+            "created_at": datetime.utcnow()
+        }
+        for revision in revisions
+    ]
+    if not rows:
+        return
+
+    if on_stack:
+        # A new action discards the session's redo stack
+        db.query(MeetingRevision).filter(
+            MeetingRevision.session_id == session_id,
+            MeetingRevision.undo_state == UNDONE
+        ).update({MeetingRevision.undo_state: None}, synchronize_session=False)
+    db.execute(insert(MeetingRevision.__table__), rows)
+
+
+def created_at(*states: Optional[dict]) -> Optional[datetime]:
+    """Creation time of the meeting the first recorded state belongs to, which identifies it"""
+    for state in states:
+        if state is not None:
+            return state["created_at"]
+    return None
+
+
+def restore(db: Session, op: str, meeting_id: int, state: Optional[dict],
+            meeting_created_at: Optional[datetime] = None):
+    """
+    Put a meeting back into a recorded state, keeping its id (flushed, not committed)
+
+    The meeting goes back to its client, under the client's current name if it
+    was renamed meanwhile. It gets its old rank back unless another meeting of
+    the client took it, in which case it goes after the client's other updates.
+
+    Args:
+        op: Operation recorded for the restore (revert, undo or redo)
+        state: A revision's state; None deletes the meeting
+        meeting_created_at: Creation time of the revision's meeting (see
+            created_at); a meeting now under its id with another one is a
+            different meeting, and is left alone
+
+    Raises:
+        HistoryConflict: The id belongs to a different meeting
+
+    Returns:
+        (its (before, after) stats change, its Revision), or None if there was nothing to do
+    """
+    db_meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if db_meeting is None and state is None:
+        return None
+    if db_meeting is not None and meeting_created_at is not None and db_meeting.created_at != meeting_created_at:
+        raise HistoryConflict(f"Meeting {meeting_id} has been replaced by another meeting")
+
+    before = dashboard_stats.snapshot(db_meeting) if db_meeting else None
+    before_state = meeting_state(db_meeting) if db_meeting else None
+
+    if state is None:
+        db.delete(db_meeting)
+        db.flush()
+        change = (before, None)
+        dashboard_stats.apply_meeting_changes(db, [change])
+        return change, Revision(op, meeting_id, before_state, None)
+
+    if db_meeting is None:
+        db_meeting = Meeting(id=meeting_id)
+        db.add(db_meeting)
+
+    # Revisions recorded before client_id was part of the state only have the name
+    renamed = db.get(Client, state["client_id"]) if state.get("client_id") is not None else None
+    client, rank = renamed.name if renamed else state["client"], state["client_rank"]
+    taken = db.query(Meeting.id).filter(
+        Meeting.client_id == client_named(client),
+        Meeting.client_rank == rank,
+        Meeting.id != meeting_id
+    ).first()
+    if taken:
+        client_id, first_appearance, rank = sequences.next_client_rank(db, client, state["client_first_appearance"])
+    else:
+        client_id, first_appearance = sequences.reserve_client_rank(db, client, state["client_first_appearance"], rank)
+
+    for column in STATE_COLUMNS:
+        if column not in ("client", "client_id"):
+            setattr(db_meeting, column, state[column])
+    db_meeting.client_id = client_id
+    db_meeting.client_rank = rank
+    db_meeting.client_first_appearance = first_appearance
+    db_meeting.updated_at = datetime.utcnow()
+
+    db.flush()
+    change = (before, dashboard_stats.snapshot(db_meeting))
+    dashboard_stats.apply_meeting_changes(db, [change])
+    return change, Revision(op, meeting_id, before_state, meeting_state(db_meeting))
+
+
+def revision_after(db: Session, meeting_id: int, revision_id: int) -> Tuple[bool, Optional[dict], Optional[datetime]]:
+    """
+    A meeting's state right after one of its revisions
+
+    Returns:
+        (whether the revision exists, the state or None if the revision
+        deleted the meeting, the meeting's creation time)
+    """
+    revision = db.query(MeetingRevision).filter(
+        MeetingRevision.id == revision_id,
+        MeetingRevision.meeting_id == meeting_id
+    ).first()
+    if revision is None:
+        return False, None, None
+    after = decode_state(revision.after)
+    return True, after, created_at(after, decode_state(revision.before))
+
+
+def history(db: Session, meeting_id: int, limit: int) -> List[dict]:
+    """A meeting's revisions, newest first"""
+    revisions = db.query(MeetingRevision).filter(
+        MeetingRevision.meeting_id == meeting_id
+    ).order_by(MeetingRevision.id.desc()).limit(limit)
+    return [
+        {
+            "revision": revision.id,
+            "op": revision.op,
+            "created_at": revision.created_at,
+            "meeting": decode_state(revision.after)
+        }
+        for revision in revisions
+    ]
+
+
+def undo(db: Session, session_id: str):
+    """
+    Restore the states from before the session's latest undoable write (flushed, not committed)
+
+    Returns:
+        (ops of the undone write, stats changes, Revisions of the restore), or None if there is nothing to undo
+    """
+    return _step(db, session_id, DONE, UNDONE, "undo")
+
+
+def redo(db: Session, session_id: str):
+    """Re-apply the session's most recently undone write; see undo"""
+    return _step(db, session_id, UNDONE, DONE, "redo")
+
+
+def _step(db: Session, session_id: str, from_state: str, to_state: str, op: str):
+    # Undo takes the newest write on the undo stack, redo the oldest on the redo stack
+    pick = func.max if op == "undo" else func.min
+    version = db.query(pick(MeetingRevision.version)).filter(
+        MeetingRevision.session_id == session_id,
+        MeetingRevision.undo_state == from_state
+    ).scalar()
+    if version is None:
+        return None
+
+    rows = db.query(MeetingRevision).filter(
+        MeetingRevision.session_id == session_id,
+        MeetingRevision.undo_state == from_state,
+        MeetingRevision.version == version
+    ).order_by(MeetingRevision.id).all()
+
+    # Move the write to the other stack first; a concurrent undo of the same
+    # session finds it already moved and can't apply it twice
+    moved = db.query(MeetingRevision).filter(
+        MeetingRevision.id.in_([row.id for row in rows]),
+        MeetingRevision.undo_state == from_state
+    ).update({MeetingRevision.undo_state: to_state}, synchronize_session=False)
+    if moved != len(rows):
+        raise HistoryConflict("Undo history changed, try again")
+
+    # Undo walks the write backwards so a meeting changed twice ends at its first state
+    if op == "undo":
+        steps = [(row.meeting_id, decode_state(row.before), decode_state(row.after)) for row in reversed(rows)]
+    else:
+        steps = [(row.meeting_id, decode_state(row.after), decode_state(row.before)) for row in rows]
+
+    changes = []
+    revisions = []
+    for meeting_id, state, other_state in steps:
+        result = restore(db, op, meeting_id, state, created_at(state, other_state))
+        if result:
+            changes.append(result[0])
+            revisions.append(result[1])
+    return [row.op for row in rows], changes, revisions
+
+
+def history_status(db: Session, session_id: Optional[str]) -> dict:
+    """Whether the session has anything to undo or redo"""
+    def has(undo_state):
+        return bool(session_id) and db.query(MeetingRevision.id).filter(
+            MeetingRevision.session_id == session_id,
+            MeetingRevision.undo_state == undo_state
+        ).first() is not None
+
+    return {"can_undo": has(DONE), "can_redo": has(UNDONE)}
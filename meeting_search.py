@@ -0,0 +1,98 @@
+"""
+Meeting Full-Text Search
+Queries the meetings_fts FTS5 index (see database.create_client_search_index) with
+BM25 ranking and highlighted snippets
+"""
+
+import html
+import re
+from typing import List, Tuple
+from sqlalchemy import Float, Integer, String, text
+from sqlalchemy.orm import Session
+from database import Meeting, SEARCH_COLUMNS, load_update_numbers
+
+# Column weights for BM25, in SEARCH_COLUMNS order: a hit in the client name
+# counts more than one in the notes
+COLUMN_WEIGHTS = [4.0, 2.0, 1.0, 1.0, 1.0]
+
+SNIPPET_TOKENS = 12
+
+# Control characters mark the hits in snippets so the notes can be escaped
+# before the markers become <mark> tags
+_HIT_START = "\x02"
+_HIT_END = "\x03"
+
+_WORD = re.compile(r"\w+")
+
+
+def fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as a prefix
+
+    Words are quoted so punctuation and FTS5 operators in the input can't cause
+    syntax errors. Returns an empty string when the input has no words.
+    """
+    words = _WORD.findall(query)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"  # Search as you type
+    return " ".join(terms)
+
+
+def highlight(snippet: str) -> str:
+    """Escape a snippet and turn the hit markers into <mark> tags"""
+    return html.escape(snippet or "").replace(_HIT_START, "<mark>").replace(_HIT_END, "</mark>")
+
+
+def search_meetings(db: Session, query: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+    """
+    Search the meeting notes
+
+    Args:
+        query: Free text typed by the user
+        limit: Page size
+        offset: Number of results to skip
+
+    Returns:
+        (total number of matches, one page of results, best match first)
+    """
+    match = fts_query(query)
+    if not match:
+        return 0, []
+
+    total = db.execute(
+        text("SELECT count(*) FROM meetings_fts WHERE meetings_fts MATCH :match"),
+        {"match": match}
+    ).scalar()
+    if not total:
+        return 0, []
+
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+    hits = text(
+        f"SELECT rowid AS id, bm25(meetings_fts, {weights}) AS score, "
+        f"snippet(meetings_fts, -1, :hit_start, :hit_end, '…', {SNIPPET_TOKENS}) AS snippet "
+        "FROM meetings_fts WHERE meetings_fts MATCH :match "
+        "ORDER BY score LIMIT :limit OFFSET :offset"
+    ).bindparams(
+        match=match, hit_start=_HIT_START, hit_end=_HIT_END, limit=limit, offset=offset
+    ).columns(id=Integer, score=Float, snippet=String).subquery("hits")
+
+    rows = db.query(Meeting, hits.c.score, hits.c.snippet).join(
+        hits, hits.c.id == Meeting.id
+    ).order_by(hits.c.score, Meeting.id).all()
+    load_update_numbers(db, [meeting for meeting, _, _ in rows])
+
+    return total, [
+        {
+            "id": meeting.id,
+            "client": meeting.client,
+            "client_order": meeting.client_order,
+            "meeting_date": meeting.meeting_date,
+            "next_meeting": meeting.next_meeting,
+            "snippet": highlight(snippet),
+            # BM25 is negative in SQLite (lower is better); flip it for readability
+            "score": round(-score, 4)
+        }
+        for meeting, score, snippet in rows
+    ]
@@ -0,0 +1,277 @@
+"""
+Application Metrics
+Counters, gauges and histograms rendered in the Prometheus text format for
+GET /metrics, an ASGI middleware timing every route, and SQLAlchemy cursor
+events timing every SQL statement (also totalled per request)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Upper bounds in seconds, from a cached read to a large export
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+# Statement labels; anything else (PRAGMA, BEGIN, ...) is OTHER
+SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette adds the charset
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric with one value (or histogram) per combination of label values"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count per label combination"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, (None, 0))
+            if counts is None:
+                # One slot per bucket plus +Inf, stored non-cumulative
+                counts = [0] * (len(self.buckets) + 1)
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(float(total))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: List[Metric] = []
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# HTTP
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time until the last byte of the response was sent",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled (including their background tasks)", ["method", "route"]
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request", ["route"],
+    buckets=STATEMENT_COUNT_BUCKETS
+)
+REQUEST_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Time spent executing SQL per request", ["route"]
+)
+
+# SQL
+SQL_STATEMENT_DURATION = Histogram(
+    "sql_statement_duration_seconds", "SQL statement execution time", ["operation"], buckets=SQL_BUCKETS
+)
+
+# Import / export
+EXPORT_DURATION = Histogram("export_duration_seconds", "Time to build an export", ["format"])
+EXPORT_ROWS = Histogram("export_rows", "Meetings per export", ["format"], buckets=ROW_BUCKETS)
+IMPORT_DURATION = Histogram("import_duration_seconds", "Time to import an Excel sheet")
+IMPORT_ROWS = Histogram("import_rows", "Meetings per Excel import", buckets=ROW_BUCKETS)
+
+# Email
+EMAIL_SEND_DURATION = Histogram("email_send_duration_seconds", "SendGrid API request time", ["outcome"])
+EMAIL_SENDS = Counter("email_sends_total", "SendGrid API requests by outcome", ["outcome"])
+
+
+class SqlUsage:
+    """SQL statements run on behalf of one request"""
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware; the thread pool and async sessions run in copies of
+# the request's context, which share the same SqlUsage object
+_request_sql: ContextVar[Optional[SqlUsage]] = ContextVar("request_sql", default=None)
+
+
+def _statement_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine):
+    """Time every statement run on a (sync) engine; pass async engines' sync_engine"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        SQL_STATEMENT_DURATION.observe(elapsed, operation=_statement_operation(statement))
+        usage = _request_sql.get()
+        if usage is not None:
+            usage.statements += 1
+            usage.seconds += elapsed
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and SQL usage per route"""
+
+    def __init__(self, app, routes_app=None):
+        """
+        Args:
+            app: The ASGI app to wrap
+            routes_app: App whose routes name the requests (the FastAPI app
+                itself, which is what `app` ends up wrapping)
+        """
+        self.app = app
+        self.routes_app = routes_app
+
+    def route_name(self, scope) -> str:
+        """The matched route's path template, so ids don't create a label per meeting"""
+        routes = self.routes_app.routes if self.routes_app is not None else []
+        partial = None
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", scope["path"])
+            if match == Match.PARTIAL and partial is None:
+                partial = route
+        return getattr(partial, "path", "unmatched") if partial is not None else "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_name(scope)
+        usage = SqlUsage()
+        token = _request_sql.set(usage)
+        start = time.perf_counter()
+        status = {"code": 500, "recorded": False}
+
+        async def send_and_time(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this; the client already has its response
+                REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route,
+                                         status=status["code"])
+                status["recorded"] = True
+
+        REQUESTS_IN_FLIGHT.inc(method=method, route=route)
+        try:
+            await self.app(scope, receive, send_and_time)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method=method, route=route)
+            if not status["recorded"]:
+                # Failed or disconnected before the response finished
+                REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route,
+                                         status=status["code"])
+            REQUEST_SQL_STATEMENTS.observe(usage.statements, route=route)
+            REQUEST_SQL_DURATION.observe(usage.seconds, route=route)
+            _request_sql.reset(token)
@@ -0,0 +1,58 @@
+"""
+Schema Migrations
+Versioned schema changes for existing databases, applied in order at startup
+and recorded in the schema_migrations table so each runs once
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from typing import Iterable, List, Set
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select
+from sqlalchemy.exc import IntegrityError
+
+# version: unique and increasing; apply: callable doing the change in its own transaction(s)
+Migration = namedtuple("Migration", ["version", "name", "apply"])
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False)
+)
+
+
+def applied_versions(engine) -> Set[int]:
+    """Versions already recorded in the database"""
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def upgrade(engine, migrations: Iterable[Migration]) -> List[int]:
+    """
+    Apply the migrations the database hasn't recorded yet, oldest first
+
+    A migration is recorded after it commits, so one interrupted halfway (or
+    run by several workers starting at once) runs again: each must check
+    what is already there, like the backfill_* functions in database.py.
+
+    Returns:
+        The versions applied by this call
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    done = applied_versions(engine)
+
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        migration.apply()
+        try:
+            with engine.begin() as conn:
+                conn.execute(schema_migrations.insert().values(
+                    version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            pass  # Another worker recorded it first
+        applied.append(migration.version)
+        print(f"INFO: Applied schema migration {migration.version} ({migration.name})")
+    return applied
@@ -0,0 +1,317 @@
+"""
+PDF Meeting Reports
+Renders the meeting report with ReportLab in a process pool, tracks
+background report jobs and keeps finished reports in an LRU disk cache
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import metrics
+
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "./pdf_cache")
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_JOB_TTL_SECONDS = 3600  # Finished jobs are forgotten after an hour
+
+# Styles are built once per process instead of once per meeting
+styles = getSampleStyleSheet()
+
+title_style = ParagraphStyle(
+    'CustomTitle',
+    parent=styles['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#667eea'),
+    spaceAfter=30,
+    alignment=1  # Center
+)
+
+client_style = ParagraphStyle(
+    'ClientHeader',
+    parent=styles['Heading2'],
+    fontSize=16,
+    textColor=colors.white,
+    backColor=colors.HexColor('#667eea'),
+    spaceAfter=12,
+    spaceBefore=12,
+    leftIndent=10,
+    rightIndent=10
+)
+
+# Meeting header with simple bold style
+meeting_title_style = ParagraphStyle(
+    'MeetingTitle',
+    parent=styles['Heading3'],
+    fontSize=11,
+    textColor=colors.HexColor('#333333'),
+    fontName='Helvetica-Bold',
+    spaceAfter=10
+)
+
+# Clean paragraph style for content
+content_style = ParagraphStyle(
+    'ContentStyle',
+    parent=styles['Normal'],
+    fontSize=10,
+    leading=14,
+    spaceAfter=6
+)
+
+# Fields shown for each meeting, in order
+REPORT_FIELDS = [
+    ('people_connected', 'People Connected'),
+    ('actions', 'Actions'),
+    ('next_meeting', 'Next Meeting'),
+    ('address', 'Address'),
+    ('actions_taken', 'Actions Taken')
+]
+
+
+def build_report(meetings: List[Dict], output, on_progress=None):
+    """
+    Render the meeting report
+
+    Args:
+        meetings: Meeting dictionaries in report order
+        output: File path or file-like object to write the PDF to
+        on_progress: Optional callback receiving the fraction done (0.0 - 1.0)
+    """
+    doc = SimpleDocTemplate(output, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=18)
+
+    # Container for the 'Flowable' objects
+    elements = []
+
+    # Add title
+    elements.append(Paragraph("Meeting Management Report", title_style))
+    elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
+    elements.append(Spacer(1, 20))
+
+    # Group by client
+    grouped = {}
+    for m in meetings:
+        grouped.setdefault(m['client'], []).append(m)
+
+    # Add meetings by client
+    for client, client_meetings in grouped.items():
+        # Client header
+        elements.append(Paragraph(f"<b>{client}</b> ({len(client_meetings)} updates)", client_style))
+        elements.append(Spacer(1, 15))
+
+        for idx, meeting in enumerate(client_meetings):
+            update_title_text = f"Update {meeting['client_order']}"
+            if meeting['meeting_date']:
+                update_title_text += f" - {meeting['meeting_date'].strftime('%b %d, %Y')}"
+            elements.append(Paragraph(update_title_text, meeting_title_style))
+
+            # Only show fields that have data
+            for field, label in REPORT_FIELDS:
+                value = meeting[field]
+                if value and value != '-':
+                    elements.append(Paragraph(f"<b>{label}:</b>", content_style))
+                    elements.append(Paragraph(value, content_style))
+                    elements.append(Spacer(1, 6))
+
+            # Add separator between updates
+            elements.append(Spacer(1, 12))
+            if idx < len(client_meetings) - 1:  # Don't add line after last update
+                elements.append(Paragraph('<para borderWidth="0.5" borderColor="#cccccc" spaceBefore="0" spaceAfter="0">____________________________________________________________________</para>', styles['Normal']))
+                elements.append(Spacer(1, 12))
+
+        # Page break after each client
+        elements.append(PageBreak())
+
+    if on_progress:
+        total = {'count': max(len(elements), 1)}
+
+        def progress_callback(kind, value):
+            if kind == 'SIZE_EST':
+                total['count'] = max(value, 1)
+            elif kind == 'PROGRESS':
+                on_progress(min(value / total['count'], 1.0))
+
+        doc.setProgressCallBack(progress_callback)
+
+    doc.build(elements)
+
+
+def _render_in_worker(meetings: List[Dict], path: str, job_id: str, progress):
+    """Process pool entry point: render to a temp file, then move it into place"""
+    def on_progress(fraction):
+        progress[job_id] = fraction
+
+    tmp_path = f"{path}.{job_id}.tmp"
+    try:
+        build_report(meetings, tmp_path, on_progress)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def report_cache_key(versions) -> str:
+    """Hash the (id, updated_at, update number, client name) of the selected meetings, in report order"""
+    digest = hashlib.sha256()
+    for meeting_id, updated_at, client_order, client in versions:
+        digest.update(f"{meeting_id}:{updated_at.isoformat() if updated_at else ''}:{client_order}:{client};".encode())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Finished PDFs on disk, keyed by cache key, evicted least-recently-used first"""
+
+    def __init__(self, directory: str = PDF_CACHE_DIR, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path and mark it as recently used"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def open_file(self, key: str) -> Optional[BinaryIO]:
+        """
+        Open a cached report for reading and mark it as recently used
+
+        The open file stays readable if evict() removes the report while it is
+        being sent.
+        """
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+    def evict(self):
+        """Remove the least recently used reports until the cache fits its budget"""
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+class ReportJobs:
+    """Background PDF report jobs rendered in a process pool"""
+
+    def __init__(self, cache: ReportCache, max_workers: int = PDF_WORKERS):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+
+    def _pool(self):
+        # Started lazily so importing the app doesn't spawn processes
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._progress = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    def submit(self, cache_key: str, load_meetings) -> dict:
+        """
+        Create a job for a report.
+
+        Args:
+            cache_key: Key from report_cache_key for the selected meetings
+            load_meetings: Callable returning the meeting dictionaries, only
+                called when the report is not cached yet
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "progress": 0.0,
+            "cache_key": cache_key,
+            "error": None,
+            "created_at": datetime.utcnow()
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+
+        if self.cache.get(cache_key):
+            job.update(status="done", progress=1.0)
+            return job
+
+        meetings = load_meetings()
+        executor = self._pool()
+        self._progress[job_id] = 0.0
+        job["status"] = "rendering"
+        started = time.perf_counter()
+        future = executor.submit(_render_in_worker, meetings, self.cache.path(cache_key), job_id, self._progress)
+        future.add_done_callback(lambda f: self._finish(job, f, started, len(meetings)))
+        return job
+
+    def _prune(self):
+        now = datetime.utcnow()
+        with self.lock:
+            for job_id, job in list(self.jobs.items()):
+                finished = job["status"] in ("done", "failed")
+                if finished and (now - job["created_at"]).total_seconds() > PDF_JOB_TTL_SECONDS:
+                    del self.jobs[job_id]
+
+    def _finish(self, job: dict, future, started: float, rows: int):
+        error = future.exception()
+        if error:
+            job.update(status="failed", error=str(error))
+        else:
+            job.update(status="done", progress=1.0)
+            self.cache.evict()
+            metrics.EXPORT_DURATION.observe(time.perf_counter() - started, format="pdf")
+            metrics.EXPORT_ROWS.observe(rows, format="pdf")
+        try:
+            self._progress.pop(job["job_id"], None)
+        except Exception:
+            pass  # Manager already shut down
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self.jobs.get(job_id)
+        if job and job["status"] == "rendering":
+            job["progress"] = round(self._progress.get(job_id, job["progress"]), 3)
+        return job
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
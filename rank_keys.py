@@ -0,0 +1,74 @@
+"""
+Rank Keys for Meeting Ordering
+Base-62 strings that sort lexicographically, so a meeting can be moved
+between two neighbours by giving it a key between theirs (one row update)
+"""
+
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Appended keys are consecutive values at this many digits, so they stay short
+RANK_WIDTH = 6
+
+# Keys longer than this trigger a rebalance of the client's keys
+MAX_RANK_LENGTH = 16
+
+
+def rank_from_value(value: int, width: int = RANK_WIDTH) -> str:
+    """Fixed-width base-62 digits with trailing zeros removed (they don't change the order)"""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def rank_value(key: str, width: int = RANK_WIDTH) -> int:
+    """Value of the first `width` digits of a key"""
+    value = 0
+    for char in key[:width].ljust(width, "0"):
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Return a key that sorts strictly between two keys
+
+    Args:
+        before: Key of the previous item, or None for the start
+        after: Key of the next item, or None for the end
+    """
+    before = before or ""
+    result = ""
+    i = 0
+    while True:
+        low = DIGITS.index(before[i]) if i < len(before) else 0
+        high = DIGITS.index(after[i]) if after is not None and i < len(after) else BASE
+
+        if low == high:
+            result += DIGITS[low]
+            i += 1
+            continue
+
+        middle = (low + high) // 2
+        if middle > low:
+            return result + DIGITS[middle]
+
+        # Adjacent digits: keep the lower one and look for room after it
+        result += DIGITS[low]
+        after = None
+        i += 1
+
+
+def first_rank_value() -> int:
+    """Position of the first key of a client, in the middle of the key space"""
+    return rank_value(rank_between(None, None))
+
+
+def spaced_ranks(count: int) -> List[str]:
+    """Evenly spaced keys for `count` items, used for backfills and rebalancing"""
+    step = BASE ** RANK_WIDTH // (count + 1)
+    return [rank_from_value(step * (position + 1)) for position in range(count)]
@@ -0,0 +1,198 @@
+"""
+Reminder Timer
+Runs the daily reminder digest inside the app's event loop. A heap of the
+meetings' next dates gives the next day a digest is due, the task sleeps until
+that day's REMINDER_TIME_IST and is woken early when a write changes a date
+"""
+
+import asyncio
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import pytz
+from database import Meeting, SessionLocal
+
+IST = pytz.timezone('Asia/Kolkata')
+
+# Re-check at least this often, in case the wall clock jumps (suspend, NTP)
+MAX_SLEEP_SECONDS = 3600
+
+
+class ReminderTimer:
+    """Fires MeetingReminderScheduler.send_daily_reminder on the days a digest has meetings"""
+
+    def __init__(self, outbox_worker=None, session_factory=SessionLocal,
+                 clock: Optional[Callable[[], datetime]] = None):
+        """
+        Args:
+            outbox_worker: Outbox worker woken after each digest is queued
+            clock: Returns the current aware datetime (the wall clock in IST by default)
+        """
+        self.outbox_worker = outbox_worker
+        self.session_factory = session_factory
+        self.clock = clock or (lambda: datetime.now(IST))
+        self.reminder_time = None
+        self.days_threshold = None
+        self.next_dates: Dict[int, date] = {}  # meeting id -> next meeting date
+        self.heap = []  # (next meeting date, meeting id); stale entries are skipped
+        self.pending = []  # Changes that arrive while the heap is being (re)loaded
+        self.last_fired: Optional[date] = None
+        self._task = None
+        self._loop = None
+        self._wake = None
+
+    def start(self) -> bool:
+        """Start the timer in the running event loop (no-op without an API key)"""
+        if self._task is not None:
+            return True
+
+        from email_config import SENDGRID_API_KEY, REMINDER_TIME_IST, REMINDER_DAYS_THRESHOLD
+        if not SENDGRID_API_KEY:
+            print("INFO: SENDGRID_API_KEY not set, reminder timer not started")
+            return False
+
+        hour, minute = (int(part) for part in REMINDER_TIME_IST.split(":"))
+        self.reminder_time = time(hour, minute)
+        self.days_threshold = REMINDER_DAYS_THRESHOLD
+
+        # Like the old daily job, a reminder time that already passed today waits for tomorrow
+        today = self.today()
+        if self.now() >= self.fire_instant(today):
+            self.last_fired = today
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"SUCCESS: Reminder timer started ({REMINDER_TIME_IST} IST, {REMINDER_DAYS_THRESHOLD} day window)")
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def now(self) -> datetime:
+        return self.clock()
+
+    def today(self) -> date:
+        return self.now().date()
+
+    def fire_instant(self, day: date) -> datetime:
+        """The reminder time on a given day"""
+        return IST.localize(datetime.combine(day, self.reminder_time))
+
+    def meetings_changed(self, changes: Iterable[Tuple[Optional[object], Optional[object]]]):
+        """
+        Update the heap after committed writes (callable from any thread)
+
+        Args:
+            changes: (before, after) pairs of dashboard_stats.MeetingSnapshot,
+                before is None for creates and after is None for deletes
+        """
+        updates = []
+        for before, after in changes:
+            if after is not None:
+                updates.append((after.id, after.next_meeting_at))
+            elif before is not None:
+                updates.append((before.id, None))
+        if updates and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._apply, updates)
+
+    def reload(self):
+        """Rebuild the heap from the database, e.g. after an import (callable from any thread)"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._request_reload)
+
+    def _request_reload(self):
+        self.next_dates = None
+        self.pending = []
+        self._wake.set()
+
+    def _apply(self, updates):
+        if self.next_dates is None:
+            # The load may have read the rows before these writes committed
+            self.pending.extend(updates)
+            return
+        changed = False
+        for meeting_id, next_date in updates:
+            if self.next_dates.get(meeting_id) == next_date:
+                continue
+            changed = True
+            if next_date is None:
+                self.next_dates.pop(meeting_id, None)
+            else:
+                self.next_dates[meeting_id] = next_date
+                heapq.heappush(self.heap, (next_date, meeting_id))
+        if changed:
+            self._wake.set()
+
+    def _load(self) -> Dict[int, date]:
+        db = self.session_factory()
+        try:
+            rows = db.query(Meeting.id, Meeting.next_meeting_at).filter(
+                Meeting.next_meeting_at >= self.today()
+            ).all()
+            return {row.id: row.next_meeting_at for row in rows}
+        finally:
+            db.close()
+
+    def next_fire_day(self) -> Optional[date]:
+        """First day from the next unfired one whose digest window has a meeting"""
+        first_day = self.today()
+        if self.last_fired is not None and self.last_fired >= first_day:
+            first_day = self.last_fired + timedelta(days=1)
+
+        # Drop meetings that are already past and entries replaced by later changes
+        while self.heap:
+            next_date, meeting_id = self.heap[0]
+            if next_date >= first_day and self.next_dates.get(meeting_id) == next_date:
+                return max(first_day, next_date - timedelta(days=self.days_threshold))
+            heapq.heappop(self.heap)
+            if next_date < first_day and self.next_dates.get(meeting_id) == next_date:
+                del self.next_dates[meeting_id]
+        return None
+
+    async def _run(self):
+        self.next_dates = None
+        while True:
+            self._wake.clear()
+            try:
+                if self.next_dates is None:
+                    next_dates = await asyncio.to_thread(self._load)
+                    if self._wake.is_set():
+                        continue  # Another reload was requested meanwhile
+                    self.next_dates = next_dates
+                    self.heap = [(next_date, meeting_id) for meeting_id, next_date in next_dates.items()]
+                    heapq.heapify(self.heap)
+                    pending, self.pending = self.pending, []
+                    self._apply(pending)
+                    self._wake.clear()
+
+                day = self.next_fire_day()
+                if day is None:
+                    delay = MAX_SLEEP_SECONDS
+                else:
+                    delay = (self.fire_instant(day) - self.now()).total_seconds()
+
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=min(delay, MAX_SLEEP_SECONDS))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue  # Re-evaluate: woken by a write, or the sleep cap was hit
+
+                await asyncio.to_thread(self._fire)
+                self.last_fired = day
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR: Reminder timer failed: {str(e)}")
+                await asyncio.sleep(60)
+
+    def _fire(self):
+        from email_scheduler import MeetingReminderScheduler
+        MeetingReminderScheduler(outbox_worker=self.outbox_worker).send_daily_reminder()
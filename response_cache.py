@@ -0,0 +1,109 @@
+"""
+Conditional GET Caching
+Strong ETags derived from the data version (see sequences.bump_data_version)
+and an in-memory LRU cache of serialized read responses, compressed once
+per encoding (see json_responses.py)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+import json_responses
+
+RESPONSE_CACHE_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "128"))
+
+# Browsers may reuse a response only after revalidating it with If-None-Match
+CACHE_CONTROL = "no-cache"
+
+
+def request_key(request: Request, extra: str = "") -> str:
+    """Path and sorted query parameters, plus anything else the response depends on"""
+    params = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{params}#{extra}"
+
+
+def make_etag(version: int, key: str, encoding: Optional[str] = None) -> str:
+    """Strong ETag for one response at one data version, in one content encoding"""
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"v{version}-{digest}{suffix}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers the ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class ResponseCache:
+    """Serialized response bodies keyed by ETag (data version, request and encoding), evicted least-recently-used first"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        with self.lock:
+            entry = self.entries.get(etag)
+            if entry is not None:
+                self.entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag: str, body: bytes, headers: Dict[str, str]):
+        with self.lock:
+            self.entries[etag] = (body, headers)
+            self.entries.move_to_end(etag)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _encoded(self, version: int, key: str, encoding: Optional[str], build) -> Tuple[bytes, Dict[str, str]]:
+        """The body for one encoding, built and compressed at most once per data version"""
+        etag = make_etag(version, key, encoding)
+        entry = self.get(etag)
+        if entry is None:
+            if encoding is None:
+                entry = build()
+            else:
+                body, headers = self._encoded(version, key, None, build)
+                compressed = json_responses.compress(body, encoding)
+                entry = (compressed, {**headers, "Content-Encoding": encoding}) if compressed else (body, headers)
+            self.put(etag, *entry)
+        return entry
+
+    def respond(self, request: Request, version: int, build: Callable[[], Tuple[bytes, Dict[str, str]]],
+                extra: str = "") -> Response:
+        """
+        Answer a read request from the data version
+
+        Args:
+            request: The incoming request
+            version: Data version, read before any of the data
+            build: Returns the serialized JSON body and extra headers; only
+                called when the response isn't cached
+            extra: Anything besides the request the response depends on (e.g. today's date)
+        """
+        key = request_key(request, extra)
+        # Each encoding is its own representation, with its own ETag
+        encoding = json_responses.negotiate_encoding(request.headers.get("accept-encoding"))
+        etag = make_etag(version, key, encoding)
+        # X-Data-Version is where a delta sync (/api/meetings/changes) can start from
+        cache_headers = {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "X-Data-Version": str(version)
+        }
+
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        body, headers = self._encoded(version, key, encoding, build)
+        return Response(content=body, media_type="application/json", headers={**headers, **cache_headers})
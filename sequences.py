@@ -0,0 +1,154 @@
+"""
+Order Sequences
+Atomic allocation of global_order and per-client rank keys from the
+order_counters and clients tables, plus the data version bumped by every
+write, all inside the caller's transaction
+"""
+
+from typing import Dict, List, Tuple
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from database import OrderCounter, Client, insert_or_update
+from rank_keys import first_rank_value, rank_from_value, rank_value
+
+GLOBAL_ORDER = "global_order"
+DATA_VERSION = "data_version"
+
+
+def next_global_orders(db: Session, count: int = 1) -> int:
+    """
+    Reserve `count` consecutive global orders
+
+    Returns:
+        The last reserved value; the block is (last - count + 1) .. last
+    """
+    return _increment(db, GLOBAL_ORDER, count)
+
+
+def reserve_global_order(db: Session, value: int):
+    """Make sure later allocations come after `value` (used by imports that bring their own order)"""
+    table = OrderCounter.__table__
+    statement = insert_or_update(db, table).values(name=GLOBAL_ORDER, value=value)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"value": _greatest(db, table.c.value, statement.excluded.value)}
+    )
+    db.execute(statement)
+
+
+def bump_data_version(db: Session) -> int:
+    """Record that the meetings changed; read endpoints derive their ETags from this"""
+    return _increment(db, DATA_VERSION)
+
+
+def data_version(db: Session) -> int:
+    """Current data version (primary key lookup, doesn't touch the meetings table)"""
+    return db.query(OrderCounter.value).filter(OrderCounter.name == DATA_VERSION).scalar() or 0
+
+
+def next_client_ranks(db: Session, client: str, first_appearance: int, count: int = 1) -> Tuple[int, int, List[str]]:
+    """
+    Reserve `count` rank keys after the client's last one, adding the client if it is new
+
+    Args:
+        first_appearance: Recorded as the client's first appearance if the client is new
+
+    Returns:
+        (the client's id, its first appearance, the new rank keys in order)
+    """
+    table = Client.__table__
+    statement = insert_or_update(db, table).values(
+        name=client,
+        first_appearance=first_appearance,
+        next_order=first_rank_value() + count + 1,
+        meeting_count=0
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"next_order": table.c.next_order + count}
+    ).returning(table.c.id, table.c.first_appearance, table.c.next_order)
+    client_id, client_first_appearance, next_order = db.execute(statement).one()
+    ranks = [rank_from_value(value) for value in range(next_order - count, next_order)]
+    return client_id, client_first_appearance, ranks
+
+
+def next_ranks_for_clients(db: Session, requests: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int, List[str]]]:
+    """
+    next_client_ranks for many clients in three statements (used by imports)
+
+    Args:
+        requests: client -> (its first appearance if it is new, number of rank keys)
+
+    Returns:
+        client -> (its id, its first appearance, its new rank keys in order)
+    """
+    if not requests:
+        return {}
+    table = Client.__table__
+    db.execute(insert_or_update(db, table).on_conflict_do_nothing(), [
+        {"name": client, "first_appearance": first_appearance, "next_order": first_rank_value() + 1,
+         "meeting_count": 0}
+        for client, (first_appearance, _) in requests.items()
+    ])
+    db.execute(
+        table.update().where(table.c.name == bindparam("client"))
+        .values(next_order=table.c.next_order + bindparam("count")),
+        [{"client": client, "count": count} for client, (_, count) in requests.items()]
+    )
+    reserved = {}
+    for row in db.execute(
+        select(table.c.id, table.c.name, table.c.first_appearance, table.c.next_order)
+        .where(table.c.name.in_(list(requests)))
+    ):
+        count = requests[row.name][1]
+        ranks = [rank_from_value(value) for value in range(row.next_order - count, row.next_order)]
+        reserved[row.name] = (row.id, row.first_appearance, ranks)
+    return reserved
+
+
+def next_client_rank(db: Session, client: str, first_appearance: int) -> Tuple[int, int, str]:
+    """Reserve one rank key after the client's last one"""
+    client_id, client_first_appearance, ranks = next_client_ranks(db, client, first_appearance)
+    return client_id, client_first_appearance, ranks[0]
+
+
+def reserve_client_rank(db: Session, client: str, first_appearance: int, rank: str) -> Tuple[int, int]:
+    """
+    Make sure the client's later ranks come after `rank` (used when a meeting
+    is restored with its old rank, and after a rebalance)
+
+    Args:
+        first_appearance: Recorded as the client's first appearance if the client is new
+
+    Returns:
+        (the client's id, its first appearance)
+    """
+    table = Client.__table__
+    statement = insert_or_update(db, table).values(
+        name=client,
+        first_appearance=first_appearance,
+        next_order=rank_value(rank) + 1,
+        meeting_count=0
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"next_order": _greatest(db, table.c.next_order, statement.excluded.next_order)}
+    ).returning(table.c.id, table.c.first_appearance)
+    client_id, client_first_appearance = db.execute(statement).one()
+    return client_id, client_first_appearance
+
+
+def _increment(db: Session, name: str, count: int = 1) -> int:
+    """Add `count` to a named counter (created on first use) and return the new value"""
+    table = OrderCounter.__table__
+    statement = insert_or_update(db, table).values(name=name, value=count)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={"value": table.c.value + count}
+    ).returning(table.c.value)
+    return db.execute(statement).scalar_one()
+
+
+def _greatest(db: Session, left, right):
+    # SQLite spells GREATEST as the two-argument max()
+    return func.max(left, right) if db.get_bind().dialect.name == "sqlite" else func.greatest(left, right)
@@ -6,17 +6,19 @@ let filteredMeetings = [];
 let selectedMeetings = new Set();
 let bulkSelectMode = false;
 
-// Undo/Redo History
-let undoStack = [];
-let redoStack = [];
-const MAX_HISTORY = 50;
+// Undo/Redo History: the server keeps this tab's undo stack, keyed by a per-tab session id
+const SESSION_ID = sessionStorage.getItem('sessionId') || `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+sessionStorage.setItem('sessionId', SESSION_ID);
+let canUndo = false;
+let canRedo = false;
 
 // Load meetings on page load
 document.addEventListener('DOMContentLoaded', () => {
     loadMeetings();
     loadClients();
     loadDashboardStats();
-    updateUndoRedoButtons();
+    loadHistory();
+    connectChangeFeed();
     initDarkMode();
 });
 
@@ -83,8 +85,20 @@ function updateDarkModeIcon(isDark) {
 // Load all meetings from API
 async function loadMeetings() {
     try {
-        const response = await fetch('/api/meetings');
-        allMeetings = await response.json();
+        // The API returns meetings one page at a time; follow the cursor until the last page
+        const meetings = [];
+        let cursor = null;
+        let version = null;
+        do {
+            const url = cursor ? `/api/meetings?limit=1000&cursor=${encodeURIComponent(cursor)}` : '/api/meetings?limit=1000';
+            const response = await fetch(url);
+            meetings.push(...await response.json());
+            // The first page's version: later changes are fetched from there
+            version = version ?? Number(response.headers.get('X-Data-Version'));
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        allMeetings = meetings;
+        dataVersion = version;
         filteredMeetings = allMeetings;
         applyFilters();
         // Refresh dashboard stats when meetings are loaded
@@ -99,15 +113,7 @@ async function loadMeetings() {
 async function loadDashboardStats() {
     try {
         const response = await fetch('/api/dashboard/stats');
-        const stats = await response.json();
-
-        // Update KPI card values with animation
-        updateKpiValue('kpiTotalClients', stats.total_clients);
-        updateKpiValue('kpiActiveClients', stats.active_clients);
-        updateKpiValue('kpiUpcomingMeetings', stats.upcoming_meetings);
-        updateKpiValue('kpiMeetingsToday', stats.meetings_today);
-        updateKpiValue('kpiActionRequired', stats.action_required);
-        updateKpiValue('kpiTotalMeetings', stats.total_meetings);
+        showKpis(await response.json());
     } catch (error) {
         console.error('Error loading dashboard stats:', error);
         // Set default values on error
@@ -120,6 +126,16 @@ async function loadDashboardStats() {
     }
 }
 
+// Update KPI card values with animation
+function showKpis(stats) {
+    updateKpiValue('kpiTotalClients', stats.total_clients);
+    updateKpiValue('kpiActiveClients', stats.active_clients);
+    updateKpiValue('kpiUpcomingMeetings', stats.upcoming_meetings);
+    updateKpiValue('kpiMeetingsToday', stats.meetings_today);
+    updateKpiValue('kpiActionRequired', stats.action_required);
+    updateKpiValue('kpiTotalMeetings', stats.total_meetings);
+}
+
 // Update KPI value with smooth animation
 function updateKpiValue(elementId, newValue) {
     const element = document.getElementById(elementId);
@@ -160,6 +176,69 @@ async function loadClients() {
     }
 }
 
+// Live updates: every write (from any tab) arrives as a change event that patches the page
+let changeFeed = null;
+let dataVersion = null;  // Data version the loaded meetings are at
+
+function connectChangeFeed() {
+    if (!window.EventSource) return;
+    changeFeed = new EventSource('/api/events');
+    changeFeed.addEventListener('change', event => {
+        applyChangeEvent(JSON.parse(event.data));
+        dataVersion = Number(event.lastEventId);
+    });
+    // Missed events (reconnect, too slow, import): catch up from the last version
+    changeFeed.addEventListener('reset', () => syncChanges());
+}
+
+// After a write, fetch the changes only if the change feed isn't going to deliver them
+async function refreshAfterWrite() {
+    if (changeFeed && changeFeed.readyState === EventSource.OPEN) return;
+    await syncChanges();
+}
+
+// Fetch what changed since the loaded version; a full reload if too much did
+async function syncChanges() {
+    try {
+        if (dataVersion !== null) {
+            const response = await fetch(`/api/meetings/changes?since=${dataVersion}`);
+            const changes = await response.json();
+            if (response.ok && !changes.reset) {
+                applyChangeEvent(changes);
+                dataVersion = changes.version;
+                loadDashboardStats();
+                return;
+            }
+        }
+    } catch (error) {
+        console.error('Error syncing changes:', error);
+    }
+    await loadMeetings();
+    await loadClients();
+}
+
+function applyChangeEvent(change) {
+    const meetingsById = new Map(allMeetings.map(meeting => [meeting.id, meeting]));
+    change.deletes.forEach(id => meetingsById.delete(id));
+    change.upserts.forEach(meeting => meetingsById.set(meeting.id, meeting));
+
+    // Update numbers of the affected clients, in rank order
+    Object.values(change.orders || {}).forEach(ids => ids.forEach((id, index) => {
+        const meeting = meetingsById.get(id);
+        if (meeting) meeting.client_order = index + 1;
+    }));
+
+    // Same order as /api/meetings
+    allMeetings = [...meetingsById.values()].sort((a, b) =>
+        a.client_first_appearance - b.client_first_appearance || a.global_order - b.global_order || a.id - b.id
+    );
+    applyFilters();
+    if (change.stats) showKpis(change.stats);
+
+    const clientNames = [...new Set(allMeetings.map(meeting => meeting.client).filter(Boolean))];
+    allClients = clientNames.map(name => ({ name }));
+}
+
 // Setup custom dropdown for client selection
 function setupClientDropdown() {
     const clientInput = document.getElementById('client');
@@ -241,6 +320,22 @@ function selectClient(clientName) {
     document.getElementById('peopleConnected')?.focus();
 }
 
+// Address books fetched at the current data version, by client name
+const clientAddressCache = new Map();
+
+// A client's addresses, most used first; fetched once per data version
+function fetchClientAddresses(clientName) {
+    const cached = clientAddressCache.get(clientName);
+    if (cached && cached.version === dataVersion) {
+        return cached.addresses;
+    }
+    const addresses = fetch(`/api/clients/${encodeURIComponent(clientName)}/addresses`)
+        .then(response => response.ok ? response.json() : []);
+    clientAddressCache.set(clientName, { version: dataVersion, addresses });
+    addresses.catch(() => clientAddressCache.delete(clientName));
+    return addresses;
+}
+
 // Load addresses for a specific client
 async function loadClientAddresses(clientName) {
     if (!clientName || clientName.trim() === '') {
@@ -251,8 +346,7 @@ async function loadClientAddresses(clientName) {
     }
 
     try {
-        const response = await fetch(`/api/clients/${encodeURIComponent(clientName)}/addresses`);
-        const addresses = await response.json();
+        const addresses = await fetchClientAddresses(clientName);
 
         const addressSelect = document.getElementById('addressSelect');
         addressSelect.innerHTML = '<option value="">Select existing address or type new...</option>';
@@ -778,14 +872,16 @@ async function enableInlineEdit(element, meetingId, field) {
 
 // Enable inline address editing with dropdown
 async function enableInlineAddressEdit(element, meetingId, currentValue) {
-    // Get the meeting to find the client name
-    const response = await fetch(`/api/meetings/${meetingId}`);
-    const meeting = await response.json();
+    // The loaded meetings have the client name; fetch the meeting only if it isn't there
+    let meeting = allMeetings.find(m => m.id === meetingId);
+    if (!meeting) {
+        const response = await fetch(`/api/meetings/${meetingId}`);
+        meeting = await response.json();
+    }
     const clientName = meeting.client;
 
     // Load addresses for this client
-    const addressesResponse = await fetch(`/api/clients/${encodeURIComponent(clientName)}/addresses`);
-    const addresses = await addressesResponse.json();
+    const addresses = clientName ? await fetchClientAddresses(clientName) : [];
 
     // Create wrapper div
     const wrapper = document.createElement('div');
@@ -909,10 +1005,8 @@ async function saveInlineAddressEdit(meetingId, button) {
     }
 
     try {
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Update the address field
         meeting.address = newValue || null;
@@ -920,17 +1014,14 @@ async function saveInlineAddressEdit(meetingId, button) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             // Replace with display text
             const p = document.createElement('p');
@@ -940,8 +1031,8 @@ async function saveInlineAddressEdit(meetingId, button) {
 
             container.replaceWith(p);
 
-            // Reload data
-            await loadMeetings();
+            // Refresh data
+            await refreshAfterWrite();
             showSuccess('Address updated successfully');
         } else {
             showError('Failed to update address');
@@ -959,10 +1050,8 @@ async function saveInlineEdit(meetingId, field, button) {
     const newValue = textarea.value.trim();
 
     try {
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Update the specific field
         meeting[field] = newValue || null;
@@ -970,17 +1059,14 @@ async function saveInlineEdit(meetingId, field, button) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             // Replace with display text
             const p = document.createElement('p');
@@ -991,8 +1077,8 @@ async function saveInlineEdit(meetingId, field, button) {
             textarea.replaceWith(p);
             container.querySelector('.inline-edit-actions').remove();
 
-            // Reload data
-            await loadMeetings();
+            // Refresh data
+            await refreshAfterWrite();
             showSuccess('Updated successfully');
         } else {
             showError('Failed to update');
@@ -1091,9 +1177,9 @@ async function reorderMeetings(draggedId, targetId) {
     try {
         const response = await fetch('/api/meetings/reorder', {
             method: 'POST',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify({
                 dragged_id: draggedId,
                 target_id: targetId
@@ -1101,7 +1187,8 @@ async function reorderMeetings(draggedId, targetId) {
         });
 
         if (response.ok) {
-            await loadMeetings();
+            historyChanged();
+            await refreshAfterWrite();
             showSuccess('Order updated');
         } else {
             showError('Failed to reorder');
@@ -1165,7 +1252,8 @@ async function exportToPDF() {
             return;
         }
 
-        const response = await fetch('/api/export/pdf', {
+        // Start a background report job and poll it until the PDF is ready
+        const jobResponse = await fetch('/api/export/pdf/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1175,6 +1263,25 @@ async function exportToPDF() {
             })
         });
 
+        let job = await jobResponse.json();
+        if (!jobResponse.ok) {
+            showError(job.detail || 'Failed to export PDF');
+            return;
+        }
+
+        while (job.status === 'queued' || job.status === 'rendering') {
+            await new Promise(resolve => setTimeout(resolve, 500));
+            const statusResponse = await fetch(`/api/export/pdf/jobs/${job.job_id}`);
+            job = await statusResponse.json();
+        }
+
+        if (job.status !== 'done') {
+            showError(job.error || job.detail || 'Failed to export PDF');
+            return;
+        }
+
+        const response = await fetch(`/api/export/pdf/jobs/${job.job_id}/download`);
+
         if (response.ok) {
             const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
@@ -1221,6 +1328,12 @@ function openAddModal() {
 // Open edit meeting modal
 async function editMeeting(id) {
     try {
+        // Start on the client's addresses while the meeting loads
+        const loaded = allMeetings.find(m => m.id === id);
+        if (loaded && loaded.client) {
+            fetchClientAddresses(loaded.client);
+        }
+
         const response = await fetch(`/api/meetings/${id}`);
         const meeting = await response.json();
 
@@ -1305,38 +1418,21 @@ async function saveMeeting(event) {
     }
 
     try {
-        let previousData = null;
-
-        // If updating, get the current state for undo
-        if (meetingId) {
-            const currentResponse = await fetch(`/api/meetings/${meetingId}`);
-            previousData = await currentResponse.json();
-        }
-
         const url = meetingId ? `/api/meetings/${meetingId}` : '/api/meetings';
         const method = meetingId ? 'PUT' : 'POST';
 
         const response = await fetch(url, {
             method: method,
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meetingData)
         });
 
         if (response.ok) {
-            const savedMeeting = await response.json();
-
-            // Save to undo stack
-            if (meetingId) {
-                saveState('update', { id: parseInt(meetingId), previous: previousData, current: savedMeeting });
-            } else {
-                saveState('create', savedMeeting);
-            }
-
+            historyChanged();
             closeModal();
-            loadMeetings();
-            loadClients();
+            refreshAfterWrite();
             showSuccess(meetingId ? 'Meeting updated successfully' : 'Meeting added successfully');
         } else {
             showError('Failed to save meeting');
@@ -1356,20 +1452,15 @@ async function deleteMeeting(id, clientName) {
         'Cancel',
         async () => {
             try {
-                // Get current state for undo before deleting
-                const currentResponse = await fetch(`/api/meetings/${id}`);
-                const deletedMeeting = await currentResponse.json();
-
                 const response = await fetch(`/api/meetings/${id}`, {
-                    method: 'DELETE'
+                    method: 'DELETE',
+                    headers: sessionHeaders()
                 });
 
                 if (response.ok) {
-                    // Save to undo stack
-                    saveState('delete', deletedMeeting);
+                    historyChanged();
 
-                    loadMeetings();
-                    loadClients();
+                    refreshAfterWrite();
                     showSuccess('Meeting deleted successfully');
                 } else {
                     showError('Failed to delete meeting');
@@ -1578,10 +1669,8 @@ async function saveMeetingDate(meetingId) {
     }
 
     try {
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Update the meeting_date field
         meeting.meeting_date = selectedDate;
@@ -1589,20 +1678,17 @@ async function saveMeetingDate(meetingId) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             closeMeetingDatePicker();
-            await loadMeetings();
+            await refreshAfterWrite();
             showSuccess('Meeting date updated');
         } else {
             showError('Failed to update date');
@@ -1615,10 +1701,8 @@ async function saveMeetingDate(meetingId) {
 
 async function clearMeetingDate(meetingId) {
     try {
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Clear the meeting_date field
         meeting.meeting_date = null;
@@ -1626,20 +1710,17 @@ async function clearMeetingDate(meetingId) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             closeMeetingDatePicker();
-            await loadMeetings();
+            await refreshAfterWrite();
             showSuccess('Meeting date cleared');
         } else {
             showError('Failed to clear date');
@@ -1790,10 +1871,8 @@ function closeDatePicker() {
 
 async function clearDateSelection(meetingId, field) {
     try {
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Get existing content (notes)
         let existingContent = meeting[field] || '';
@@ -1807,20 +1886,17 @@ async function clearDateSelection(meetingId, field) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             closeDatePicker();
-            await loadMeetings();
+            await refreshAfterWrite();
             showSuccess('Date cleared successfully');
         } else {
             showError('Failed to clear date');
@@ -1873,10 +1949,8 @@ async function saveDateSelection(meetingId, field) {
             formattedDateTime = `${formattedDate} at ${displayHour}:${minutes} ${ampm}`;
         }
 
-        // Get current meeting data
-        const response = await fetch(`/api/meetings/${meetingId}`);
-        const previousMeeting = await response.json();
-        const meeting = {...previousMeeting};
+        // Current meeting data, from the loaded list
+        const meeting = await currentMeeting(meetingId);
 
         // Get existing content (notes)
         let existingContent = meeting[field] || '';
@@ -1895,20 +1969,17 @@ async function saveDateSelection(meetingId, field) {
         // Save to server
         const updateResponse = await fetch(`/api/meetings/${meetingId}`, {
             method: 'PUT',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify(meeting)
         });
 
         if (updateResponse.ok) {
-            const updatedMeeting = await updateResponse.json();
-
-            // Save to undo stack
-            saveState('update', { id: meetingId, previous: previousMeeting, current: updatedMeeting });
+            historyChanged();
 
             closeDatePicker();
-            await loadMeetings();
+            await refreshAfterWrite();
             showSuccess('Next meeting date added');
         } else {
             showError('Failed to update date');
@@ -1936,119 +2007,80 @@ document.addEventListener('click', (e) => {
 });
 
 // Undo/Redo Functionality
-function saveState(action, data) {
-    const state = {
-        action: action,
-        data: data,
-        timestamp: Date.now()
-    };
-
-    undoStack.push(state);
-
-    // Limit stack size
-    if (undoStack.length > MAX_HISTORY) {
-        undoStack.shift();
+const HISTORY_LABELS = {
+    create: 'Meeting creation',
+    update: 'Meeting update',
+    delete: 'Meeting deletion',
+    reorder: 'Reorder',
+    import: 'Import',
+    revert: 'Revert',
+    batch: 'Changes'
+};
+
+// Headers for writes, so the server puts them on this tab's undo stack
+function sessionHeaders(headers = {}) {
+    return { ...headers, 'X-Session-Id': SESSION_ID };
+}
+
+// A meeting from the loaded list, fetched only if the list doesn't have it
+async function currentMeeting(meetingId) {
+    const meeting = allMeetings.find(m => m.id === parseInt(meetingId));
+    if (meeting) {
+        return {...meeting};
     }
-
-    // Clear redo stack when new action is performed
-    redoStack = [];
-
-    updateUndoRedoButtons();
+    const response = await fetch(`/api/meetings/${meetingId}`);
+    return await response.json();
 }
 
-async function undo() {
-    if (undoStack.length === 0) return;
-
-    const state = undoStack.pop();
-
+async function loadHistory() {
     try {
-        switch (state.action) {
-            case 'create':
-                // Undo create = delete the created meeting
-                await fetch(`/api/meetings/${state.data.id}`, { method: 'DELETE' });
-                redoStack.push({ action: 'create', data: state.data });
-                showSuccess('Undone: Meeting creation');
-                break;
-
-            case 'update':
-                // Undo update = restore previous values
-                await fetch(`/api/meetings/${state.data.id}`, {
-                    method: 'PUT',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(state.data.previous)
-                });
-                redoStack.push({ action: 'update', data: { id: state.data.id, previous: state.data.previous, current: state.data.current } });
-                showSuccess('Undone: Meeting update');
-                break;
-
-            case 'delete':
-                // Undo delete = recreate the deleted meeting
-                const response = await fetch('/api/meetings', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(state.data)
-                });
-                const newMeeting = await response.json();
-                redoStack.push({ action: 'delete', data: { ...state.data, id: newMeeting.id } });
-                showSuccess('Undone: Meeting deletion');
-                break;
-        }
-
-        await loadMeetings();
-        await loadClients();
+        const response = await fetch('/api/history', { headers: sessionHeaders() });
+        const status = await response.json();
+        canUndo = status.can_undo;
+        canRedo = status.can_redo;
     } catch (error) {
-        console.error('Undo error:', error);
-        showError('Failed to undo action');
-        undoStack.push(state); // Restore state if failed
+        console.error('Error loading undo history:', error);
     }
+    updateUndoRedoButtons();
+}
 
+// A new write can be undone and discards the redo stack
+function historyChanged() {
+    canUndo = true;
+    canRedo = false;
     updateUndoRedoButtons();
 }
 
+async function undo() {
+    await stepHistory('undo', 'Undone');
+}
+
 async function redo() {
-    if (redoStack.length === 0) return;
+    await stepHistory('redo', 'Redone');
+}
 
-    const state = redoStack.pop();
+async function stepHistory(direction, verb) {
+    if (direction === 'undo' ? !canUndo : !canRedo) return;
 
     try {
-        switch (state.action) {
-            case 'create':
-                // Redo create = recreate the meeting
-                const createResponse = await fetch('/api/meetings', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(state.data)
-                });
-                const createdMeeting = await createResponse.json();
-                undoStack.push({ action: 'create', data: createdMeeting });
-                showSuccess('Redone: Meeting creation');
-                break;
-
-            case 'update':
-                // Redo update = apply the new values (current)
-                await fetch(`/api/meetings/${state.data.id}`, {
-                    method: 'PUT',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(state.data.current)
-                });
-                undoStack.push({ action: 'update', data: { id: state.data.id, previous: state.data.previous, current: state.data.current } });
-                showSuccess('Redone: Meeting update');
-                break;
-
-            case 'delete':
-                // Redo delete = delete the meeting again
-                await fetch(`/api/meetings/${state.data.id}`, { method: 'DELETE' });
-                undoStack.push({ action: 'delete', data: state.data });
-                showSuccess('Redone: Meeting deletion');
-                break;
-        }
+        const response = await fetch(`/api/history/${direction}`, {
+            method: 'POST',
+            headers: sessionHeaders()
+        });
+        const result = await response.json();
 
-        await loadMeetings();
-        await loadClients();
+        if (response.ok) {
+            canUndo = result.can_undo;
+            canRedo = result.can_redo;
+            showSuccess(`${verb}: ${HISTORY_LABELS[result.op] || 'Change'}`);
+            await refreshAfterWrite();
+        } else {
+            showError(result.detail || `Failed to ${direction} action`);
+            await loadHistory();
+        }
     } catch (error) {
-        console.error('Redo error:', error);
-        showError('Failed to redo action');
-        redoStack.push(state); // Restore state if failed
+        console.error(`${verb} error:`, error);
+        showError(`Failed to ${direction} action`);
     }
 
     updateUndoRedoButtons();
@@ -2059,10 +2091,10 @@ function updateUndoRedoButtons() {
     const redoBtn = document.getElementById('redoBtn');
 
     if (undoBtn) {
-        undoBtn.disabled = undoStack.length === 0;
+        undoBtn.disabled = !canUndo;
     }
     if (redoBtn) {
-        redoBtn.disabled = redoStack.length === 0;
+        redoBtn.disabled = !canRedo;
     }
 }
 
@@ -2188,16 +2220,16 @@ async function bulkDeleteMeetings() {
 
     showConfirmDialog(
         'Delete Multiple Meetings',
-        `Are you sure you want to delete <strong>${count} meeting(s)</strong>? This action cannot be undone.`,
+        `Are you sure you want to delete <strong>${count} meeting(s)</strong>?`,
         'Delete All',
         'Cancel',
         async () => {
             try {
                 const response = await fetch('/api/meetings/bulk-delete', {
                     method: 'POST',
-                    headers: {
+                    headers: sessionHeaders({
                         'Content-Type': 'application/json'
-                    },
+                    }),
                     body: JSON.stringify({
                         meeting_ids: meetingIds
                     })
@@ -2205,9 +2237,9 @@ async function bulkDeleteMeetings() {
 
                 if (response.ok) {
                     const result = await response.json();
+                    historyChanged();
                     clearSelection();
-                    await loadMeetings();
-                    await loadClients();
+                    await refreshAfterWrite();
                     showSuccess(result.message);
                 } else {
                     const error = await response.json();
@@ -2511,7 +2543,7 @@ async function testEmailReminder() {
         const result = await response.json();
 
         if (result.success) {
-            showSuccess(`Email sent! ${result.count} meeting(s) included in reminder.`);
+            showSuccess(`Email queued! ${result.count} meeting(s) included in reminder.`);
 
             // Show which meetings were included
             if (result.meetings && result.meetings.length > 0) {
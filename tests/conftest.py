@@ -0,0 +1,27 @@
+"""
+Test Setup
+The app modules read their configuration at import, so point them at a
+scratch database and PDF cache before any test imports them
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRATCH_DIR = tempfile.mkdtemp(prefix="meeting-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH_DIR}/meetings.db"
+os.environ["PDF_CACHE_DIR"] = os.path.join(SCRATCH_DIR, "pdf_cache")
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("SENDGRID_API_KEY", None)
+
+# The app serves static/ and seeds from Book1.xlsx relative to the repo root
+os.chdir(REPO_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
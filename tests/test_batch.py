@@ -0,0 +1,84 @@
+"""
+Batch Meeting Operations
+POST /api/meetings/batch applies creates, updates, deletes and reorders in one
+transaction: the results carry each meeting's final state, and a failing
+operation rolls back the ones before it
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "batch"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def create(client, name, actions):
+    return client.post("/api/meetings", json={"client": name, "actions": actions}, headers=SESSION).json()
+
+
+def updates(client, name):
+    """A client's (id, actions) by update number"""
+    meetings = client.get("/api/meetings", params={"client": name, "limit": 1000}).json()
+    meetings.sort(key=lambda meeting: meeting["client_order"])
+    assert [meeting["client_order"] for meeting in meetings] == list(range(1, len(meetings) + 1))
+    return [(meeting["id"], meeting["actions"]) for meeting in meetings]
+
+
+def test_mixed_operations(client):
+    first, second, third = (create(client, "Batch Co", f"update {number}") for number in (1, 2, 3))
+
+    response = client.post("/api/meetings/batch", json={"operations": [
+        {"op": "create", "meeting": {"client": "Batch Co", "actions": "update 4"}},
+        {"op": "update", "id": second["id"], "meeting": {"client": "Batch Co", "actions": "edited"}},
+        {"op": "delete", "id": first["id"]},
+        {"op": "reorder", "id": third["id"], "target_id": second["id"]},
+    ]}, headers=SESSION)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    created_id = results[0]["id"]
+
+    assert [(result["index"], result["op"], result["id"]) for result in results] == [
+        (0, "create", created_id), (1, "update", second["id"]), (2, "delete", first["id"]),
+        (3, "reorder", third["id"]),
+    ]
+    # Final state after the whole batch, numbered after the delete and the move
+    assert results[0]["meeting"]["actions"] == "update 4"
+    assert results[0]["meeting"]["client_order"] == 3
+    assert (results[1]["meeting"]["actions"], results[1]["meeting"]["client_order"]) == ("edited", 2)
+    assert results[2]["meeting"] is None
+    assert results[3]["meeting"]["client_order"] == 1
+
+    assert updates(client, "Batch Co") == [(third["id"], "update 3"), (second["id"], "edited"),
+                                           (created_id, "update 4")]
+
+
+def test_a_failing_operation_rolls_back_the_batch(client):
+    first, second = (create(client, "Rollback Co", f"update {number}") for number in (1, 2))
+    before = updates(client, "Rollback Co")
+
+    response = client.post("/api/meetings/batch", json={"operations": [
+        {"op": "create", "meeting": {"client": "Rollback Co", "actions": "update 3"}},
+        {"op": "update", "id": first["id"], "meeting": {"client": "Rollback Co", "actions": "edited"}},
+        {"op": "delete", "id": second["id"]},
+        {"op": "delete", "id": 10 ** 9},
+    ]}, headers=SESSION)
+    assert response.status_code in (400, 404)
+    assert response.json()["detail"]["index"] == 3
+    assert response.json()["detail"]["op"] == "delete"
+
+    assert updates(client, "Rollback Co") == before
+
+
+def test_missing_fields_name_the_operation(client):
+    response = client.post("/api/meetings/batch", json={"operations": [
+        {"op": "create", "meeting": {"client": "Rollback Co", "actions": "update 3"}},
+        {"op": "reorder", "id": 1},
+    ]}, headers=SESSION)
+    assert response.status_code == 400
+    assert response.json()["detail"] == {"index": 1, "op": "reorder", "error": "target_id is required"}
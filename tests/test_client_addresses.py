@@ -0,0 +1,93 @@
+"""
+Client Address Book
+Each client's addresses are ranked by how many meetings use them, then by
+when a meeting was last saved with them; saves, edits, deletes and undo keep
+the counts in step, and reorders don't make an address recent
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "addresses"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def save(client, address, meeting_id=None, name="Address Co"):
+    meeting = {"client": name, "actions": "Visit", "address": address}
+    if meeting_id is None:
+        return client.post("/api/meetings", json=meeting, headers=SESSION).json()
+    return client.put(f"/api/meetings/{meeting_id}", json=meeting, headers=SESSION).json()
+
+
+def address_book(client, name="Address Co"):
+    """[(address, usage_count)] in ranking order, and last_used_at by address"""
+    rows = client.get(f"/api/clients/{name}/addresses").json()
+    return [(row["address"], row["usage_count"]) for row in rows], {row["address"]: row["last_used_at"] for row in rows}
+
+
+def test_addresses_are_ranked_by_usage_then_recency(client):
+    harbour = save(client, "1 Harbour St")
+    save(client, "1 Harbour St")
+    mill = save(client, "2 Mill Rd")
+    save(client, "-")  # Placeholder, not an address
+    save(client, " ")
+    ranking, _ = address_book(client)
+    assert ranking == [("1 Harbour St", 2), ("2 Mill Rd", 1)]
+
+    # Same count: the most recently used comes first
+    save(client, "3 Quay Lane")
+    ranking, _ = address_book(client)
+    assert ranking == [("1 Harbour St", 2), ("3 Quay Lane", 1), ("2 Mill Rd", 1)]
+
+    # A save with an address already in the book makes it the most recent
+    save(client, "2 Mill Rd", mill["id"])
+    ranking, used = address_book(client)
+    assert ranking == [("1 Harbour St", 2), ("2 Mill Rd", 1), ("3 Quay Lane", 1)]
+
+    # Moving a meeting to another address moves its count; the address it
+    # left isn't used by the save, so it doesn't become recent
+    save(client, "3 Quay Lane", harbour["id"])
+    ranking, moved = address_book(client)
+    assert ranking == [("3 Quay Lane", 2), ("2 Mill Rd", 1), ("1 Harbour St", 1)]
+    assert moved["1 Harbour St"] == used["1 Harbour St"]
+
+    # Deleting the last meeting at an address removes it, and undo brings it back
+    client.delete(f"/api/meetings/{mill['id']}", headers=SESSION)
+    ranking, _ = address_book(client)
+    assert ranking == [("3 Quay Lane", 2), ("1 Harbour St", 1)]
+    client.post("/api/history/undo", headers=SESSION)
+    ranking, _ = address_book(client)
+    assert ("2 Mill Rd", 1) in ranking
+
+
+def test_saves_update_last_used_but_reorders_do_not(client):
+    first = save(client, "9 Dock Rd", name="Reorder Address Co")
+    second = save(client, "10 Pier Rd", name="Reorder Address Co")
+    _, used = address_book(client, "Reorder Address Co")
+
+    client.post("/api/meetings/reorder", json={"dragged_id": second["id"], "target_id": first["id"]},
+                headers=SESSION)
+    ranking, after_reorder = address_book(client, "Reorder Address Co")
+    assert after_reorder == used
+    assert ranking == [("10 Pier Rd", 1), ("9 Dock Rd", 1)]
+
+    save(client, "9 Dock Rd", first["id"], name="Reorder Address Co")
+    ranking, after_save = address_book(client, "Reorder Address Co")
+    assert after_save["9 Dock Rd"] > used["9 Dock Rd"]
+    assert ranking == [("9 Dock Rd", 1), ("10 Pier Rd", 1)]
+
+
+def test_renames_keep_the_address_book(client):
+    save(client, "5 Orchard Way", name="Renamed Address Co")
+    client_id = next(row["id"] for row in client.get("/api/clients").json() if row["name"] == "Renamed Address Co")
+    client.put(f"/api/clients/{client_id}", json={"name": "Orchard Address Co"})
+
+    ranking, _ = address_book(client, "Orchard Address Co")
+    assert ranking == [("5 Orchard Way", 1)]
+    assert address_book(client, "Renamed Address Co")[0] == []
@@ -0,0 +1,73 @@
+"""
+Dashboard KPI Statistics
+The stats row kept current by the write paths' deltas matches a full
+recompute after every kind of write, including notes that are blank only to
+Python's str.strip() (non-breaking spaces, vertical tabs)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "stats"}
+
+
+def next_meeting(days: int) -> str:
+    day = date.today() + timedelta(days=days)
+    return f"{day:%a}, {day:%b} {day.day}, {day.year}"
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def assert_matches_recompute(client):
+    from database import SessionLocal
+    from dashboard_stats import compute_dashboard_stats
+
+    stats = client.get("/api/dashboard/stats").json()
+    db = SessionLocal()
+    try:
+        expected = compute_dashboard_stats(db, date.today())
+    finally:
+        db.close()
+    assert {key: stats[key] for key in expected} == expected
+
+
+def test_incremental_stats_match_a_recompute(client):
+    assert_matches_recompute(client)  # Computes today's row, so the writes below apply deltas
+
+    created = [
+        client.post("/api/meetings", json={"client": "Stats Co", "actions": "\u00a0",
+                                           "next_meeting": next_meeting(2)}, headers=SESSION).json(),
+        client.post("/api/meetings", json={"client": "Stats Co", "actions": "Call back",
+                                           "actions_taken": "\v"}, headers=SESSION).json(),
+        client.post("/api/meetings", json={"client": "Other Stats Co", "actions": " - ",
+                                           "next_meeting": next_meeting(0)}, headers=SESSION).json(),
+    ]
+    assert_matches_recompute(client)
+
+    client.put(f"/api/meetings/{created[0]['id']}", json={
+        "client": "Moved Stats Co", "actions": "Send deck", "actions_taken": "\u00a0"
+    }, headers=SESSION)
+    assert_matches_recompute(client)
+
+    client.post("/api/meetings/batch", json={"operations": [
+        {"op": "create", "meeting": {"client": "Stats Co", "actions": "\t\r\n"}},
+        {"op": "delete", "id": created[1]["id"]},
+    ]}, headers=SESSION)
+    assert_matches_recompute(client)
+
+    client.post("/api/meetings/bulk-delete", json={"meeting_ids": [created[0]["id"], created[2]["id"]]},
+                headers=SESSION)
+    assert_matches_recompute(client)
+
+    for _ in range(3):
+        client.post("/api/history/undo", headers=SESSION)
+        assert_matches_recompute(client)
+    client.post("/api/history/redo", headers=SESSION)
+    assert_matches_recompute(client)
@@ -0,0 +1,143 @@
+"""
+Email Outbox
+The outbox worker delivers queued emails to a local stub of the SendGrid API:
+identical messages go out as one request, server errors are retried with
+backoff, client errors fail for good and a dedup key queues an email once
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubSendGrid(BaseHTTPRequestHandler):
+    """Records each request body and answers with the next queued status (202 when none is left)"""
+    requests = []
+    statuses = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests.append(json.loads(body))
+        status = type(self).statuses.pop(0) if type(self).statuses else 202
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def sendgrid():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSendGrid)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def worker(sendgrid):
+    import main  # noqa: F401 (creates the tables)
+    from database import EmailOutbox, SessionLocal
+    from email_outbox import OutboxWorker
+
+    StubSendGrid.requests.clear()
+    StubSendGrid.statuses.clear()
+    db = SessionLocal()
+    try:
+        db.query(EmailOutbox).delete()
+        db.commit()
+    finally:
+        db.close()
+    return OutboxWorker(api_key="test-key", host=sendgrid, from_email="sender@example.com",
+                        concurrency=2, max_attempts=3)
+
+
+def enqueue(*emails, **kwargs):
+    """Queue (to_email, subject) emails in one transaction; returns enqueue's results"""
+    from database import SessionLocal
+    from email_outbox import enqueue as enqueue_email
+
+    db = SessionLocal()
+    try:
+        queued = [enqueue_email(db, to_email, subject, text_content="Hello", **kwargs) for to_email, subject in emails]
+        db.commit()
+        return queued
+    finally:
+        db.close()
+
+
+def outbox():
+    from database import EmailOutbox, SessionLocal
+
+    db = SessionLocal()
+    try:
+        return db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+    finally:
+        db.close()
+
+
+def test_identical_emails_are_sent_in_one_request(worker):
+    enqueue(("a@example.com", "Digest"), ("b@example.com", "Digest"), ("c@example.com", "Digest"),
+            ("d@example.com", "Other"))
+
+    assert asyncio.run(worker.drain()) == 4
+    recipients = sorted(
+        [personalization["to"][0]["email"] for personalization in request["personalizations"]]
+        for request in StubSendGrid.requests
+    )
+    assert recipients == [["a@example.com", "b@example.com", "c@example.com"], ["d@example.com"]]
+    assert {email.status for email in outbox()} == {"sent"}
+
+
+def test_server_errors_are_retried_with_backoff(worker):
+    from email_outbox import RETRY_BASE_SECONDS
+    from database import EmailOutbox, SessionLocal
+
+    StubSendGrid.statuses.extend([503])
+    enqueue(("a@example.com", "Retry"))
+
+    started = datetime.utcnow()
+    assert asyncio.run(worker.run_once()) == 1
+    email, = outbox()
+    assert (email.status, email.attempts) == ("pending", 1)
+    assert email.next_attempt_at >= started + timedelta(seconds=RETRY_BASE_SECONDS)
+
+    # Not due yet
+    assert asyncio.run(worker.run_once()) == 0
+    assert len(StubSendGrid.requests) == 1
+
+    db = SessionLocal()
+    try:
+        db.query(EmailOutbox).update({EmailOutbox.next_attempt_at: datetime.utcnow()})
+        db.commit()
+    finally:
+        db.close()
+    assert asyncio.run(worker.run_once()) == 1
+    email, = outbox()
+    assert (email.status, email.attempts, len(StubSendGrid.requests)) == ("sent", 2, 2)
+
+
+def test_client_errors_fail_without_retrying(worker):
+    StubSendGrid.statuses.extend([400])
+    enqueue(("a@example.com", "Rejected"))
+
+    assert asyncio.run(worker.drain()) == 1
+    email, = outbox()
+    assert (email.status, email.attempts, len(StubSendGrid.requests)) == ("failed", 1, 1)
+
+
+def test_a_reminder_queued_twice_is_sent_once(worker):
+    assert enqueue(("a@example.com", "Reminder"), dedup_key="reminder:a@example.com:2025-01-01") == [True]
+    assert enqueue(("a@example.com", "Reminder"), dedup_key="reminder:a@example.com:2025-01-01") == [False]
+
+    asyncio.run(worker.drain())
+    assert len(outbox()) == 1
+    assert len(StubSendGrid.requests) == 1
@@ -0,0 +1,77 @@
+"""
+Event Loop Responsiveness
+A slow SendGrid call runs off the event loop, so the listing keeps answering
+at its usual latency while a reminder is being sent
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+
+import httpx
+
+SEND_SECONDS = 5        # Stubbed SendGrid call
+LISTING_REQUESTS = 20   # Listing requests timed before and during the send
+MAX_LATENCY_SECONDS = 1.0
+
+
+async def listing_latencies(client, first_limit: int) -> list:
+    """
+    Time GET /api/meetings, each request with its own limit so none is served
+    from the response cache
+
+    Returns:
+        (status code, seconds) per request
+    """
+    latencies = []
+    for limit in range(first_limit, first_limit + LISTING_REQUESTS):
+        began = time.perf_counter()
+        response = await client.get("/api/meetings", params={"limit": limit})
+        latencies.append((response.status_code, time.perf_counter() - began))
+    return latencies
+
+
+def test_listing_stays_fast_while_a_reminder_is_sent(monkeypatch):
+    import email_config
+    import main
+    from email_service import EmailService
+
+    sending = threading.Event()
+    sent = threading.Event()
+
+    def slow_send_batch(self, *args, **kwargs):
+        sending.set()
+        time.sleep(SEND_SECONDS)
+        sent.set()
+
+    monkeypatch.setattr(email_config, "SENDGRID_API_KEY", "test-key")
+    monkeypatch.setattr(EmailService, "send_batch", slow_send_batch)
+    # The worker keeps its settings between lifespans: don't leak the fake key
+    monkeypatch.setitem(main.outbox_worker.settings, "api_key", None)
+    monkeypatch.setattr(main.outbox_worker, "email_service", None)
+
+    # Assertions wait until the app has shut down: a failure inside the lifespan
+    # would skip its shutdown and leave the aiosqlite threads running
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                day = date.today() + timedelta(days=2)
+                await client.post("/api/meetings", json={
+                    "client": "Loop Test",
+                    "next_meeting": f"{day:%a}, {day:%b} {day.day}, {day.year}"
+                })
+                before = await listing_latencies(client, 1)
+                reminder = (await client.post("/api/email/send-reminder")).json()
+                if not await asyncio.to_thread(sending.wait, SEND_SECONDS):
+                    return before, reminder, None, False
+                during = await listing_latencies(client, 1 + LISTING_REQUESTS)
+                return before, reminder, during, not sent.is_set()
+
+    before, reminder, during, overlapped = asyncio.run(run())
+    assert reminder["success"], reminder
+    assert during is not None, "the reminder was never sent"
+    assert overlapped, "the listing requests didn't overlap the send"
+    assert all(status == 200 for status, _ in before + during)
+    assert max(seconds for _, seconds in during) < MAX_LATENCY_SECONDS, (before, during)
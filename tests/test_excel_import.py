@@ -0,0 +1,99 @@
+"""
+Excel Import
+POST /api/import-excel runs off the event loop and inserts in batches: a
+1000-row workbook takes about a hundred statements, not one per row. Rows
+keep the sheet's order after each client's existing updates, duplicates
+included
+"""
+
+import asyncio
+import io
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from data_generator import SHEET_COLUMNS, generate_sheet, write_workbook
+
+SESSION = {"X-Session-Id": "import"}
+
+# Statements for a 1000-row import (96 in benchmarks/baseline.json)
+MAX_IMPORT_STATEMENTS = 120
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def upload(client, sheet: pd.DataFrame):
+    workbook = io.BytesIO()
+    write_workbook(sheet, workbook)
+    return client.post("/api/import-excel", headers=SESSION, files={"file": (
+        "meetings.xlsx", workbook.getvalue(), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )})
+
+
+def test_import_is_batched_and_runs_in_the_thread_pool(client, monkeypatch):
+    import main
+    from database import engine
+
+    statements = []
+    loop_running = []
+    import_meetings = main.import_meetings
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def import_in_thread(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            loop_running.append(True)
+        except RuntimeError:
+            loop_running.append(False)
+        return import_meetings(*args, **kwargs)
+
+    monkeypatch.setattr(main, "import_meetings", import_in_thread)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = upload(client, generate_sheet(1000, seed=11))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"message": "Successfully imported 1000 meetings"}
+    assert loop_running == [False]
+    assert len(statements) <= MAX_IMPORT_STATEMENTS, len(statements)
+
+
+def test_import_keeps_the_sheet_order_and_duplicates(client):
+    client.post("/api/meetings", json={"client": "Import Alpha", "actions": "Existing"}, headers=SESSION)
+
+    rows = [
+        ("Import Alpha", "First"),
+        ("Import Beta", "Second"),
+        ("Import Alpha", "Third"),
+        ("Import Alpha", "Third"),  # Duplicate row: kept
+        ("  ", "No client"),  # Dropped
+        ("Import Beta", "Fifth"),
+    ]
+    sheet = pd.DataFrame([
+        {"#": number, "Client": name, "Actions": actions} for number, (name, actions) in enumerate(rows, 1)
+    ], columns=SHEET_COLUMNS)
+    response = upload(client, sheet)
+    assert response.json() == {"message": "Successfully imported 5 meetings"}
+
+    def listing(name):
+        meetings = client.get("/api/meetings", params={"client": name}).json()
+        return sorted((meeting["client_order"], meeting["actions"]) for meeting in meetings)
+
+    assert listing("Import Alpha") == [(1, "Existing"), (2, "First"), (3, "Third"), (4, "Third")]
+    assert listing("Import Beta") == [(1, "Second"), (2, "Fifth")]
+
+    # The import is one undo step
+    client.post("/api/history/undo", headers=SESSION)
+    assert listing("Import Alpha") == [(1, "Existing")]
+    assert listing("Import Beta") == []
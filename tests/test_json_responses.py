@@ -0,0 +1,24 @@
+"""
+Fast JSON Responses
+Accept-Encoding negotiation: an explicit q=0 refusal wins over "*"
+"""
+
+import pytest
+
+from json_responses import negotiate_encoding
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("gzip", "gzip"),
+    ("gzip;q=0.5, identity", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, *", None),
+    ("*, gzip; q=0", None),
+    ("identity", None),
+])
+def test_negotiate_encoding(accept_encoding, expected, monkeypatch):
+    import json_responses
+    monkeypatch.setattr(json_responses, "brotli", None)
+    assert negotiate_encoding(accept_encoding) == expected
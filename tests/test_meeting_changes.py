@@ -0,0 +1,77 @@
+"""
+Meeting Change Tracking
+A delta sync from an old data version, applied to the listing read at that
+version, gives the current listing: written rows, renumbered neighbours and
+tombstones of deleted rows are all in the delta
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "changes"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def listing(client):
+    """The full listing by id, and the data version of its first page"""
+    response = client.get("/api/meetings", params={"limit": 1000})
+    version = int(response.headers["x-data-version"])
+    meetings = {meeting["id"]: meeting for meeting in response.json()}
+    while "x-next-cursor" in response.headers:
+        response = client.get("/api/meetings", params={"limit": 1000, "cursor": response.headers["x-next-cursor"]})
+        meetings.update((meeting["id"], meeting) for meeting in response.json())
+    return meetings, version
+
+
+def create(client, name, actions):
+    return client.post("/api/meetings", json={"client": name, "actions": actions}, headers=SESSION).json()
+
+
+def test_delta_sync_reproduces_the_listing(client):
+    first, second, third = (create(client, "Delta Co", f"update {number}") for number in (1, 2, 3))
+    moved = [create(client, "Delta Move Co", f"update {number}") for number in (1, 2, 3, 4)]
+
+    synced, since = listing(client)
+
+    created = create(client, "Delta Co", "update 4")  # Appended: renumbers nothing
+    client.put(f"/api/meetings/{third['id']}", json={"client": "Delta Co", "actions": "edited"}, headers=SESSION)
+    client.delete(f"/api/meetings/{first['id']}", headers=SESSION)  # Renumbers the updates after it
+    client.post("/api/meetings/reorder", json={"dragged_id": moved[3]["id"], "target_id": moved[1]["id"]},
+                headers=SESSION)
+
+    current, version = listing(client)
+    changes = client.get("/api/meetings/changes", params={"since": since}).json()
+    assert changes["reset"] is False
+    assert changes["version"] == version
+    assert changes["deletes"] == [first["id"]]
+
+    upserted = {meeting["id"]: meeting for meeting in changes["upserts"]}
+    # The written rows and the renumbered ones, and nothing else
+    assert set(upserted) == {created["id"], second["id"], third["id"], moved[1]["id"], moved[2]["id"],
+                             moved[3]["id"]}
+    for meeting_id in changes["deletes"]:
+        del synced[meeting_id]
+    synced.update(upserted)
+    assert synced == current
+
+    assert (current[second["id"]]["client_order"], current[moved[3]["id"]]["client_order"]) == (1, 2)
+
+    # Nothing changed since the latest version
+    unchanged = client.get("/api/meetings/changes", params={"since": version}).json()
+    assert (unchanged["upserts"], unchanged["deletes"]) == ([], [])
+
+
+def test_a_rename_asks_for_a_reload(client):
+    create(client, "Delta Rename Co", "update 1")
+    _, since = listing(client)
+
+    client_id = next(row["id"] for row in client.get("/api/clients").json() if row["name"] == "Delta Rename Co")
+    assert client.put(f"/api/clients/{client_id}", json={"name": "Delta Renamed Co"}).status_code == 200
+
+    assert client.get("/api/meetings/changes", params={"since": since}).json()["reset"] is True
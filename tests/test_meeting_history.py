@@ -0,0 +1,75 @@
+"""
+Meeting History
+Undo and revert put meetings back under their own ids and clients, and never
+overwrite another meeting that holds the same id
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+ALICE = {"X-Session-Id": "alice"}
+BOB = {"X-Session-Id": "bob"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_deleted_meeting_ids_are_not_reused(client):
+    first = client.post("/api/meetings", json={"client": "History Co", "actions": "first"}, headers=ALICE).json()
+    assert client.delete(f"/api/meetings/{first['id']}", headers=ALICE).status_code == 200
+
+    second = client.post("/api/meetings", json={"client": "History Co", "actions": "second"}, headers=BOB).json()
+    assert second["id"] > first["id"]
+
+    # Alice's undo brings her meeting back and leaves Bob's alone
+    assert client.post("/api/history/undo", headers=ALICE).status_code == 200
+    assert client.get(f"/api/meetings/{first['id']}").json()["actions"] == "first"
+    assert client.get(f"/api/meetings/{second['id']}").json()["actions"] == "second"
+
+
+def test_restores_refuse_to_overwrite_another_meeting(client):
+    import sequences
+    from database import SessionLocal, Meeting
+
+    meeting = client.post("/api/meetings", json={"client": "History Co", "actions": "original"}, headers=ALICE).json()
+    revision = client.get(f"/api/meetings/{meeting['id']}/revisions").json()[0]["revision"]
+    assert client.delete(f"/api/meetings/{meeting['id']}", headers=ALICE).status_code == 200
+
+    # A different meeting under the same id, as ids were handed out before they became monotonic
+    db = SessionLocal()
+    try:
+        client_id, _, rank = sequences.next_client_rank(db, "Other Co", 0)
+        db.add(Meeting(id=meeting["id"], client_id=client_id, actions="someone else's", client_rank=rank,
+                       created_at=datetime(2020, 1, 1)))
+        db.commit()
+    finally:
+        db.close()
+
+    assert client.post(f"/api/meetings/{meeting['id']}/revert/{revision}", headers=ALICE).status_code == 409
+    assert client.post("/api/history/undo", headers=ALICE).status_code == 409
+
+    current = client.get(f"/api/meetings/{meeting['id']}").json()
+    assert (current["client"], current["actions"]) == ("Other Co", "someone else's")
+
+
+def test_restores_follow_a_renamed_client(client):
+    kept = client.post("/api/meetings", json={"client": "Rename Co", "actions": "kept"}, headers=ALICE).json()
+    deleted = client.post("/api/meetings", json={"client": "Rename Co", "actions": "deleted"}, headers=ALICE).json()
+    assert client.delete(f"/api/meetings/{deleted['id']}", headers=ALICE).status_code == 200
+
+    client_id = next(row["id"] for row in client.get("/api/clients").json() if row["name"] == "Rename Co")
+    assert client.put(f"/api/clients/{client_id}", json={"name": "Renamed Co"}).status_code == 200
+
+    # The undone delete brings the meeting back under the new name, without re-creating the old client
+    assert client.post("/api/history/undo", headers=ALICE).status_code == 200
+    restored = client.get(f"/api/meetings/{deleted['id']}").json()
+    assert (restored["client"], restored["client_order"]) == ("Renamed Co", 2)
+    assert client.get(f"/api/meetings/{kept['id']}").json()["client"] == "Renamed Co"
+    names = {row["name"] for row in client.get("/api/clients").json()}
+    assert "Renamed Co" in names and "Rename Co" not in names
@@ -0,0 +1,61 @@
+"""
+Meeting Full-Text Search
+The FTS index follows the meetings through its triggers: inserts, edits,
+deletes and client renames are searchable (or gone) right after the write
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "search"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def found(client, query):
+    """Ids of the meetings matching a query"""
+    response = client.get("/api/search", params={"q": query, "limit": 100})
+    assert response.status_code == 200
+    return {result["id"] for result in response.json()["results"]}
+
+
+def test_search_follows_the_writes(client):
+    meeting = client.post("/api/meetings", json={
+        "client": "Quokka Holdings", "actions": "Draft the zeppelin proposal"
+    }, headers=SESSION).json()
+    assert found(client, "zeppelin") == {meeting["id"]}
+    assert found(client, "quokka") == {meeting["id"]}
+
+    client.put(f"/api/meetings/{meeting['id']}", json={
+        "client": "Quokka Holdings", "actions": "Review the dirigible budget"
+    }, headers=SESSION)
+    assert found(client, "zeppelin") == set()
+    assert found(client, "dirigible") == {meeting["id"]}
+
+    client_id = next(row["id"] for row in client.get("/api/clients").json() if row["name"] == "Quokka Holdings")
+    assert client.put(f"/api/clients/{client_id}", json={"name": "Wombat Partners"}).status_code == 200
+    assert found(client, "quokka") == set()
+    assert found(client, "wombat") == {meeting["id"]}
+    result, = client.get("/api/search", params={"q": "dirigible"}).json()["results"]
+    assert result["client"] == "Wombat Partners"
+
+    client.delete(f"/api/meetings/{meeting['id']}", headers=SESSION)
+    assert found(client, "dirigible") == set()
+    assert found(client, "wombat") == set()
+
+
+def test_a_move_to_another_client_is_searchable(client):
+    meeting = client.post("/api/meetings", json={
+        "client": "Narwhal Ltd", "actions": "Ship the samples"
+    }, headers=SESSION).json()
+
+    client.put(f"/api/meetings/{meeting['id']}", json={
+        "client": "Pangolin Ltd", "actions": "Ship the samples"
+    }, headers=SESSION)
+    assert found(client, "narwhal") == set()
+    assert found(client, "pangolin") == {meeting["id"]}
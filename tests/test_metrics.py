@@ -0,0 +1,83 @@
+"""
+Metrics Endpoint
+GET /metrics is valid Prometheus text exposition, and the request metrics
+count the requests made, labelled by route template
+"""
+
+import math
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def scrape(client):
+    """{(name, frozenset of labels): value}, after checking every line parses"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    samples = {}
+    types = {}
+    for line in response.text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "gauge", "histogram")
+            types[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, _, labels, value = match.groups()
+        family = re.sub(r"_(bucket|sum|count)$", "", name) if name not in types else name
+        assert family in types, f"{name} has no # TYPE line"
+        samples[name, frozenset(LABEL.findall(labels or ""))] = float(value)
+    return samples
+
+
+def value(samples, name, **labels):
+    return samples.get((name, frozenset((key, str(label)) for key, label in labels.items())), 0)
+
+
+def test_request_counts_go_up(client):
+    route = {"method": "GET", "route": "/api/meetings/{meeting_id}", "status": 404}
+    samples = scrape(client)
+    before = value(samples, "http_request_duration_seconds_count", **route)
+    statements_before = value(samples, "http_request_sql_statements_count", route=route["route"])
+
+    for meeting_id in (10 ** 9, 10 ** 9 + 1):
+        assert client.get(f"/api/meetings/{meeting_id}").status_code == 404
+
+    samples = scrape(client)
+    # Both ids are one route
+    assert value(samples, "http_request_duration_seconds_count", **route) == before + 2
+    assert value(samples, "http_request_duration_seconds_sum", **route) > 0
+    assert value(samples, "http_requests_in_flight", method="GET", route="/api/meetings/{meeting_id}") == 0
+    assert value(samples, "http_request_sql_statements_count", route=route["route"]) == statements_before + 2
+
+
+def test_histogram_buckets_are_cumulative(client):
+    client.get("/api/meetings")
+    samples = scrape(client)
+
+    labels = {"method": "GET", "route": "/api/meetings", "status": 200}
+    buckets = sorted(
+        (float(dict(key)["le"]), count) for (name, key), count in samples.items()
+        if name == "http_request_duration_seconds_bucket"
+        and all(dict(key).get(label) == str(label_value) for label, label_value in labels.items())
+    )
+    assert buckets[-1][0] == math.inf
+    counts = [count for _, count in buckets]
+    assert counts == sorted(counts)
+    assert counts[-1] == value(samples, "http_request_duration_seconds_count", **labels) >= 1
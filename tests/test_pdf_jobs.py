@@ -0,0 +1,82 @@
+"""
+PDF Report Jobs
+A report job is created, polled until done and downloaded; a report that is
+evicted from the cache while it is being sent still downloads whole
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+SESSION = {"X-Session-Id": "pdf"}
+JOB_TIMEOUT_SECONDS = 60
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def meeting_ids(client):
+    return [
+        client.post("/api/meetings", json={"client": "Report Co", "actions": f"Update {number}"},
+                    headers=SESSION).json()["id"]
+        for number in range(3)
+    ]
+
+
+def test_create_poll_and_download(client, meeting_ids):
+    job = client.post("/api/export/pdf/jobs", json={"meeting_ids": meeting_ids}).json()
+    assert job["status"] in ("queued", "rendering", "done")
+
+    deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+    while job["status"] != "done":
+        assert job["status"] != "failed", job["error"]
+        assert time.monotonic() < deadline, job
+        time.sleep(0.1)
+        job = client.get(f"/api/export/pdf/jobs/{job['job_id']}").json()
+    assert job["progress"] == 1
+
+    response = client.get(f"/api/export/pdf/jobs/{job['job_id']}/download")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert int(response.headers["content-length"]) == len(response.content)
+
+    # Same meetings, same report: the synchronous export is served from the cache
+    assert client.post("/api/export/pdf", json={"meeting_ids": meeting_ids}).content == response.content
+
+
+def test_unknown_jobs(client):
+    assert client.get("/api/export/pdf/jobs/missing").status_code == 404
+    assert client.get("/api/export/pdf/jobs/missing/download").status_code == 404
+
+
+def test_an_evicted_report_still_downloads(client, meeting_ids, monkeypatch):
+    import main
+
+    # Every render evicts everything, including the report being sent
+    monkeypatch.setattr(main.report_cache, "max_bytes", 0)
+    response = client.post("/api/export/pdf", json={"meeting_ids": meeting_ids[:2]})
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    assert response.content.rstrip().endswith(b"%%EOF")
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_an_open_report_survives_eviction(tmp_path):
+    from pdf_reports import ReportCache
+
+    cache = ReportCache(str(tmp_path), max_bytes=0)
+    with open(cache.path("report"), "wb") as file:
+        file.write(b"%PDF-1.4 report")
+
+    file = cache.open_file("report")
+    cache.evict()
+    assert cache.open_file("report") is None
+    with file:
+        assert file.read() == b"%PDF-1.4 report"
@@ -0,0 +1,34 @@
+"""
+Query Plans
+The hot query shapes use their indexes (see database.QUERY_INDEXES) instead of
+scanning the meetings table or sorting in a temporary B-tree. Same checks as
+benchmarks/query_plans.py, run against the seeded test database
+"""
+
+import pytest
+
+from data_generator import generate_sheet
+from query_plans import DEFAULT_MEETINGS, check, explain, hot_queries
+
+HOT_QUERIES = hot_queries()
+
+
+@pytest.fixture(scope="module")
+def db():
+    import database
+    import main  # noqa: F401 (creates the tables)
+    from excel_import import import_meetings
+
+    session = database.SessionLocal()
+    try:
+        import_meetings(session, generate_sheet(DEFAULT_MEETINGS))
+        session.commit()
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("description, build, index", HOT_QUERIES, ids=[query[0] for query in HOT_QUERIES])
+def test_hot_query_uses_its_index(db, description, build, index):
+    plan = explain(db, build(db))
+    assert not check(plan, index), plan
@@ -0,0 +1,131 @@
+"""
+Reminder Timer
+With a fake clock: the heap follows meeting creates, edits and deletes, and a
+digest that comes due fires exactly once
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from dashboard_stats import MeetingSnapshot
+from reminder_timer import IST, ReminderTimer
+
+TODAY = date(2025, 3, 10)
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def __call__(self) -> datetime:
+        return self.current
+
+
+class RecordingTimer(ReminderTimer):
+    """Loads its meetings from a dict and records digests instead of sending them"""
+
+    def __init__(self, clock, next_dates):
+        super().__init__(clock=clock)
+        self.stored = next_dates
+        self.fired = []
+
+    def _load(self):
+        return dict(self.stored)
+
+    def _fire(self):
+        self.fired.append(self.today())
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return IST.localize(datetime.combine(day, time(hour, minute)))
+
+
+def meeting(meeting_id, next_date):
+    return MeetingSnapshot(meeting_id, "Timer Co", next_date, "Call", None, None)
+
+
+@pytest.fixture(autouse=True)
+def reminder_config(monkeypatch):
+    import email_config
+    monkeypatch.setattr(email_config, "SENDGRID_API_KEY", "test-key")
+    monkeypatch.setattr(email_config, "REMINDER_TIME_IST", "09:00")
+    monkeypatch.setattr(email_config, "REMINDER_DAYS_THRESHOLD", 2)
+
+
+async def settle(timer):
+    """Let the timer's task handle queued changes and re-evaluate its sleep"""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+async def wake(timer):
+    """Stand in for the sleep ending (the clock moved), then let the task run"""
+    timer._wake.set()
+    await settle(timer)
+
+
+def test_heap_follows_creates_edits_and_deletes():
+    async def scenario():
+        clock = FakeClock(at(TODAY, 10))  # Today's reminder time has passed
+        timer = RecordingTimer(clock, {1: TODAY + timedelta(days=10)})
+        assert timer.start()
+        await settle(timer)
+        try:
+            # Digest two days before the meeting
+            assert timer.next_fire_day() == TODAY + timedelta(days=8)
+
+            timer.meetings_changed([(None, meeting(2, TODAY + timedelta(days=5)))])
+            await settle(timer)
+            assert timer.next_fire_day() == TODAY + timedelta(days=3)
+
+            timer.meetings_changed([(meeting(2, TODAY + timedelta(days=5)), meeting(2, TODAY + timedelta(days=20)))])
+            await settle(timer)
+            assert timer.next_fire_day() == TODAY + timedelta(days=8)
+
+            timer.meetings_changed([(meeting(1, TODAY + timedelta(days=10)), None)])
+            await settle(timer)
+            assert timer.next_fire_day() == TODAY + timedelta(days=18)
+            assert timer.next_dates == {2: TODAY + timedelta(days=20)}
+
+            timer.meetings_changed([(meeting(2, TODAY + timedelta(days=20)), None)])
+            await settle(timer)
+            assert timer.next_fire_day() is None
+            assert timer.fired == []
+        finally:
+            await timer.stop()
+
+    asyncio.run(scenario())
+
+
+def test_a_due_digest_fires_once():
+    async def scenario():
+        clock = FakeClock(at(TODAY, 8, 59))
+        timer = RecordingTimer(clock, {1: TODAY + timedelta(days=1)})
+        assert timer.start()
+        await settle(timer)
+        try:
+            assert timer.next_fire_day() == TODAY
+            assert timer.fired == []
+
+            clock.current = at(TODAY, 9)
+            await wake(timer)
+            assert timer.fired == [TODAY]
+
+            # Woken again later the same day (a write, the sleep cap): not again
+            clock.current = at(TODAY, 15)
+            timer.meetings_changed([(None, meeting(2, TODAY + timedelta(days=2)))])
+            await settle(timer)
+            await wake(timer)
+            assert timer.fired == [TODAY]
+
+            # The next day's digest is due at the next reminder time
+            assert timer.next_fire_day() == TODAY + timedelta(days=1)
+            clock.current = at(TODAY + timedelta(days=1), 9, 30)
+            await wake(timer)
+            assert timer.fired == [TODAY, TODAY + timedelta(days=1)]
+        finally:
+            await timer.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+"""
+Response Cache
+Read endpoints answer If-None-Match with a 304 while the data version is
+unchanged, and hand out a new ETag once a write bumps it
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+SESSION = {"X-Session-Id": "etags"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    import main
+    with TestClient(main.app) as test_client:
+        test_client.post("/api/meetings", json={"client": "ETag Co", "actions": "Call"}, headers=SESSION)
+        yield test_client
+
+
+@pytest.fixture
+def statements():
+    """SQL statements run on the read engine during the test"""
+    from database import read_engine
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(read_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(read_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("path", ["/api/meetings", "/api/clients"])
+def test_unchanged_data_is_not_modified(client, statements, path):
+    response = client.get(path)
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    statements.clear()
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    # Only the data version is read, never the rows
+    assert not any("meetings" in statement for statement in statements), statements
+
+    assert client.get(path, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+
+
+def test_a_write_changes_the_etag(client):
+    params = {"client": "ETag Co"}
+    response = client.get("/api/meetings", params=params)
+    etag, version = response.headers["etag"], int(response.headers["x-data-version"])
+
+    client.post("/api/meetings", json={"client": "ETag Co", "actions": "Follow up"}, headers=SESSION)
+
+    fresh = client.get("/api/meetings", params=params, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert int(fresh.headers["x-data-version"]) > version
+    assert [meeting["actions"] for meeting in fresh.json()] == ["Call", "Follow up"]
+
+    assert client.get("/api/meetings", params=params,
+                      headers={"If-None-Match": fresh.headers["etag"]}).status_code == 304
+
+
+def test_each_encoding_has_its_own_etag(client, monkeypatch):
+    import json_responses
+    monkeypatch.setattr(json_responses, "COMPRESS_MIN_BYTES", 0)
+
+    plain = client.get("/api/meetings", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/meetings", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert plain.headers["etag"] != gzipped.headers["etag"]
+    assert "accept-encoding" in gzipped.headers["vary"].lower()
+    assert plain.json() == gzipped.json()